@@ -0,0 +1,167 @@
+import datetime
+import json
+import oci
+
+PlanVersion = 1
+
+##########################################################################
+# Rough duration in seconds of each operation, used for the estimates
+# in the plan
+##########################################################################
+EstimatedSeconds = {
+    "instance_action": 60,
+    "update_instance": 180,
+    "db_node_action": 300,
+    "update_db_system": 600,
+    "update_cloud_vm_cluster": 600,
+    "update_vm_cluster": 600,
+    "start_autonomous_database": 120,
+    "stop_autonomous_database": 60,
+    "update_autonomous_database": 60,
+    "start_instance_pool": 120,
+    "stop_instance_pool": 60,
+    "update_instance_pool": 120,
+    "start_oda_instance": 600,
+    "stop_oda_instance": 300,
+    "start_analytics_instance": 900,
+    "stop_analytics_instance": 300,
+    "scale_analytics_instance": 900,
+    "start_integration_instance": 600,
+    "stop_integration_instance": 300,
+    "update_load_balancer_shape": 60,
+    "start_db_system": 600,
+    "stop_db_system": 300,
+    "start_deployment": 300,
+    "stop_deployment": 120,
+    "start_workspace": 300,
+    "stop_workspace": 120,
+    "start_vb_instance": 600,
+    "stop_vb_instance": 300,
+}
+
+
+##########################################################################
+# Describe an SDK model, like model("core.UpdateInstancePoolDetails", size=2)
+# Attributes can be models themselves
+##########################################################################
+def model(name, **attributes):
+    return {"model": name, "attributes": attributes}
+
+
+##########################################################################
+# Create the SDK model from its description
+##########################################################################
+def build(value):
+    if isinstance(value, dict) and "model" in value:
+        module, name = value["model"].rsplit(".", 1)
+        instance = getattr(getattr(oci, module).models, name)()
+        for attribute, attribute_value in value["attributes"].items():
+            setattr(instance, attribute, build(attribute_value))
+        return instance
+    return value
+
+
+##########################################################################
+# Action
+##########################################################################
+class Action:
+    """A single call changing a resource, as planned from its schedule.
+
+    The call is client operation(**kwargs) of the service client in the
+    region context, kwargs can contain model descriptions. Actions in then
+    are executed after the resource reached the wait_for state:
+    {"service", "operation", "kwargs", "state"} of the get call to poll,
+    with an optional "compartment_id" to poll with a list call.
+    """
+
+    def __init__(self, region, resource_id, resource_name, resource_type, service, operation, kwargs=None,
+                 current_state="", target_state="", log="", message="", error="", wait_for=None, then=None):
+        self.region = region
+        self.resource_id = resource_id
+        self.resource_name = resource_name
+        self.resource_type = resource_type
+        self.service = service
+        self.operation = operation
+        self.kwargs = kwargs or {}
+        self.current_state = current_state
+        self.target_state = target_state
+        self.log = log
+        self.message = message
+        self.error = error
+        self.wait_for = wait_for
+        self.then = then or []
+        self.work_request_id = None  # Set when the call returned a work request, not part of the plan
+        self.span = None  # Parent span of the call when tracing, not part of the plan
+
+    def call_kwargs(self):
+        return {name: build(value) for name, value in self.kwargs.items()}
+
+    def estimated_seconds(self):
+        return EstimatedSeconds.get(self.operation, 60) + sum(action.estimated_seconds() for action in self.then)
+
+    def to_dict(self):
+        return {
+            "region": self.region,
+            "resource_id": self.resource_id,
+            "resource_name": self.resource_name,
+            "resource_type": self.resource_type,
+            "service": self.service,
+            "operation": self.operation,
+            "kwargs": self.kwargs,
+            "current_state": str(self.current_state),
+            "target_state": str(self.target_state),
+            "estimated_seconds": self.estimated_seconds(),
+            "log": self.log,
+            "message": self.message,
+            "error": self.error,
+            "wait_for": self.wait_for,
+            "then": [action.to_dict() for action in self.then],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data.pop("estimated_seconds", None)
+        data["then"] = [cls.from_dict(action) for action in data.get("then", [])]
+        return cls(**data)
+
+
+##########################################################################
+# Write a plan to a JSON file
+##########################################################################
+def save_plan(filename, actions, **details):
+    plan = {"version": PlanVersion, "created": datetime.datetime.now(datetime.timezone.utc).isoformat()}
+    plan.update(details)
+    plan["estimated_seconds"] = max([action.estimated_seconds() for action in actions] or [0])
+    plan["actions"] = [action.to_dict() for action in actions]
+    with open(filename, 'w') as plan_file:
+        json.dump(plan, plan_file, indent=2)
+
+
+##########################################################################
+# Read a plan from a JSON file, returns the plan details and the actions
+##########################################################################
+def load_plan(filename):
+    with open(filename, 'r') as plan_file:
+        plan = json.load(plan_file)
+    if plan.get("version") != PlanVersion:
+        raise RuntimeError("Unsupported plan version {} in {}".format(plan.get("version"), filename))
+    return plan, [Action.from_dict(action) for action in plan["actions"]]
+
+
+##########################################################################
+# Check if a plan can be applied in this run, returns the reason when not.
+# now is the (naive) UTC time of the run, a plan may be created for at
+# most max_skew seconds in the future and max_age seconds in the past.
+##########################################################################
+def plan_error(plan, tenancy, tag, now, max_age, max_skew):
+    if plan.get("tenancy") != tenancy:
+        return "it was created for tenancy {}, not for {}".format(plan.get("tenancy"), tenancy)
+    if plan.get("tag") != tag:
+        return "it was created for tag {}, not for {}".format(plan.get("tag"), tag)
+    age = (now - datetime.datetime.strptime(plan["planned_for"], "%Y-%m-%dT%H:%M:%SZ")).total_seconds()
+    if age > max_age:
+        return "it was created for {} UTC, which is more than {} seconds ago".format(plan["planned_for"], max_age)
+    if age < -max_skew:
+        return "it was created for {} UTC, which is more than {} seconds ahead".format(plan["planned_for"], max_skew)
+    return None
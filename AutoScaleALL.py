@@ -22,23 +22,57 @@
 #   -printocid - print ocid of object
 #   -topic     - topic to sent summary
 #   -log       - send log output to OCI Logging service. Specify the Log OCID
+#   -loglevel  - level of the log output, DEBUG, INFO or ERROR
+#   -jsonlog   - also write the log output as JSON lines to a file
+#   -metrics   - write the metrics of the run to a Prometheus textfile
+#   -metricscompartment - send the metrics of the run to OCI Monitoring in this compartment
+#   -trace     - trace the run, send the spans to an OTLP/HTTP endpoint or write them to a JSON file
 #   -ot        - override schedule based on a tag
+#   -rp        - number of regions to process in parallel
+#   -rt        - time budget in seconds per region
+#   -refresh   - ignore the local inventory and do a full refresh
+#   -forecast  - write the forecast for the coming week to a CSV file
+#   -plan      - write the actions to a JSON plan file instead of executing them
+#   -apply     - execute the actions of a JSON plan file
+#   -ahead     - evaluate the schedules this many minutes ahead
+#   -daemon    - keep running and scale the resources at every slot boundary
+#   -profile   - profile the run, write a cProfile dump and a Chrome trace with this file prefix
+#   -record    - record the OCI API requests and responses of the run to a file
+#   -replay    - run against a recording instead of OCI, no credentials or network are used
+#   -replaylatency - factor for the recorded latencies of a replay, 0 replays without waiting
 #   -h         - help
 #
 #################################################################################################################
+import time
+script_started = time.time()  # Used to report the time to the first request
 import oci
 import datetime
-import calendar
 import threading
-import time
 import sys
 import argparse
+import csv
+import json
+import concurrent.futures
 import os
+import uuid
+import atexit
 import Regions
 import OCIFunctions
-
-logdetails = oci.loggingingestion.models.LogEntryBatch()
-logdetails.entries = []
+import ResourceDetails
+import Discovery
+import Inventory
+import Schedule
+import Forecast
+import Actions
+import Executor
+import Waiter
+import RateLimit
+import Clients
+import LogOutput
+import Metrics
+import Tracing
+import Profiling
+import Recording
 
 # You can modify / translate the tag names used by this script - case sensitive!!!
 AnyDay = "AnyDay"
@@ -56,7 +90,96 @@ ComputeShutdownMethod = "SOFTSTOP"
 LogLevel = "ALL"  # Use ALL or ERRORS. When set to ERRORS only a notification will be published if error occurs
 
 AlternativeWeekend = False  # Set to True is your weekend is Friday/Saturday
-RateLimitDelay = 2  # Time in seconds to wait before retry of operation
+RateLimitDelay = 2  # Time in seconds to wait before retry of operation, doubled for every next retry
+RateLimitMaxDelay = 60  # Maximum time in seconds to wait before a retry
+RateLimitRetries = 6  # Maximum number of retries of a throttled (429) or failed operation
+RateLimitStart = 10  # Calls per second per service and region to start with, lowered when the service throttles calls
+RateLimitMin = 0.5  # Minimum calls per second per service and region
+RateLimitMax = 50  # Maximum calls per second per service and region
+
+# Number of concurrent requests per service used to get the details of the resources
+ServiceConcurrency = {
+    "compute": 8,
+    "database": 4,
+    "pool": 4,
+    "loadbalancer": 4,
+    "mysql": 4,
+}
+DefaultServiceConcurrency = 2  # Used for services not listed above
+
+# Number of concurrent actions (power on/off, scaling) per service in a region
+ActionConcurrency = {
+    "compute": 16,
+    "database": 8,
+    "pool": 4,
+    "loadbalancer": 4,
+}
+DefaultActionConcurrency = 4  # Used for services not listed above
+WaitInterval = 10  # Seconds before a started resource is checked for the first time, before it is re-scaled
+WaitBackoff = 1.5  # Factor the time between checks grows with
+WaitMaxInterval = 60  # Maximum seconds between checks
+WaitTimeout = 3600  # Maximum seconds to wait for a resource, also limited by the time budget of the region (-rt)
+RegionGracePeriod = 300  # Seconds to wait for regions running in parallel after their time budget (-rt) before they are reported as not finished
+MySQLConcurrency = 8  # Number of compartments checked in parallel for MySQL instances
+MySQLCacheHours = 24  # Hours before a compartment without MySQL instances is checked again
+MySQLCacheFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mysql_cache.json")
+SearchPageSize = 1000  # Number of resources per search call
+SearchShardByType = True  # Run a separate search per resource type
+SearchCompartmentShards = 1  # Split the search per group of compartment subtrees, for tenancies with very many resources of one type
+SearchConcurrency = 4  # Number of searches running in parallel
+DiscoveryQueuePages = 4  # Number of pages of found resources buffered before they are evaluated
+BulkListMinimum = 2  # Minimum number of resources of one type in a compartment to use a single list call instead of a get per resource
+
+# Local inventory of the tenancy and the scheduled resources, so not every run needs a full discovery
+UseInventory = True
+IncrementalDiscovery = False  # Between full searches only search for new resources, newly tagged resources and changed schedules are then missed for up to InventoryTTL["discovery"] and ["tags"] seconds
+InventoryFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inventory_{}.db")  # {} is replaced by the tag
+InventoryTTL = {  # Seconds before the cached information is read from OCI again, 0 reads it every run
+    "regions": 0,  # Tenancy and region subscriptions, set to for instance 86400 to read them once a day
+    "compartments": 0,  # Set to for instance 86400 to read them once a day, new compartments are then missed for up to a day
+    "discovery": 21600,  # Full search of a region, with IncrementalDiscovery in between only new resources are searched for
+    "tags": 10800,  # Schedule tags of a resource, with IncrementalDiscovery
+    "state": 10800,  # Lifecycle state of a resource, with IncrementalDiscovery
+}
+ForecastHours = 168  # Number of hours in the forecast (-forecast)
+PlanMaxAge = 3600  # Seconds after the time it was planned for that a plan can still be applied (-apply)
+PlanMaxSkew = 60  # Seconds before the time it was planned for that a plan can already be applied, for cron jobs started right at that time
+DaemonSlotMinutes = 15  # Minutes between the runs in daemon mode (-daemon), use 60 when all schedules have 24 values
+DaemonPlanAhead = 60  # Seconds before the slot boundary the resources are checked in daemon mode
+
+# Log output
+LogOutputLevel = "DEBUG"  # DEBUG shows every checked resource, INFO only the actions and totals, ERROR only the errors (-loglevel)
+LogBatchEntries = 1000  # Maximum number of log lines sent to the Logging service in one call (-log)
+LogBatchBytes = 1000000  # Maximum size in bytes of the log lines sent in one call, lines longer than this are cut off
+LogBatchSeconds = 5  # Maximum seconds a log line is kept before it is sent
+
+# Metrics of the run, written to a Prometheus textfile (-metrics) and/or sent to the OCI Monitoring service (-metricscompartment)
+MetricsNamespace = "autoscale"  # Namespace of the metrics in OCI Monitoring
+MetricsBatchSize = 50  # Maximum number of metrics sent in one post_metric_data call
+
+# Profiling of the run (-profile)
+ProfileInterval = 0.01  # Seconds between the stack samples of the Chrome trace
+ProfileTop = 15  # Number of functions with the most cumulative time shown in the log
+
+# Lock protecting counters shared between region workers
+region_lock = threading.Lock()
+
+# Thread local context, used to prefix log lines with the region when running regions in parallel
+log_context = threading.local()
+
+# Lock around print, writing to stdout from several threads at once can mix up the output when it is redirected to a file
+print_lock = threading.Lock()
+
+# Log level and the optional JSON lines file and Logging service shipper, set from the command line
+log_level = LogOutput.Levels[LogOutputLevel]
+log_json = None
+log_shipper = None
+
+# Region contexts, kept between the runs in daemon mode
+region_contexts = {}
+
+# Regions running in parallel that did not finish within their time budget, their threads are not waited for
+unfinished_regions = set()
 
 ##########################################################################
 # Get current host time and utc on execution
@@ -81,57 +204,92 @@ def print_header(name):
 ##########################################################################
 def get_current_hour(region, ignore_region_time=False):
 
-    timezdiff = 0  # Default value if no region match is found
-
-    # Find matching time zone for region
-    for r in Regions.RegionTime:
-        if r[0] == region:
-            timezdiff = r[1]
-
     # Get current host time
     current_time = current_host_time
 
     # if need to use region time
     if not ignore_region_time:
-        current_time = current_utc_time + datetime.timedelta(hours=timezdiff)
+        current_time = Regions.local_time(region, current_utc_time)
         print ("Debug: {}".format(current_time))
 
-    # get the variables to return
-    iDayOfWeek = current_time.weekday()  # Day of week as a number
-    iDay = calendar.day_name[iDayOfWeek]  # Day of week as string
-    iCurrentHour = current_time.hour
-    iDayOfMonth = current_time.date().day # Day of the month as a number
-
-    # Get what N-th day of the monday it is. Like 1st, 2nd, 3rd Saturday
-    cal = calendar.monthcalendar(current_time.year, current_time.month)
-    iDayNr = 0
-    daynrcounter = 0
-    for week in cal:
-        if cal[daynrcounter][iDayOfWeek] == current_time.day:
-            if cal[0][iDayOfWeek]:
-                iDayNr = daynrcounter + 1
-            else:
-                iDayNr = daynrcounter
+    return Regions.time_values(current_time)
+
+
+##########################################################################
+# Get the hours of the forecast per the region, starting with the
+# current hour
+##########################################################################
+def get_forecast_hours(region, hours, ignore_region_time=False):
 
-        daynrcounter = daynrcounter + 1
+    if ignore_region_time:
+        start_time = current_host_time.replace(minute=0, second=0, microsecond=0)
+        return [Regions.time_values(start_time + datetime.timedelta(hours=h)) for h in range(hours)]
 
-    return iDayOfWeek, iDay, iCurrentHour, iDayOfMonth, iDayNr
+    # Step in UTC and convert every hour, so a change to or from daylight saving time is taken into account
+    start_time = current_utc_time.replace(minute=0, second=0, microsecond=0)
+    return [Regions.time_values(Regions.local_time(region, start_time + datetime.timedelta(hours=h))) for h in range(hours)]
 
 
 ##########################################################################
 # Configure logging output
 ##########################################################################
-def MakeLog(msg, no_end=False):
-    global logdetails
+def MakeLog(msg, no_end=False, level=LogOutput.INFO):
+    if level < log_level:
+        return
     if no_end:
-        print(msg, end="")
+        with print_lock:
+            print(msg, end="")
     else:
-        print(msg)
+        msg = str(msg)
+        region = getattr(log_context, "region", "")
+        with print_lock:
+            print("[{}] {}".format(region, msg) if region else msg)
+        if log_json or log_shipper:
+            now = time.time()
+            if log_json:
+                log_json.write(now, level, region, msg)
+            if log_shipper:
+                log_shipper.add(now, "[{}] {}".format(region, msg) if region else msg)
+
+
+def log_enabled(level):
+    return level >= log_level
+
+
+##########################################################################
+# Send a batch of log lines to the OCI Logging service (-log)
+##########################################################################
+def put_logs(entries):
+    batch = oci.loggingingestion.models.LogEntryBatch()
+    batch.source = "Autoscale-script"
+    batch.type = "Autoscale-script-output"
+    batch.subject = "Autoscale operations"
+    batch.defaultlogentrytime = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    batch.entries = []
+    for timestamp, message in entries:
         logdetail = oci.loggingingestion.models.LogEntry()
-        logdetail.id = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        logdetail.data = msg
-        logdetail.time = datetime.datetime.now(datetime.timezone.utc).isoformat()
-        logdetails.entries.append(logdetail)
+        logdetail.id = str(uuid.uuid4())
+        logdetail.data = message
+        logdetail.time = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+        batch.entries.append(logdetail)
+
+    putlogdetails = oci.loggingingestion.models.PutLogsDetails()
+    putlogdetails.specversion = "1.0"
+    putlogdetails.log_entry_batches = [batch]
+
+    client_registry.get("logging", tenancy_home_region).put_logs(log_id=cmd.log, put_logs_details=putlogdetails)
+
+
+##########################################################################
+# Send the remaining log lines and close the log file at exit
+##########################################################################
+def close_log_output():
+    if log_shipper:
+        log_shipper.close()
+        if log_shipper.dropped:
+            print("{} log lines could not be sent to the Logging service".format(log_shipper.dropped))
+    if log_json:
+        log_json.close()
 
 
 ##########################################################################
@@ -167,183 +325,686 @@ def isDeleted(state):
 
 
 ###############################################
-# AutonomousThread
+# Service clients, service: (SDK module, client class)
+# with the endpoint template when it is not the default
 ###############################################
-class AutonomousThread(threading.Thread):
+ServiceClients = {
+    "compute": ("core", "ComputeClient"),
+    "database": ("database", "DatabaseClient"),
+    "pool": ("core", "ComputeManagementClient"),
+    "search": ("resource_search", "ResourceSearchClient"),
+    "oda": ("oda", "OdaClient"),
+    "analytics": ("analytics", "AnalyticsClient"),
+    "integration": ("integration", "IntegrationInstanceClient"),
+    "loadbalancer": ("load_balancer", "LoadBalancerClient"),
+    "mysql": ("mysql", "DbSystemClient"),
+    "goldengate": ("golden_gate", "GoldenGateClient"),
+    "dataintegration": ("data_integration", "DataIntegrationClient"),
+    "visualbuilder": ("visual_builder", "VbInstanceClient"),
+    "workrequests": ("work_requests", "WorkRequestClient"),
+    "identity": ("identity", "IdentityClient"),
+    "ons": ("ons", "NotificationDataPlaneClient"),
+    "logging": ("loggingingestion", "LoggingClient"),
+    "monitoring": ("monitoring", "MonitoringClient", "https://telemetry-ingestion.{region}.{secondLevelDomain}"),
+}
 
-    def __init__(self, threadID, ID, NAME, CPU):
-        threading.Thread.__init__(self)
-        self.threadID = threadID
-        self.ID = ID
-        self.NAME = NAME
-        self.CPU = CPU
 
-    def run(self):
-        global total_resources
-        global ErrorsFound
-        global errors
-        global success
+###############################################
+# RegionContext
+###############################################
+class RegionContext:
+    """Service clients and time budget for a single region.
 
-        MakeLog(" - Starting Autonomous DB {} and after that scaling to {} cpus".format(self.NAME, self.CPU))
-        Retry = True
-        while Retry:
-            try:
-                response = database.start_autonomous_database(autonomous_database_id=self.ID)
-                Retry = False
-                success.append("Started Autonomous DB {}".format(self.NAME))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
-                else:
-                    ErrorsFound = True
-                    errors.append(" - Error ({}) Starting Autonomous DB {}".format(response.status, self.NAME))
-                    Retry = False
-
-        response = database.get_autonomous_database(autonomous_database_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-
-        time.sleep(10)
-        while response.data.lifecycle_state != "AVAILABLE":
-            response = database.get_autonomous_database(autonomous_database_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-            time.sleep(10)
-        MakeLog("Autonomous DB {} started, re-scaling to {} cpus".format(self.NAME, self.CPU))
-        dbupdate = oci.database.models.UpdateAutonomousDatabaseDetails()
-        if response.data.compute_model == "OCPU":
-            dbupdate.cpu_core_count = self.CPU
-        if response.data.compute_model == "ECPU":
-            dbupdate.compute_count = self.CPU
-
-        Retry = True
-        while Retry:
-            try:
-                response = database.update_autonomous_database(autonomous_database_id=self.ID, update_autonomous_database_details=dbupdate)
-                Retry = False
-                success.append("Autonomous DB {} started, re-scaling to {} cpus".format(self.NAME, self.CPU))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
-                else:
-                    errors.append(" - Error ({}) re-scaling to {} cpus for {}".format(response.status, self.CPU, self.NAME))
-                    Retry = False
+    Every region gets its own context so regions can be processed in parallel.
+    The clients come from the client registry, a client, and the SDK module
+    it is in, is only loaded when the service is used for the first time.
+    """
 
+    def __init__(self, region, registry, time_budget=0, log_region=False):
+        self.region = region
+        self.registry = registry
+        self.start(time_budget, log_region)
 
-###############################################
-# PoolThread
-###############################################
-class PoolThread(threading.Thread):
+    def __getattr__(self, service):
+        if service not in ServiceClients:
+            raise AttributeError(service)
+        return self.registry.get(service, self.region)
 
-    def __init__(self, threadID, ID, NAME, INSTANCES):
-        threading.Thread.__init__(self)
-        self.threadID = threadID
-        self.ID = ID
-        self.NAME = NAME
-        self.INSTANCES = INSTANCES
+    def start(self, time_budget=0, log_region=False):
+        # Reset the time budget, the clients are kept for the next run in daemon mode
+        self.log_region = log_region
+        self.deadline = time.time() + time_budget if time_budget else None
 
-    def run(self):
-        global total_resources
-        global ErrorsFound
-        global errors
-        global success
+    def time_left(self):
+        if self.deadline is None:
+            return None
+        return max(0, self.deadline - time.time())
 
-        MakeLog(" - Starting Instance Pool {} and after that scaling to {} instances".format(self.NAME, self.INSTANCES))
-        Retry = True
-        while Retry:
-            try:
-                response = pool.start_instance_pool(instance_pool_id=self.ID)
-                Retry = False
-                success.append(" - Starting Instance Pool {}".format(self.NAME))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
-                else:
-                    errors.append(" - Error ({}) starting instance pool {}".format(response.status, self.NAME))
-                    Retry = False
-
-        response = pool.get_instance_pool(instance_pool_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-        time.sleep(10)
-        while response.data.lifecycle_state != "RUNNING":
-            response = pool.get_instance_pool(instance_pool_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-            time.sleep(10)
-        MakeLog("Instance pool {} started, re-scaling to {} instances".format(self.NAME, self.INSTANCES))
-        pooldetails = oci.core.models.UpdateInstancePoolDetails()
-        pooldetails.size = self.INSTANCES
-
-        Retry = True
-        while Retry:
-            try:
-                response = pool.update_instance_pool(instance_pool_id=self.ID, update_instance_pool_details=pooldetails)
-                Retry = False
-                success.append("Rescaling Instance Pool {} to {} instances".format(self.NAME, self.INSTANCES))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
+    def expired(self):
+        return self.deadline is not None and time.time() > self.deadline
+
+
+def set_log_region(ctx):
+    log_context.region = ctx.region if ctx.log_region else ""
+
+
+##########################################################################
+# Plan the actions for a resource, based on the schedule for this hour
+# The actions are run by the action executor, or written to a plan file
+##########################################################################
+def plan_resource(ctx, resource, resourceDetails, CurrentSlot):
+
+    actions = []
+
+    def plan(service, operation, kwargs, current_state, target_state, log, message, error, wait_for=None, then=None):
+        action = Actions.Action(ctx.region, resource.identifier, resource.display_name, resource.resource_type, service, operation, kwargs,
+                                current_state, target_state, log, message, error, wait_for, then)
+        actions.append(action)
+        return action
+
+    ###################################################################################
+    # Instance
+    ###################################################################################
+    if resource.resource_type == "Instance":
+        # Check if value is (CPU:Memory) value for flex shapes
+        if CurrentSlot.kind == Schedule.FLEX:
+            if "flex" in resourceDetails.shape.lower():
+                cpu, memory = CurrentSlot.cpu, CurrentSlot.memory
+                if cpu != resourceDetails.shape_config.ocpus or memory != resourceDetails.shape_config.memory_in_gbs:
+                    MakeLog("Changing VM size")
+                    changedetails = Actions.model("core.UpdateInstanceDetails", shape_config=Actions.model("core.UpdateInstanceShapeConfigDetails", ocpus=cpu, memory_in_gbs=memory))
+                    plan("compute", "update_instance", {"instance_id": resource.identifier, "update_instance_details": changedetails},
+                         "({}:{})".format(resourceDetails.shape_config.ocpus, resourceDetails.shape_config.memory_in_gbs), CurrentSlot.text,
+                         "Modifying flex shape. CPU count: {} - Memory {}".format(cpu, memory),
+                         " - Modifying flex shape of {} to CPU count: {} - Memory {}".format(resource.display_name, cpu, memory),
+                         "Modifying flex shape for {}".format(resource.display_name))
                 else:
-                    ErrorsFound = True
-                    errors.append(" - Error ({}) rescaling instance pool {}".format(response.status, self.NAME))
-                    Retry = False
+                    MakeLog("Ignoring schedule as VM is already in the desired state")
 
+            else:
+                MakeLog("Can not apply this modification {}, as shape is not a flex shape".format(CurrentSlot.text))
 
-###############################################
-# AnalyticsThread
-###############################################
-class AnalyticsThread(threading.Thread):
+        else:
+            if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+                # Only perform action if VM Instance, ignoring any BM instances.
+                if resourceDetails.shape[:2] == "VM":
+                    if resourceDetails.lifecycle_state == "RUNNING" and CurrentSlot.value == 0:
+                        if Action == "All" or Action == "Down":
+                            plan("compute", "instance_action", {"instance_id": resource.identifier, "action": ComputeShutdownMethod}, "RUNNING", "STOPPED",
+                                 " - Initiate Compute VM shutdown for {}".format(resource.display_name),
+                                 " - Initiate Compute VM shutdown for {}".format(resource.display_name),
+                                 "Compute VM Shutdown for {}".format(resource.display_name))
+
+                    if resourceDetails.lifecycle_state == "STOPPED" and CurrentSlot.value == 1:
+                        if Action == "All" or Action == "Up":
+                            plan("compute", "instance_action", {"instance_id": resource.identifier, "action": "START"}, "STOPPED", "RUNNING",
+                                 " - Initiate Compute VM startup for {}".format(resource.display_name),
+                                 " - Initiate Compute VM startup for {}".format(resource.display_name),
+                                 "Compute VM startup for {}".format(resource.display_name))
 
-    def __init__(self, threadID, ID, NAME, CPU):
-        threading.Thread.__init__(self)
-        self.threadID = threadID
-        self.ID = ID
-        self.NAME = NAME
-        self.CPU = CPU
+    ###################################################################################
+    # DBSystem
+    ###################################################################################
+    if resource.resource_type == "DbSystem":
+        # Execute On/Off operations for Database VMs
+        if resourceDetails.shape[:2] == "VM":
+            dbnodes = ctx.database.list_db_nodes(compartment_id=resource.compartment_id, db_system_id=resource.identifier).data
+            for dbnodedetails in dbnodes:
+                if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+                    if dbnodedetails.lifecycle_state == "AVAILABLE" and CurrentSlot.value == 0:
+                        if Action == "All" or Action == "Down":
+                            plan("database", "db_node_action", {"db_node_id": dbnodedetails.id, "action": "STOP"}, "AVAILABLE", "STOPPED",
+                                 " - Initiate DB VM shutdown for {}".format(resource.display_name),
+                                 " - Initiate DB VM shutdown for {}".format(resource.display_name),
+                                 "DB VM shutdown for {}".format(resource.display_name))
+                    if dbnodedetails.lifecycle_state == "STOPPED" and CurrentSlot.value == 1:
+                        if Action == "All" or Action == "Up":
+                            plan("database", "db_node_action", {"db_node_id": dbnodedetails.id, "action": "START"}, "STOPPED", "AVAILABLE",
+                                 " - Initiate DB VM startup for {}".format(resource.display_name),
+                                 " - Initiate DB VM startup for {}".format(resource.display_name),
+                                 "DB VM startup for {}".format(resource.display_name))
+
+        ###################################################################################
+        # BM
+        ###################################################################################
+        if resourceDetails.shape[:2] == "BM":
+            if CurrentSlot.value > 1 and CurrentSlot.value < 53:
+                dbupdate = Actions.model("database.UpdateDbSystemDetails", cpu_core_count=CurrentSlot.value)
+                if resourceDetails.cpu_core_count > CurrentSlot.value:
+                    if Action == "All" or Action == "Down":
+                        plan("database", "update_db_system", {"db_system_id": resource.identifier, "update_db_system_details": dbupdate},
+                             resourceDetails.cpu_core_count, CurrentSlot.value,
+                             " - Initiate DB BM Scale Down to {} for {}".format(CurrentSlot.value, resource.display_name),
+                             " - Initiate DB BM Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                             "DB BM Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
+
+                if resourceDetails.cpu_core_count < CurrentSlot.value:
+                    if Action == "All" or Action == "Up":
+                        plan("database", "update_db_system", {"db_system_id": resource.identifier, "update_db_system_details": dbupdate},
+                             resourceDetails.cpu_core_count, CurrentSlot.value,
+                             " - Initiate DB BM Scale UP to {} for {}".format(CurrentSlot.value, resource.display_name),
+                             " - Initiate DB BM Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                             "DB BM Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
+
+        ###################################################################################
+        # Exadata (Old exadata shape)
+        ###################################################################################
+        if resourceDetails.shape[:7] == "Exadata":
+            dbupdate = Actions.model("database.UpdateDbSystemDetails", cpu_core_count=CurrentSlot.value)
+            if resourceDetails.cpu_core_count > CurrentSlot.value:
+                if Action == "All" or Action == "Down":
+                    plan("database", "update_db_system", {"db_system_id": resource.identifier, "update_db_system_details": dbupdate},
+                         resourceDetails.cpu_core_count, CurrentSlot.value,
+                         " - Initiate Exadata CS Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                         " - Initiate Exadata DB Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                         "Exadata DB Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
+
+            if resourceDetails.cpu_core_count < CurrentSlot.value:
+                if Action == "All" or Action == "Up":
+                    plan("database", "update_db_system", {"db_system_id": resource.identifier, "update_db_system_details": dbupdate},
+                         resourceDetails.cpu_core_count, CurrentSlot.value,
+                         " - Initiate Exadata CS Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                         " - Initiate Exadata DB Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                         "Exadata DB Scale Up from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
 
-    def run(self):
-        global total_resources
-        global ErrorsFound
-        global errors
-        global success
+    ###################################################################################
+    # Exadata - VM Cluster
+    ###################################################################################
+    if resource.resource_type == "CloudVmCluster":
+        dbupdate = Actions.model("database.UpdateCloudVmClusterDetails", cpu_core_count=CurrentSlot.value)
+        if resourceDetails.cpu_core_count > CurrentSlot.value:
+            if Action == "All" or Action == "Down":
+                plan("database", "update_cloud_vm_cluster", {"cloud_vm_cluster_id": resource.identifier, "update_cloud_vm_cluster_details": dbupdate},
+                     resourceDetails.cpu_core_count, CurrentSlot.value,
+                     " - Initiate Exadata VM Cluster Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                     " - Initiate Exadata VM Cluster Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                     "Exadata VM Cluster Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
+
+        if resourceDetails.cpu_core_count < CurrentSlot.value:
+            if Action == "All" or Action == "Up":
+                plan("database", "update_cloud_vm_cluster", {"cloud_vm_cluster_id": resource.identifier, "update_cloud_vm_cluster_details": dbupdate},
+                     resourceDetails.cpu_core_count, CurrentSlot.value,
+                     " - Initiate Exadata VM Cluster Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                     " - Initiate Exadata VM Cluster Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name),
+                     "Exadata VM Cluster Scale Up from {} to {} for {}".format(resourceDetails.cpu_core_count, CurrentSlot.value, resource.display_name))
 
-        MakeLog(" - Starting Analytics Service {} and after that scaling to {} cpus".format(self.NAME, self.CPU))
-        Retry = True
-        while Retry:
-            try:
-                response = analytics.start_analytics_instance(analytics_instance_id=self.ID)
-                Retry = False
-                success.append("Started Analytics Service {}".format(self.NAME))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
+    ###################################################################################
+    # VmCluster
+    ###################################################################################
+    if resource.resource_type == "VmCluster":
+        if CurrentSlot.value >= 0 and CurrentSlot.value < 401:
+            # Cluster VM is running, request is amount of CPU core change is needed
+            if resourceDetails.lifecycle_state == "AVAILABLE" and CurrentSlot.value > 0:
+                dbupdate = Actions.model("database.UpdateVmClusterDetails", cpu_core_count=CurrentSlot.value)
+                if resourceDetails.cpus_enabled > CurrentSlot.value:
+                    if Action == "All" or Action == "Down":
+                        plan("database", "update_vm_cluster", {"vm_cluster_id": resource.identifier, "update_vm_cluster_details": dbupdate},
+                             resourceDetails.cpus_enabled, CurrentSlot.value,
+                             " - Initiate ExadataC@C VM Cluster Scale Down to {} for {}".format(CurrentSlot.value, resource.display_name),
+                             " - Initiate ExadataC&C Cluster VM Scale Down from {} to {} for {}".format(resourceDetails.cpus_enabled, CurrentSlot.value, resource.display_name),
+                             "ExadataC&C Cluster VM Scale Down from {} to {} for {}".format(resourceDetails.cpus_enabled, CurrentSlot.value, resource.display_name))
+
+                if resourceDetails.cpus_enabled < CurrentSlot.value:
+                    if Action == "All" or Action == "Up":
+                        plan("database", "update_vm_cluster", {"vm_cluster_id": resource.identifier, "update_vm_cluster_details": dbupdate},
+                             resourceDetails.cpus_enabled, CurrentSlot.value,
+                             " - Initiate ExadataC@C VM Cluster Scale Up from {} to {} for {}".format(resourceDetails.cpus_enabled, CurrentSlot.value, resource.display_name),
+                             " - Initiate ExadataC&C Cluster VM Scale Up to {} for {}".format(CurrentSlot.value, resource.display_name),
+                             "ExadataC&C Cluster VM Scale Up from {} to {} for {}".format(resourceDetails.cpus_enabled, CurrentSlot.value, resource.display_name))
+
+    ###################################################################################
+    # AutonomousDatabase
+    ###################################################################################
+    # Execute CPU Scale Up/Down operations for Database BMs
+    if resource.resource_type == "AutonomousDatabase":
+        if CurrentSlot.value >= 0 and CurrentSlot.value < 129:
+            scalefrom = None
+            dbupdate = None
+            if resourceDetails.compute_model == "ECPU":
+                scalefrom = int(resourceDetails.compute_count)
+                dbupdate = Actions.model("database.UpdateAutonomousDatabaseDetails", compute_count=CurrentSlot.value)
+            if resourceDetails.compute_model == "OCPU":
+                scalefrom = int(resourceDetails.cpu_core_count)
+                dbupdate = Actions.model("database.UpdateAutonomousDatabaseDetails", cpu_core_count=CurrentSlot.value)
+
+            # Autonomous DB is running request is amount of CPU core change is needed
+            if resourceDetails.lifecycle_state == "AVAILABLE" and CurrentSlot.value > 0 and dbupdate:
+                if scalefrom > CurrentSlot.value:
+                    if Action == "All" or Action == "Down":
+                        plan("database", "update_autonomous_database", {"autonomous_database_id": resource.identifier, "update_autonomous_database_details": dbupdate},
+                             scalefrom, CurrentSlot.value,
+                             " - Initiate Autonomous DB Scale Down from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name),
+                             " - Initiate Autonomous DB Scale Down from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name),
+                             "Autonomous DB Scale Down from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name))
+
+                if scalefrom < CurrentSlot.value:
+                    if Action == "All" or Action == "Up":
+                        plan("database", "update_autonomous_database", {"autonomous_database_id": resource.identifier, "update_autonomous_database_details": dbupdate},
+                             scalefrom, CurrentSlot.value,
+                             " - Initiate Autonomous DB Scale Up from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name),
+                             " - Initiate Autonomous DB Scale Up from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name),
+                             "Autonomous DB Scale Up from {} to {} for {}".format(scalefrom, CurrentSlot.value, resource.display_name))
+
+            # Autonomous DB is running request is to stop the database
+            if resourceDetails.lifecycle_state == "AVAILABLE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    plan("database", "stop_autonomous_database", {"autonomous_database_id": resource.identifier}, "AVAILABLE", "STOPPED",
+                         " - Stoping Autonomous DB {}".format(resource.display_name),
+                         " - Initiate Autonomous DB Shutdown for {}".format(resource.display_name),
+                         "Autonomous DB Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "STOPPED" and CurrentSlot.value > 0:
+                if Action == "All" or Action == "Up":
+                    # Autonomous DB is stopped and needs to be started with same amount of CPUs configured
+                    if scalefrom == CurrentSlot.value:
+                        plan("database", "start_autonomous_database", {"autonomous_database_id": resource.identifier}, "STOPPED", "AVAILABLE",
+                             " - Starting Autonomous DB {}".format(resource.display_name),
+                             " - Initiate Autonomous DB Startup for {}".format(resource.display_name),
+                             "Autonomous DB Startup for {}".format(resource.display_name))
+
+                    # Autonomous DB is stopped and needs to be started, after that it requires CPU change
+                    elif dbupdate:
+                        rescale = Actions.Action(ctx.region, resource.identifier, resource.display_name, resource.resource_type,
+                                                 "database", "update_autonomous_database", {"autonomous_database_id": resource.identifier, "update_autonomous_database_details": dbupdate},
+                                                 scalefrom, CurrentSlot.value,
+                                                 "Autonomous DB {} started, re-scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                                                 "Autonomous DB {} started, re-scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                                                 "re-scaling to {} cpus for {}".format(CurrentSlot.value, resource.display_name))
+                        plan("database", "start_autonomous_database", {"autonomous_database_id": resource.identifier}, "STOPPED", "AVAILABLE",
+                             " - Starting Autonomous DB {} and after that scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                             "Started Autonomous DB {}".format(resource.display_name),
+                             "Starting Autonomous DB {}".format(resource.display_name),
+                             {"service": "database", "operation": "get_autonomous_database", "kwargs": {"autonomous_database_id": resource.identifier},
+                              "compartment_id": resource.compartment_id, "state": "AVAILABLE"},
+                             [rescale])
+
+    ###################################################################################
+    # InstancePool
+    ###################################################################################
+    if resource.resource_type == "InstancePool":
+        pooldetails = Actions.model("core.UpdateInstancePoolDetails", size=CurrentSlot.value)
+
+        # Stop Resource pool action
+        if resourceDetails.lifecycle_state == "RUNNING" and CurrentSlot.value == 0:
+            if Action == "All" or Action == "Down":
+                plan("pool", "stop_instance_pool", {"instance_pool_id": resource.identifier}, "RUNNING", "STOPPED",
+                     " - Stopping instance pool {}".format(resource.display_name),
+                     " - Stopping instance pool {}".format(resource.display_name),
+                     "Stopping instance pool for {}".format(resource.display_name))
+
+        # Scale up action on running instance pool
+        elif resourceDetails.lifecycle_state == "RUNNING" and CurrentSlot.value > resourceDetails.size:
+            if Action == "All" or Action == "Up":
+                plan("pool", "update_instance_pool", {"instance_pool_id": resource.identifier, "update_instance_pool_details": pooldetails},
+                     resourceDetails.size, CurrentSlot.value,
+                     " - Scaling up instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value),
+                     " - Scaling up instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value),
+                     "Scaling up instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value))
+
+        # Scale down action on running instance pool
+        elif resourceDetails.lifecycle_state == "RUNNING" and CurrentSlot.value < resourceDetails.size:
+            if Action == "All" or Action == "Down":
+                plan("pool", "update_instance_pool", {"instance_pool_id": resource.identifier, "update_instance_pool_details": pooldetails},
+                     resourceDetails.size, CurrentSlot.value,
+                     " - Scaling down instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value),
+                     " - Scaling down instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value),
+                     "Scaling down instance pool {} to {} instances".format(resource.display_name, CurrentSlot.value))
+
+        elif resourceDetails.lifecycle_state == "STOPPED" and CurrentSlot.value > 0:
+            if Action == "All" or Action == "Up":
+                # Start instance pool with same amount of instances as configured
+                if resourceDetails.size == CurrentSlot.value:
+                    plan("pool", "start_instance_pool", {"instance_pool_id": resource.identifier}, "STOPPED", "RUNNING",
+                         " - Starting instance pool {} from stopped state".format(resource.display_name),
+                         " - Starting instance pool {} from stopped state".format(resource.display_name),
+                         "Starting instance pool {} from stopped state".format(resource.display_name))
+
+                # Start instance pool and after that resize the instance pool to desired state:
                 else:
-                    ErrorsFound = True
-                    errors.append(" - Error ({}) Starting Analytics Service {}".format(response.status, self.NAME))
-                    Retry = False
-
-        response = analytics.get_analytics_instance(analytics_instance_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-        time.sleep(10)
-        while response.data.lifecycle_state != "ACTIVE":
-            response = analytics.get_analytics_instance(analytics_instance_id=self.ID, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-            time.sleep(10)
-        MakeLog("Analytics Service {} started, re-scaling to {} cpus".format(self.NAME, self.CPU))
-        capacity = oci.analytics.models.capacity.Capacity()
-        capacity.capacity_value = self.CPU
-        capacity.capacity_type = capacity.CAPACITY_TYPE_OLPU_COUNT
-        details = oci.analytics.models.ScaleAnalyticsInstanceDetails()
-        details.capacity = capacity
-        Retry = True
-        while Retry:
-            try:
-                response = analytics.scale_analytics_instance(analytics_instance_id=self.ID, scale_analytics_instance_details=details)
-                Retry = False
-                success.append("Analytics Service {} started, re-scaling to {} cpus".format(self.NAME, self.CPU))
-            except oci.exceptions.ServiceError as response:
-                if response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
+                    rescale = Actions.Action(ctx.region, resource.identifier, resource.display_name, resource.resource_type,
+                                             "pool", "update_instance_pool", {"instance_pool_id": resource.identifier, "update_instance_pool_details": pooldetails},
+                                             resourceDetails.size, CurrentSlot.value,
+                                             "Instance pool {} started, re-scaling to {} instances".format(resource.display_name, CurrentSlot.value),
+                                             "Rescaling Instance Pool {} to {} instances".format(resource.display_name, CurrentSlot.value),
+                                             "rescaling instance pool {}".format(resource.display_name))
+                    plan("pool", "start_instance_pool", {"instance_pool_id": resource.identifier}, "STOPPED", "RUNNING",
+                         " - Starting Instance Pool {} and after that scaling to {} instances".format(resource.display_name, CurrentSlot.value),
+                         " - Starting Instance Pool {}".format(resource.display_name),
+                         "starting instance pool {}".format(resource.display_name),
+                         {"service": "pool", "operation": "get_instance_pool", "kwargs": {"instance_pool_id": resource.identifier},
+                          "compartment_id": resource.compartment_id, "state": "RUNNING"},
+                         [rescale])
+
+    ###################################################################################
+    # OdaInstance
+    ###################################################################################
+    if resource.resource_type == "OdaInstance":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    plan("oda", "stop_oda_instance", {"oda_instance_id": resource.identifier}, "ACTIVE", "INACTIVE",
+                         " - Initiate ODA shutdown for {}".format(resource.display_name),
+                         " - Initiate ODA shutdown for {}".format(resource.display_name),
+                         "ODA Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "INACTIVE" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    plan("oda", "start_oda_instance", {"oda_instance_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Initiate ODA startup for {}".format(resource.display_name),
+                         " - Initiate ODA startup for {}".format(resource.display_name),
+                         "ODA startup for {}".format(resource.display_name))
+
+    ###################################################################################
+    # AnalyticsInstance
+    ###################################################################################
+    if resource.resource_type == "AnalyticsInstance":
+        currentcapacity = int(resourceDetails.capacity.capacity_value)
+        details = Actions.model("analytics.ScaleAnalyticsInstanceDetails",
+                                capacity=Actions.model("analytics.Capacity", capacity_value=CurrentSlot.value, capacity_type=oci.analytics.models.Capacity.CAPACITY_TYPE_OLPU_COUNT))
+
+        # Execute Shutdown operations
+        if CurrentSlot.value == 0 and resourceDetails.lifecycle_state == "ACTIVE":
+            if Action == "All" or Action == "Down":
+                plan("analytics", "stop_analytics_instance", {"analytics_instance_id": resource.identifier}, "ACTIVE", "INACTIVE",
+                     " - Initiate Analytics shutdown for {}".format(resource.display_name),
+                     " - Initiate Analytics shutdown for {}".format(resource.display_name),
+                     "Analytics Shutdown for {}".format(resource.display_name))
+
+        # Execute Startup operations
+        if CurrentSlot.value != 0 and resourceDetails.lifecycle_state == "INACTIVE":
+            if Action == "All" or Action == "Up":
+                if currentcapacity == CurrentSlot.value:
+                    plan("analytics", "start_analytics_instance", {"analytics_instance_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Initiate Analytics Startup for {}".format(resource.display_name),
+                         " - Initiate Analytics Startup for {}".format(resource.display_name),
+                         "Analytics Startup for {}".format(resource.display_name))
+
+                # Execute Startup and scaling operations
+                else:
+                    rescale = Actions.Action(ctx.region, resource.identifier, resource.display_name, resource.resource_type,
+                                             "analytics", "scale_analytics_instance", {"analytics_instance_id": resource.identifier, "scale_analytics_instance_details": details},
+                                             currentcapacity, CurrentSlot.value,
+                                             "Analytics Service {} started, re-scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                                             "Analytics Service {} started, re-scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                                             "re-scaling Analytics to {} cpus for {}".format(CurrentSlot.value, resource.display_name))
+                    plan("analytics", "start_analytics_instance", {"analytics_instance_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Starting Analytics Service {} and after that scaling to {} cpus".format(resource.display_name, CurrentSlot.value),
+                         "Started Analytics Service {}".format(resource.display_name),
+                         "Starting Analytics Service {}".format(resource.display_name),
+                         {"service": "analytics", "operation": "get_analytics_instance", "kwargs": {"analytics_instance_id": resource.identifier},
+                          "compartment_id": resource.compartment_id, "state": "ACTIVE"},
+                         [rescale])
+
+        # Execute scaling operations on running instance
+        if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value != currentcapacity:
+            if currentcapacity == 1 or currentcapacity > 12:
+                results.add_error(" - Error (Analytics instance with CPU count {} can not be scaled for instance: {}".format(currentcapacity, resource.display_name))
+                MakeLog(" - Error (Analytics instance with CPU count {} can not be scaled for instance: {}".format(currentcapacity, resource.display_name), level=LogOutput.ERROR)
+            goscale = False
+            if (CurrentSlot.value >= 2 and CurrentSlot.value <= 8) and (currentcapacity >= 2 and currentcapacity <= 8):
+                goscale = True
+
+            if (CurrentSlot.value >= 10 and CurrentSlot.value <= 12) and (currentcapacity >= 10 and currentcapacity <= 12):
+                goscale = True
+
+            if goscale:
+                goscale = False
+                if Action == "All":
+                    goscale = True
+                elif currentcapacity < CurrentSlot.value and Action == "Up":
+                    goscale = True
+                elif currentcapacity > CurrentSlot.value and Action == "Down":
+                    goscale = True
+
+                if goscale:
+                    plan("analytics", "scale_analytics_instance", {"analytics_instance_id": resource.identifier, "scale_analytics_instance_details": details},
+                         currentcapacity, CurrentSlot.value,
+                         " - Initiate Analytics Scaling from {} to {}oCPU for {}".format(currentcapacity, CurrentSlot.value, resource.display_name),
+                         " - Initiate Analytics Scaling from {} to {}oCPU for {}".format(currentcapacity, CurrentSlot.value, resource.display_name),
+                         "Analytics scaling from {} to {}oCPU for {}".format(currentcapacity, CurrentSlot.value, resource.display_name))
+            else:
+                results.add_error(" - Error (Analytics scaling from {} to {}oCPU, invalid combination for {}".format(currentcapacity, CurrentSlot.value, resource.display_name))
+                MakeLog(" - Error (Analytics scaling from {} to {}oCPU, invalid combination for {}".format(currentcapacity, CurrentSlot.value, resource.display_name), level=LogOutput.ERROR)
+
+    ###################################################################################
+    # IntegrationInstance
+    ###################################################################################
+    if resource.resource_type == "IntegrationInstance":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    plan("integration", "stop_integration_instance", {"integration_instance_id": resource.identifier}, "ACTIVE", "INACTIVE",
+                         " - Initiate Integration Service shutdown for {}".format(resource.display_name),
+                         " - Initiate Integration Service shutdown for {}".format(resource.display_name),
+                         "Integration Service Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "INACTIVE" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    plan("integration", "start_integration_instance", {"integration_instance_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Initiate Integration Service startup for {}".format(resource.display_name),
+                         " - Initiate Integration Service startup for {}".format(resource.display_name),
+                         "Integration Service startup for {}".format(resource.display_name))
+
+    ###################################################################################
+    # LoadBalancer
+    ###################################################################################
+    if resource.resource_type == "LoadBalancer":
+        requestedShape = CurrentSlot.value
+        shape = 0
+        if resourceDetails.shape_name == "10Mbps":
+            shape = 10
+        if resourceDetails.shape_name == "100Mbps":
+            shape = 100
+        if resourceDetails.shape_name == "400Mbps":
+            shape = 400
+        if resourceDetails.shape_name == "8000Mbps":
+            shape = 8000
+        if resourceDetails.shape_name == "flexible":
+            shape = resourceDetails.shape_details.maximum_bandwidth_in_mbps
+        if (requestedShape == 10 or requestedShape == 100 or requestedShape == 400 or requestedShape == 8000) and resourceDetails.shape_name != "flexible":
+            details = Actions.model("load_balancer.UpdateLoadBalancerShapeDetails", shape_name="{}Mbps".format(requestedShape))
+            if requestedShape < shape:
+                if Action == "All" or Action == "Down":
+                    plan("loadbalancer", "update_load_balancer_shape", {"load_balancer_id": resource.identifier, "update_load_balancer_shape_details": details},
+                         resourceDetails.shape_name, "{}Mbps".format(requestedShape),
+                         " - Downsizing loadbalancer from {} to {}Mbps".format(resourceDetails.shape_name, requestedShape),
+                         " - Downsizing loadbalancer {} from {} to {}Mbps".format(resource.display_name, resourceDetails.shape_name, requestedShape),
+                         "Load Balancer sizing for {}".format(resource.display_name))
+
+            if requestedShape > shape:
+                if Action == "All" or Action == "Up":
+                    plan("loadbalancer", "update_load_balancer_shape", {"load_balancer_id": resource.identifier, "update_load_balancer_shape_details": details},
+                         resourceDetails.shape_name, "{}Mbps".format(requestedShape),
+                         " - Upsizing loadbalancer from {} to {}Mbps".format(resourceDetails.shape_name, requestedShape),
+                         " - Upsizing loadbalancer {} from {} to {}Mbps".format(resource.display_name, resourceDetails.shape_name, requestedShape),
+                         "Load Balancer sizing for {}".format(resource.display_name))
+        elif resourceDetails.shape_name == "flexible":
+            flexdetails = Actions.model("load_balancer.ShapeDetails", minimum_bandwidth_in_mbps=resourceDetails.shape_details.minimum_bandwidth_in_mbps, maximum_bandwidth_in_mbps=requestedShape)
+            details = Actions.model("load_balancer.UpdateLoadBalancerShapeDetails", shape_name=resourceDetails.shape_name, shape_details=flexdetails)
+            if requestedShape < shape:
+                if Action == "All" or Action == "Down":
+                    plan("loadbalancer", "update_load_balancer_shape", {"load_balancer_id": resource.identifier, "update_load_balancer_shape_details": details},
+                         shape, requestedShape,
+                         " - Downsizing Flex loadbalancer from {} to {}".format(shape, requestedShape),
+                         " - Downsizing Flex loadbalancer {} from {} to {}".format(resource.display_name, shape, requestedShape),
+                         "Flex Load Balancer sizing for {}".format(resource.display_name))
                 else:
-                    errors.append("Error ({}) re-scaling Analytics to {} cpus for {}".format(response.status, self.CPU, self.NAME))
-                    Retry = False
+                    MakeLog(" - Ignoring size as this is smaller then current")
+            if requestedShape > shape:
+                if Action == "All" or Action == "Up":
+                    plan("loadbalancer", "update_load_balancer_shape", {"load_balancer_id": resource.identifier, "update_load_balancer_shape_details": details},
+                         shape, requestedShape,
+                         " - Upsizing Flex loadbalancer from {} to {}".format(shape, requestedShape),
+                         " - Upsizing Flex loadbalancer {} from {} to {}".format(resource.display_name, shape, requestedShape),
+                         "Flex Load Balancer sizing for {}".format(resource.display_name))
+                else:
+                    MakeLog(" - Ignoring size as this is larger then current")
+        else:
+            MakeLog(" - Error {}: requested shape {} does not exists".format(resource.display_name, requestedShape), level=LogOutput.ERROR)
+
+    ###################################################################################
+    # MysqlDBInstance
+    ###################################################################################
+    if resource.resource_type == "MysqlDBInstance":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    stopaction = Actions.model("mysql.StopDbSystemDetails", shutdown_type="SLOW")
+                    plan("mysql", "stop_db_system", {"db_system_id": resource.identifier, "stop_db_system_details": stopaction}, "ACTIVE", "INACTIVE",
+                         " - Initiate MySQL shutdown for {}".format(resource.display_name),
+                         " - Initiate MySql shutdown for {}".format(resource.display_name),
+                         "MySQL Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "INACTIVE" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    plan("mysql", "start_db_system", {"db_system_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Initiate MySQL startup for {}".format(resource.display_name),
+                         " - Initiate MySQL startup for {}".format(resource.display_name),
+                         "MySQL startup for {}".format(resource.display_name))
+
+    ###################################################################################
+    # GoldenGateDeployment
+    ###################################################################################
+    if resource.resource_type == "GoldenGateDeployment":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    stopaction = Actions.model("golden_gate.StopDeploymentDetails", type="DEFAULT")
+                    plan("goldengate", "stop_deployment", {"deployment_id": resource.identifier, "stop_deployment_details": stopaction}, "ACTIVE", "INACTIVE",
+                         " - Initiate GoldenGate shutdown for {}".format(resource.display_name),
+                         " - Initiate GoldenGate shutdown for {}".format(resource.display_name),
+                         "GoldenGate Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "INACTIVE" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    startaction = Actions.model("golden_gate.StartDeploymentDetails", type="DEFAULT")
+                    plan("goldengate", "start_deployment", {"deployment_id": resource.identifier, "start_deployment_details": startaction}, "INACTIVE", "ACTIVE",
+                         " - Initiate GoldenGate startup for {}".format(resource.display_name),
+                         " - Initiate GoldenGate startup for {}".format(resource.display_name),
+                         "GoldenGate startup for {}".format(resource.display_name))
+
+    ###################################################################################
+    # Data Integration Workshop
+    ###################################################################################
+    if resource.resource_type == "DISWorkspace":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    plan("dataintegration", "stop_workspace", {"workspace_id": resource.identifier}, "ACTIVE", "STOPPED",
+                         " - Initiate Data Integration Workspace shutdown for {}".format(resource.display_name),
+                         " - Initiate Data Integration Workspace shutdown for {}".format(resource.display_name),
+                         "Data Integration Workspace Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "STOPPED" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    plan("dataintegration", "start_workspace", {"workspace_id": resource.identifier}, "STOPPED", "ACTIVE",
+                         " - Initiate Data Integration Workspace startup for {}".format(resource.display_name),
+                         " - Initiate Data Integration Workspace startup for {}".format(resource.display_name),
+                         "Data Integration Workspace startup for {}".format(resource.display_name))
+
+    ###################################################################################
+    # Visual Builder (OCI Native version)
+    ###################################################################################
+    if resource.resource_type == "VisualBuilderInstance":
+        if CurrentSlot.value == 0 or CurrentSlot.value == 1:
+            if resourceDetails.lifecycle_state == "ACTIVE" and CurrentSlot.value == 0:
+                if Action == "All" or Action == "Down":
+                    plan("visualbuilder", "stop_vb_instance", {"vb_instance_id": resource.identifier}, "ACTIVE", "INACTIVE",
+                         " - Initiate Visual Builder shutdown for {}".format(resource.display_name),
+                         " - Initiate Visual Builder shutdown for {}".format(resource.display_name),
+                         "Visual Builder Shutdown for {}".format(resource.display_name))
+
+            if resourceDetails.lifecycle_state == "INACTIVE" and CurrentSlot.value == 1:
+                if Action == "All" or Action == "Up":
+                    plan("visualbuilder", "start_vb_instance", {"vb_instance_id": resource.identifier}, "INACTIVE", "ACTIVE",
+                         " - Initiate Visual Builder startup for {}".format(resource.display_name),
+                         " - Initiate Visual Builder startup for {}".format(resource.display_name),
+                         "Visual Builder startup for {}".format(resource.display_name))
+
+    return actions
+
+
+##########################################################################
+# Execute a single action, retries are done by the rate limiter
+##########################################################################
+def execute_action(ctx, action):
+    set_log_region(ctx)
+    if ctx.expired():
+        results.add_result(Executor.Result(action, False, None, " - Error region {} exceeded its time budget, not executed: {}".format(ctx.region, action.error)))
+        MakeLog(" - Error region {} exceeded its time budget, not executed: {}".format(ctx.region, action.error), level=LogOutput.ERROR)
+        metrics.action(ctx.region, action.resource_type, action.operation, False)
+        return False
+    if action.log:
+        MakeLog(action.log)
+    client = getattr(ctx, action.service)
+    with tracer.span("action {}".format(action.operation), ctx.region, action.span, attributes={
+            "oci.resource_type": action.resource_type, "oci.resource_id": action.resource_id, "oci.resource_name": action.resource_name}) as span:
+        # The waiter polls and the actions after it are traced under this action
+        action.span = span
+        for next_action in action.then:
+            next_action.span = span
+        try:
+            response = getattr(client, action.operation)(**action.call_kwargs())
+            action.work_request_id = response.headers.get("opc-work-request-id")
+            results.add_result(Executor.Result(action, True, response.status, action.message))
+            metrics.action(ctx.region, action.resource_type, action.operation, True)
+            return True
+        except oci.exceptions.ServiceError as response:
+            results.add_result(Executor.Result(action, False, response.status, " - Error ({}) {} - {}".format(response.status, action.error, response.message)))
+            MakeLog(" - Error ({}) {} - {}".format(response.status, action.error, response.message), level=LogOutput.ERROR)
+            metrics.action(ctx.region, action.resource_type, action.operation, False)
+            span.set("error", True)
+            return False
+        except Exception as e:
+            results.add_result(Executor.Result(action, False, None, " - Error {} - {}".format(action.error, str(e))))
+            MakeLog(" - Error {} - {}".format(action.error, str(e)), level=LogOutput.ERROR)
+            metrics.action(ctx.region, action.resource_type, action.operation, False)
+            span.set("error", True)
+            return False
+
+
+##########################################################################
+# Wait until the resource of an action reached its wait_for state, using
+# the shared lifecycle waiter of the region. done(ok) is called after that
+##########################################################################
+def wait_for_state(ctx, waiter, action, done):
+    started = time.time()
+    deadline = started + WaitTimeout
+    if ctx.deadline is not None:
+        deadline = min(deadline, ctx.deadline)
+
+    def finished(ok, error):
+        if ok:
+            metrics.wait(ctx.region, action.resource_type, time.time() - started)
+        else:
+            set_log_region(ctx)
+            results.add_error(error)
+            MakeLog(error, level=LogOutput.ERROR)
+        done(ok)
+
+    waiter.add(action, deadline, finished)
+
+
+##########################################################################
+# Create the executor running the actions of a region
+##########################################################################
+def create_action_executor(ctx):
+    waiter = Waiter.LifecycleWaiter(ctx, WaitInterval, WaitBackoff, WaitMaxInterval, BulkListMinimum, tracer)
+    return Executor.ActionExecutor(lambda action: execute_action(ctx, action), lambda action, done: wait_for_state(ctx, waiter, action, done),
+                                   ActionConcurrency, DefaultActionConcurrency)
+
+
+##########################################################################
+# Wait for the actions of a region to complete, within its time budget
+##########################################################################
+def wait_for_actions(ctx, executor):
+    MakeLog("Waiting for all actions to complete...")
+    started = time.time()
+    if not executor.join(ctx.time_left()):
+        results.add_error(" - Error region {} exceeded its time budget, actions still running".format(ctx.region))
+        MakeLog(" - Error region {} exceeded its time budget, actions still running".format(ctx.region), level=LogOutput.ERROR)
+    executor.shutdown()
+    metrics.phase(ctx.region, "actions", time.time() - started)
 
 
 ##########################################################################
@@ -375,32 +1036,131 @@ def identity_read_compartments(identity, tenancy):
 
 
 ##########################################################################
-# Handle Region
+# Get the active schedule for today from the schedule tags
+##########################################################################
+def get_active_schedule(schedule, DayOfWeek, Day, DayNr, CurrentDayOfMonth):
+    ActiveSchedule = ""
+
+    # Checking the right schedule based on priority
+    # from low to high:
+    #
+    # - Anyday
+    # - WeekDay or Weekend
+    # - Name of Day (Monday, Tuesday....)
+    # - Name of Day, ending with a number to indicate Nth of the month (Saturday1, Saturday2)
+    # - Day of month
+
+    if AnyDay in schedule:
+        ActiveSchedule = schedule[AnyDay]
+    if isWeekDay(DayOfWeek):  # check for weekday / weekend
+        if WeekDay in schedule:
+            ActiveSchedule = schedule[WeekDay]
+    else:
+        if Weekend in schedule:
+            ActiveSchedule = schedule[Weekend]
+
+    if Day in schedule:  # Check for day specific tag (today)
+        ActiveSchedule = schedule[Day]
+
+    if "{}{}".format(Day, DayNr) in schedule:  # Check for Nth day of the Month
+        ActiveSchedule = schedule["{}{}".format(Day, DayNr)]
+
+    if DayOfMonth in schedule:
+        schedulesize = Schedule.compile_day_of_month(schedule[DayOfMonth]).get(CurrentDayOfMonth)
+        if schedulesize is not None:
+            ActiveSchedule = ("{},".format(schedulesize)*24)[:-1]
+
+    if cmd.override:
+        if Override in schedule:
+            ResourceOverrideTag = schedule[Override]
+            if cmd.override == "All" or cmd.override == ResourceOverrideTag:
+                if cmd.action == "Up":
+                    ActiveSchedule = "1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1"
+                if cmd.action == "Down":
+                    ActiveSchedule = "0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0"
+
+    return ActiveSchedule
+
+
+##########################################################################
+# Check, using the tags from the search data, if a resource might need an
+# action in the current slot. Only these resources need their details to be
+# fetched. Invalid schedules are kept, so the error is reported on the actual tags.
+##########################################################################
+def might_need_action(resource, DayOfWeek, Day, DayNr, CurrentDayOfMonth, CurrentHour, CurrentMinute):
+    if isDeleted(resource.lifecycle_state):
+        return False
+    if getattr(resource, "refresh", False):  # Stale inventory entry
+        return True
+    try:
+        schedule = resource.defined_tags[PredefinedTag]
+    except Exception:
+        return False
+
+    try:
+        ActiveSchedule = get_active_schedule(schedule, DayOfWeek, Day, DayNr, CurrentDayOfMonth)
+        if ActiveSchedule == "":
+            return False
+        schedulehours = Schedule.compile_schedule(ActiveSchedule)
+        if len(schedulehours) in Schedule.SlotsPerDay and schedulehours[Schedule.slot_index(len(schedulehours), CurrentHour, CurrentMinute)].kind == Schedule.IGNORE:
+            return False
+    except Exception:
+        pass
+    return True
+
+
+##########################################################################
+# Discovery source that adds the time it took to the phase metrics
+##########################################################################
+def timed_source(region, phase, source):
+    started = time.time()
+    try:
+        for page in source():
+            yield page
+    finally:
+        metrics.phase(region, phase, time.time() - started)
+
+
+##########################################################################
+# Iterate and add the time waiting for the next item to wait_phase, and
+# the time spent on the item to work_phase of the metrics
 ##########################################################################
-def autoscale_region(region):
+def timed_iterator(region, iterable, wait_phase, work_phase):
+    iterator = iter(iterable)
+    while True:
+        started = time.time()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            metrics.phase(region, wait_phase, time.time() - started)
+        started = time.time()
+        yield item
+        metrics.phase(region, work_phase, time.time() - started)
 
-    # Global Paramters for update
-    global total_resources
-    global ErrorsFound
-    global errors
-    global success
 
+##########################################################################
+# Handle Region
+##########################################################################
+def autoscale_region(ctx):
+
+    region = ctx.region
     MakeLog("Starting Auto Scaling script on region {}, executing {} actions".format(region, Action))
 
-    threads = []  # Thread array for async AutonomousDB start and rescale
-    tcount = 0
+    executor = create_action_executor(ctx)
 
     ###############################################
     # Get Current Day, time
     ###############################################
-    DayOfWeek, Day, CurrentHour, CurrentDayOfMonth, DayNr = get_current_hour(region, cmd.ignore_region_time)
+    DayOfWeek, Day, CurrentHour, CurrentDayOfMonth, DayNr, CurrentMinute = get_current_hour(region, cmd.ignore_region_time)
 
     if AlternativeWeekend:
         MakeLog("Using Alternative weekend (Friday and Saturday as weekend")
     if cmd.ignore_region_time:
         MakeLog("Ignoring Region Datetime, Using local time")
 
-    MakeLog("Day of week: {}, Nth day in Month: {}, IsWeekday: {},  Current hour: {},  Current DayOfMonth: {}".format(Day, DayNr, isWeekDay(DayOfWeek), CurrentHour, CurrentDayOfMonth))
+    MakeLog("Day of week: {}, Nth day in Month: {}, IsWeekday: {},  Current hour: {},  Current minute: {},  Current DayOfMonth: {}".format(Day, DayNr, isWeekDay(DayOfWeek), CurrentHour, CurrentMinute, CurrentDayOfMonth))
 
     # Investigatin BUG: temporary disabling below logic
     # Array start with 0 so decrease CurrentHour with 1, if hour = 0 then 23
@@ -408,34 +1168,39 @@ def autoscale_region(region):
 
     ###############################################
     # Find all resources with a Schedule Tag
+    # With IncrementalDiscovery and a recent inventory of this region, use
+    # it and only search for resources created since the last full discovery
     ###############################################
-    MakeLog("Getting all resources supported by the search function...")
-    query = "query {} resources where (definedTags.namespace = '{}')".format(', '.join(supported_resources), PredefinedTag)
-    query += " && compartmentId  = '" + compartment_include + "'" if compartment_include else ""
-    query += " && compartmentId != '" + compartment_exclude + "'" if compartment_exclude else ""
-    sdetails = oci.resource_search.models.StructuredSearchDetails()
-    sdetails.query = query
-
-
-    NoError = True
+    discovery_started = time.time()
+    last_discovery = None
+    if inventory_store and IncrementalDiscovery and not compartment_include and not compartment_exclude:
+        last_discovery = inventory_store.last_discovery(region)
+
+    compartment_groups = None
+    if SearchCompartmentShards > 1:
+        compartment_groups = Discovery.compartment_shards(compartments, tenancy.id, SearchCompartmentShards)
+
+    if last_discovery:
+        created_after = datetime.datetime.utcfromtimestamp(last_discovery) - datetime.timedelta(minutes=5)
+        MakeLog("Using resource inventory of {} UTC, searching for new resources...".format(datetime.datetime.utcfromtimestamp(last_discovery).strftime("%Y-%m-%d %H:%M:%S")))
+        queries = Discovery.search_queries(supported_resources, PredefinedTag, SearchShardByType, compartment_groups, created_after=created_after)
+        discovery_sources = [("inventory", lambda: inventory_store.load(region, SearchPageSize))]
+    else:
+        MakeLog("Getting all resources supported by the search function...")
+        queries = Discovery.search_queries(supported_resources, PredefinedTag, SearchShardByType, compartment_groups, compartment_include, compartment_exclude)
+        discovery_sources = []
+    MakeLog("Searching with {} queries, {} in parallel".format(len(queries), SearchConcurrency))
 
-    try:
-        result = oci.pagination.list_call_get_all_results(search.search_resources,
-                                                          sdetails,
-                                                          **{
-                                                              "limit": 10
-                                                          }).data
-    except oci.exceptions.ServiceError as response:
-        print ("Error: {} - {}".format(response.code, response.message))
-        result = oci.resource_search.models.ResourceSummaryCollection()
-        result.items = []
+    discovery_sources += [(name, (lambda query=query: Discovery.search_pages(ctx, query, SearchPageSize))) for name, query in queries]
 
     #################################################################
     # Find additional resources not found by search (MySQL Service)
+    # When using the inventory, MySQL instances come from the inventory
     #################################################################
-    if not cmd.ignoremysql:
+    mysql_stats = {}
+    if not cmd.ignoremysql and not last_discovery:
 
-        MakeLog("Finding MySQL instances in {} Compartments...".format(len(compartments)))
+        mysql_compartments = []
         for c in compartments:
 
             # check compartment include and exclude
@@ -447,1208 +1212,513 @@ def autoscale_region(region):
             if compartment_exclude:
                 if c.id == compartment_exclude:
                     continue
+            mysql_compartments.append(c)
 
-            mysql_instances = []
-            try:
-                mysql_instances = oci.pagination.list_call_get_all_results(
-                    mysql.list_db_systems,
-                    compartment_id=c.id,
-                    retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY
-                ).data
-            except Exception:
-                MakeLog("e", True)
-                mysql_instances = []
-                continue
-
-            MakeLog(".", True)
-
-            for mysql_instance in mysql_instances:
-                if PredefinedTag not in mysql_instance.defined_tags:
-                    continue
-
-                summary = oci.resource_search.models.ResourceSummary()
-                summary.availability_domain = mysql_instance.availability_domain
-                summary.compartment_id = mysql_instance.compartment_id
-                summary.defined_tags = mysql_instance.defined_tags
-                summary.freeform_tags = mysql_instance.freeform_tags
-                summary.identifier = mysql_instance.id
-                summary.lifecycle_state = mysql_instance.lifecycle_state
-                summary.display_name = mysql_instance.display_name
-                summary.resource_type = "MysqlDBInstance"
-
-                try:
-                   result.items.append(summary)
-                except AttributeError:
-                   result.append(summary)
-                
-
-        MakeLog("")
+        MakeLog("Finding MySQL instances in {} Compartments...".format(len(mysql_compartments)))
+        discovery_sources.append(("mysql", lambda: Discovery.mysql_pages(ctx, mysql_compartments, PredefinedTag, mysql_cache, MySQLConcurrency, mysql_stats)))
 
     #################################################################
-    # All the items with a schedule are now collected.
+    # The resources are streamed from the discovery, page by page.
     # Let's go thru them and find / validate the correct schedule
+    # while the next pages are still being fetched.
+    #
+    # First evaluate the schedule using the tags of the search data
+    # or the inventory. Only resources that might need an action this
+    # hour are fetched, their actual tags are evaluated again below.
     #################################################################
+    discovery_sources = [(name, (lambda name=name, source=source: timed_source(region, name.split(" ")[0], source))) for name, source in discovery_sources]
+    discovery = Discovery.DiscoveryStream(discovery_sources, DiscoveryQueuePages, SearchConcurrency + 1, ctx.time_left)
+    inventory = ResourceDetails.BulkInventory(ctx, BulkListMinimum)
+    counts = {"resources": 0, "candidates": 0}
 
-    total_resources += len(result)
+    def discovered_candidates():
+        global total_resources
+        set_log_region(ctx)  # Runs in the thread of the prefetcher
+        for page in discovery:
+            page_candidates = [resource for resource in page if might_need_action(resource, DayOfWeek, Day, DayNr, CurrentDayOfMonth, CurrentHour, CurrentMinute)]
+            counts["resources"] += len(page)
+            counts["candidates"] += len(page_candidates)
+            metrics.increment("autoscale_resources_total", {"region": region}, len(page))
+            with region_lock:
+                total_resources += len(page)
+            if inventory_store:
+                inventory_store.store_found(region, [resource for resource in page if not isinstance(resource, Inventory.InventoryResource)])
+            inventory.register(page_candidates)
+            for resource in page_candidates:
+                yield resource
+        if discovery.expired:
+            results.add_error(" - Error region {} exceeded its time budget, searching for resources stopped".format(region))
+            MakeLog(" - Error region {} exceeded its time budget, searching for resources stopped".format(region), level=LogOutput.ERROR)
 
     MakeLog("")
-    MakeLog("Checking {} Resources for Auto Scale...".format(total_resources))
+    MakeLog("Checking Resources for Auto Scale...")
+
+    prefetcher = ResourceDetails.DetailPrefetcher(ctx, ServiceConcurrency, DefaultServiceConcurrency, inventory, tracer)
+    for resource, resourceDetails, resourceOk, resource_span in timed_iterator(region, prefetcher.stream(discovered_candidates()), "details", "evaluate"):
+        if ctx.expired():
+            results.add_error(" - Error region {} exceeded its time budget, remaining resources not checked".format(region))
+            MakeLog(" - Error region {} exceeded its time budget, remaining resources not checked".format(region), level=LogOutput.ERROR)
+            break
+
+        if inventory_store and resourceOk:
+            if isDeleted(resourceDetails.lifecycle_state):
+                inventory_store.remove(resource.identifier)
+            else:
+                inventory_store.store_details(region, resource, resourceDetails)
 
-    for resource in result:
-        # The search data is not always updated. Get the tags from the actual resource itself, not using the search data.
-        resourceOk = False
+        # The search data is not always updated. The prefetcher gets the tags from the actual resource itself, not using the search data.
         if cmd.print_ocid:
-            MakeLog("Checking {} ({}) - {}, CurrentState: {}...".format(resource.display_name, resource.resource_type, resource.identifier, resource.lifecycle_state))
+            MakeLog("Checking {} ({}) - {}, CurrentState: {}...".format(resource.display_name, resource.resource_type, resource.identifier, resource.lifecycle_state), level=LogOutput.DEBUG)
         else:
-            MakeLog("Checking {} ({}) CurentState: {}...".format(resource.display_name, resource.resource_type, resource.lifecycle_state))
+            MakeLog("Checking {} ({}) CurentState: {}...".format(resource.display_name, resource.resource_type, resource.lifecycle_state), level=LogOutput.DEBUG)
 
-        try:
-            if resource.resource_type == "Instance":
-                resourceDetails = compute.get_instance(instance_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "DbSystem":
-                resourceDetails = database.get_db_system(db_system_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "VmCluster":
-                resourceDetails = database.get_vm_cluster(vm_cluster_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "AutonomousDatabase":
-                resourceDetails = database.get_autonomous_database(autonomous_database_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "InstancePool":
-                resourceDetails = pool.get_instance_pool(instance_pool_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "OdaInstance":
-                resourceDetails = oda.get_oda_instance(oda_instance_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "AnalyticsInstance":
-                resourceDetails = analytics.get_analytics_instance(analytics_instance_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "IntegrationInstance":
-                resourceDetails = integration.get_integration_instance(integration_instance_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "LoadBalancer":
-                resourceDetails = loadbalancer.get_load_balancer(load_balancer_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "MysqlDBInstance":
-                resourceDetails = mysql.get_db_system(db_system_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "GoldenGateDeployment":
-                resourceDetails = goldengate.get_deployment(deployment_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "DISWorkspace":
-                resourceDetails = dataintegration.get_workspace(workspace_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "VisualBuilderInstance":
-                resourceDetails = visualbuilder.get_vb_instance(vb_instance_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-            if resource.resource_type == "CloudVmCluster":
-                resourceDetails = database.get_cloud_vm_cluster(cloud_vm_cluster_id=resource.identifier, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data
-                resourceOk = True
-
-        except:
+        if not resourceOk:
             MakeLog("Skipping resource, information can not be found")
-            resourceOk = False
 
         if not isDeleted(resource.lifecycle_state) and resourceOk:
             try:
                 schedule = resourceDetails.defined_tags[PredefinedTag]
             except:
-                MakeLog("Error getting schedule tag from this resource")
+                MakeLog("Error getting schedule tag from this resource", level=LogOutput.ERROR)
                 schedule = ""
 
-            ActiveSchedule = ""
-
-            # Checking the right schedule based on priority
-            # from low to high:
-            #
-            # - Anyday
-            # - WeekDay or Weekend
-            # - Name of Day (Monday, Tuesday....)
-            # - Name of Day, ending with a number to indicate Nth of the month (Saturday1, Saturday2)
-            # - Day of month
-
-            if AnyDay in schedule:
-                ActiveSchedule = schedule[AnyDay]
-            if isWeekDay(DayOfWeek):  # check for weekday / weekend
-                if WeekDay in schedule:
-                    ActiveSchedule = schedule[WeekDay]
-            else:
-                if Weekend in schedule:
-                    ActiveSchedule = schedule[Weekend]
-
-            if Day in schedule:  # Check for day specific tag (today)
-                ActiveSchedule = schedule[Day]
-
-            if "{}{}".format(Day, DayNr) in schedule:  # Check for Nth day of the Month
-                ActiveSchedule = schedule["{}{}".format(Day, DayNr)]
-
-            if DayOfMonth in schedule:
-                specificDays = schedule[DayOfMonth].split(",")
-                for specificDay in specificDays:
-                    day, schedulesize = specificDay.split(":")
-                    if int(day) == CurrentDayOfMonth:
-                        ActiveSchedule = ("{},".format(schedulesize)*24)[:-1]
-
-            if cmd.override:
-                if Override in schedule:
-                    ResourceOverrideTag = schedule[Override]
-                    if cmd.override == "All" or cmd.override == ResourceOverrideTag:
-                        if cmd.action == "Up":
-                            ActiveSchedule = "1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1"
-                        if cmd.action == "Down":
-                            ActiveSchedule = "0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0"
-            
+            ActiveSchedule = get_active_schedule(schedule, DayOfWeek, Day, DayNr, CurrentDayOfMonth)
+
             #################################################################
-            # Check if the active schedule contains exactly 24 numbers for each hour of the day
+            # Check if the active schedule contains exactly 24, 48 or 96 numbers, for each hour,
+            # half hour or quarter of an hour of the day
             #################################################################
             if ActiveSchedule != "":
                 try:
-                    schedulehours = ActiveSchedule.split("#")[0].split(",")
-                    if len(schedulehours) != 24:
-                        ErrorsFound = True
-                        errors.append(" - Error with schedule of {} - {}, not correct amount of hours, I count {}".format(resource.display_name, ActiveSchedule, len(schedulehours)))
-                        MakeLog(" - Error with schedule of {} - {}, not correct amount of hours, i count {}".format(resource.display_name, ActiveSchedule, len(schedulehours)))
+                    schedulehours = Schedule.compile_schedule(ActiveSchedule)
+                    if len(schedulehours) not in Schedule.SlotsPerDay:
+                        results.add_error(" - Error with schedule of {} - {}, not correct amount of hours, I count {}".format(resource.display_name, ActiveSchedule, len(schedulehours)))
+                        MakeLog(" - Error with schedule of {} - {}, not correct amount of hours, i count {}".format(resource.display_name, ActiveSchedule, len(schedulehours)), level=LogOutput.ERROR)
                         ActiveSchedule = ""
+                    else:
+                        CurrentSlotIndex = Schedule.slot_index(len(schedulehours), CurrentHour, CurrentMinute)
+                        if schedulehours[CurrentSlotIndex].kind == Schedule.INVALID or (schedulehours[CurrentSlotIndex].kind == Schedule.FLEX and resource.resource_type != "Instance"):
+                            results.add_error(" - Error with schedule of {} - {}, invalid value {} for this hour".format(resource.display_name, ActiveSchedule, schedulehours[CurrentSlotIndex].text))
+                            MakeLog(" - Error with schedule of {} - {}, invalid value {} for this hour".format(resource.display_name, ActiveSchedule, schedulehours[CurrentSlotIndex].text), level=LogOutput.ERROR)
+                            ActiveSchedule = ""
                 except Exception:
-                    ErrorsFound = True
                     ActiveSchedule = ""
-                    errors.append(" - Error with schedule for {}".format(resource.display_name))
-                    MakeLog(" - Error with schedule of {}".format(resource.display_name))
-                    MakeLog(sys.exc_info()[0])
+                    results.add_error(" - Error with schedule for {}".format(resource.display_name))
+                    MakeLog(" - Error with schedule of {}".format(resource.display_name), level=LogOutput.ERROR)
+                    MakeLog(sys.exc_info()[0], level=LogOutput.ERROR)
             else:
-                MakeLog(" - Ignoring instance, as no active schedule for today found")
+                MakeLog(" - Ignoring instance, as no active schedule for today found", level=LogOutput.DEBUG)
 
             ###################################################################################
             # if schedule validated, let see if we can apply the new schedule to the resource
             ###################################################################################
 
             if ActiveSchedule != "":
-                DisplaySchedule = ""
-                c = 0
-                for h in schedulehours:
-                    if c == CurrentHour:
-                        DisplaySchedule = DisplaySchedule + "[" + h + "],"
-                    else:
-                        DisplaySchedule = DisplaySchedule + h + ","
-                    c = c + 1
+                CurrentSlot = schedulehours[CurrentSlotIndex]
+                resource_span.set("schedule.slot", CurrentSlot.text)
+                resource_span.set("schedule.slot_index", CurrentSlotIndex)
+                if log_enabled(LogOutput.DEBUG):
+                    DisplaySchedule = ""
+                    c = 0
+                    for h in schedulehours:
+                        if c == CurrentSlotIndex:
+                            DisplaySchedule = DisplaySchedule + "[" + h.text + "],"
+                        else:
+                            DisplaySchedule = DisplaySchedule + h.text + ","
+                        c = c + 1
 
-                MakeLog(" - Active schedule for {}: {}".format(resource.display_name, DisplaySchedule))
+                    MakeLog(" - Active schedule for {}: {}".format(resource.display_name, DisplaySchedule), level=LogOutput.DEBUG)
 
-                if "*" in schedulehours[CurrentHour]:
-                    MakeLog(" - Ignoring this service for this hour")
+                if CurrentSlot.kind == Schedule.IGNORE:
+                    MakeLog(" - Ignoring this service for this hour", level=LogOutput.DEBUG)
 
                 else:
-                    ###################################################################################
-                    # Instance
-                    ###################################################################################
-                    if resource.resource_type == "Instance":
-                        # Check if value is (CPU:Memory) value for flex shapes
-                        if schedulehours[CurrentHour][0] == "(" and schedulehours[CurrentHour][-1:] == ")":
-                            if "flex" in resourceDetails.shape.lower():
-                                cpu, memory = schedulehours[CurrentHour][1:-1].split(":")
-                                if float(cpu) != resourceDetails.shape_config.ocpus or float(memory) != resourceDetails.shape_config.memory_in_gbs:
-                                    MakeLog("Changing VM size")
-                                    changedetails = oci.core.models.UpdateInstanceDetails()
-                                    configdetails = oci.core.models.UpdateInstanceShapeConfigDetails()
-                                    configdetails.ocpus = float(cpu)
-                                    configdetails.memory_in_gbs = float(memory)
-                                    changedetails.shape_config = configdetails
-                                    try:
-                                        response = compute.update_instance(instance_id=resource.identifier, update_instance_details=changedetails, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-                                        MakeLog("Modifying flex shape. CPU count: {} - Memory {}".format(cpu, memory))
-                                    except oci.exceptions.ServiceError as response:
-                                        MakeLog("Can not modify shape: {}".format(response.message))
-                                else:
-                                    MakeLog("Ignoring schedule as VM is already in the desired state")
-                                # except:
-                                #     MakeLog("Incorrect schedule: {}".format(schedulehours[CurrentHour]))
-
+                    # The calls made while planning are children of the resource span
+                    with resource_span:
+                        for action in plan_resource(ctx, resource, resourceDetails, CurrentSlot):
+                            if planning:
+                                MakeLog(" - Planned: {}".format(action.log.lstrip(" -")))
+                                with region_lock:
+                                    planned_actions.append(action)
                             else:
-                                MakeLog("Can not apply this modification {}, as shape is not a flex shape".format(schedulehours[CurrentHour]))
+                                action.span = resource_span
+                                executor.submit(action)
 
-                        else:
-                            if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                                # Only perform action if VM Instance, ignoring any BM instances.
-                                if resourceDetails.shape[:2] == "VM":
-                                    if resourceDetails.lifecycle_state == "RUNNING" and int(schedulehours[CurrentHour]) == 0:
-                                        if Action == "All" or Action == "Down":
-                                            MakeLog(" - Initiate Compute VM shutdown for {}".format(resource.display_name))
-                                            Retry = True
-                                            while Retry:
-                                                try:
-                                                    response = compute.instance_action(instance_id=resource.identifier, action=ComputeShutdownMethod)
-                                                    Retry = False
-                                                    success.append(" - Initiate Compute VM shutdown for {}".format(resource.display_name))
-                                                except oci.exceptions.ServiceError as response:
-                                                    if response.status == 429:
-                                                        MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                        time.sleep(RateLimitDelay)
-                                                    else:
-                                                        ErrorsFound = True
-                                                        errors.append(" - Error ({}) Compute VM Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                        MakeLog(" - Error ({}) Compute VM Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                        Retry = False
-
-                                    if resourceDetails.lifecycle_state == "STOPPED" and int(schedulehours[CurrentHour]) == 1:
-                                        if Action == "All" or Action == "Up":
-                                            MakeLog(" - Initiate Compute VM startup for {}".format(resource.display_name))
-                                            Retry = True
-                                            while Retry:
-                                                try:
-                                                    response = compute.instance_action(instance_id=resource.identifier, action="START")
-                                                    Retry = False
-                                                    success.append(" - Initiate Compute VM startup for {}".format(resource.display_name))
-                                                except oci.exceptions.ServiceError as response:
-                                                    if response.status == 429:
-                                                        MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                        time.sleep(RateLimitDelay)
-                                                    else:
-                                                        ErrorsFound = True
-                                                        errors.append(" - Error ({}) Compute VM startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                        Retry = False
-
-
-                    ###################################################################################
-                    # DBSystem
-                    ###################################################################################
-                    if resource.resource_type == "DbSystem":
-                        # Execute On/Off operations for Database VMs
-                        if resourceDetails.shape[:2] == "VM":
-                            dbnodes = database.list_db_nodes(compartment_id=resource.compartment_id, db_system_id=resource.identifier).data
-                            for dbnodedetails in dbnodes:
-                                if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                                    if dbnodedetails.lifecycle_state == "AVAILABLE" and int(schedulehours[CurrentHour]) == 0:
-                                        if Action == "All" or Action == "Down":
-                                            MakeLog(" - Initiate DB VM shutdown for {}".format(resource.display_name))
-                                            Retry = True
-                                            while Retry:
-                                                try:
-                                                    response = database.db_node_action(db_node_id=dbnodedetails.id, action="STOP")
-                                                    Retry = False
-                                                    success.append(" - Initiate DB VM shutdown for {}".format(resource.display_name))
-                                                except oci.exceptions.ServiceError as response:
-                                                    if response.status == 429:
-                                                        MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                        time.sleep(RateLimitDelay)
-                                                    else:
-                                                        ErrorsFound = True
-                                                        errors.append(" - Error ({}) DB VM shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                        Retry = False
-                                    if dbnodedetails.lifecycle_state == "STOPPED" and int(schedulehours[CurrentHour]) == 1:
-                                        if Action == "All" or Action == "Up":
-                                            MakeLog(" - Initiate DB VM startup for {}".format(resource.display_name))
-                                            Retry = True
-                                            while Retry:
-                                                try:
-                                                    response = database.db_node_action(db_node_id=dbnodedetails.id, action="START")
-                                                    Retry = False
-                                                    success.append(" - Initiate DB VM startup for {}".format(resource.display_name))
-                                                except oci.exceptions.ServiceError as response:
-                                                    if response.status == 429:
-                                                        MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                        time.sleep(RateLimitDelay)
-                                                    else:
-                                                        ErrorsFound = True
-                                                        errors.append(" - Error ({}) DB VM startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                        Retry = False
-
-                        ###################################################################################
-                        # BM
-                        ###################################################################################
-                        if resourceDetails.shape[:2] == "BM":
-                            if int(schedulehours[CurrentHour]) > 1 and int(schedulehours[CurrentHour]) < 53:
-                                if resourceDetails.cpu_core_count > int(schedulehours[CurrentHour]):
-                                    if Action == "All" or Action == "Down":
-                                        MakeLog(" - Initiate DB BM Scale Down to {} for {}".format(int(schedulehours[CurrentHour]), resource.display_name))
-                                        dbupdate = oci.database.models.UpdateDbSystemDetails()
-                                        dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_db_system(db_system_id=resource.identifier, update_db_system_details=dbupdate)
-                                                Retry = False
-                                                success.append(
-                                                    " - Initiate DB BM Scale Down from {}to {} for {}".format(resourceDetails.cpu_core_count, (schedulehours[CurrentHour]),
-                                                                                                              resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) DB BM Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count,
-                                                                                                                                    int(schedulehours[CurrentHour]),
-                                                                                                                                    resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) DB BM Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count,
-                                                                                                                              int(schedulehours[CurrentHour]),
-                                                                                                                              resource.display_name, response.message))
-                                                    Retry = False
-
-                                if resourceDetails.cpu_core_count < int(schedulehours[CurrentHour]):
-                                    if Action == "All" or Action == "Up":
-                                        MakeLog(" - Initiate DB BM Scale UP to {} for {}".format(int(schedulehours[CurrentHour]), resource.display_name))
-                                        dbupdate = oci.database.models.UpdateDbSystemDetails()
-                                        dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_db_system(db_system_id=resource.identifier, update_db_system_details=dbupdate)
-                                                Retry = False
-                                                success.append(
-                                                    " - Initiate DB BM Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]),
-                                                                                                             resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) DB BM Scale UP from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) DB BM Scale UP from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    Retry = False
-
-                        ###################################################################################
-                        # Exadata (Old exadata shape)
-                        ###################################################################################
-                        if resourceDetails.shape[:7] == "Exadata":
-                            if resourceDetails.cpu_core_count > int(schedulehours[CurrentHour]):
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate Exadata CS Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]),
-                                                                                                            resource.display_name))
-                                    dbupdate = oci.database.models.UpdateDbSystemDetails()
-                                    dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = database.update_db_system(db_system_id=resource.identifier, update_db_system_details=dbupdate)
-                                            Retry = False
-                                            success.append(" - Initiate Exadata DB Scale Down to {} at {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Exadata DB Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Exadata DB Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.cpu_core_count < int(schedulehours[CurrentHour]):
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate Exadata CS Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                    dbupdate = oci.database.models.UpdateDbSystemDetails()
-                                    dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = database.update_db_system(db_system_id=resource.identifier, update_db_system_details=dbupdate)
-                                            Retry = False
-                                            success.append(" - Initiate Exadata DB BM Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Exadata DB Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Exadata DB Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                Retry = False
-
-                    ###################################################################################
-                    # Exadata - VM Cluster
-                    ###################################################################################
-                    if resource.resource_type == "CloudVmCluster":
-                        if resourceDetails.cpu_core_count > int(schedulehours[CurrentHour]):
-                            if Action == "All" or Action == "Down":
-                                MakeLog(" - Initiate Exadata VM Cluster Scale Down from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                dbupdate = oci.database.models.UpdateCloudVmClusterDetails()
-                                dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = database.update_cloud_vm_cluster(cloud_vm_cluster_id=resource.identifier,update_cloud_vm_cluster_details=dbupdate)
-                                        Retry = False
-                                        success.append(" - Initiate Exadata VM Cluster Scale Down to {} at {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Exadata VM Cluster Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                            MakeLog(" - Error ({}) Exadata VM Cluster Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                            Retry = False
-
-                        if resourceDetails.cpu_core_count < int(schedulehours[CurrentHour]):
-                            if Action == "All" or Action == "Up":
-                                MakeLog(" - Initiate Exadata VM Cluster Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                dbupdate = oci.database.models.UpdateCloudVmClusterDetails()
-                                dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = database.update_cloud_vm_cluster(cloud_vm_cluster_id=resource.identifier,update_cloud_vm_cluster_details=dbupdate)
-                                        Retry = False
-                                        success.append(" - Initiate Exadata VM Cluster Scale UP from {} to {} for {}".format(resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Exadata VM Cluster Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                            MakeLog(" - Error ({}) Exadata VM Cluster Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpu_core_count, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                            Retry = False
-
-                    ###################################################################################
-                    # VmCluster
-                    ###################################################################################
-                    if resource.resource_type == "VmCluster":
-                        if int(schedulehours[CurrentHour]) >= 0 and int(schedulehours[CurrentHour]) < 401:
-                            # Cluster VM is running, request is amount of CPU core change is needed
-                            if resourceDetails.lifecycle_state == "AVAILABLE" and int(schedulehours[CurrentHour]) > 0:
-                                if resourceDetails.cpus_enabled > int(schedulehours[CurrentHour]):
-                                    if Action == "All" or Action == "Down":
-                                        MakeLog(" - Initiate ExadataC@C VM Cluster Scale Down to {} for {}".format(int(schedulehours[CurrentHour]), resource.display_name))
-                                        dbupdate = oci.database.models.UpdateVmClusterDetails()
-                                        dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_vm_cluster(vm_cluster_id=resource.identifier, update_vm_cluster_details=dbupdate)
-                                                Retry = False
-                                                success.append(" - Initiate ExadataC&C Cluster VM Scale Down from {} to {} for {}".format(resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) ExadataC&C Cluster VM Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) ExadataC&C Cluster VM Scale Down from {} to {} for {} - {}".format(response.status, resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    Retry = False
-
-                                if resourceDetails.cpus_enabled < int(schedulehours[CurrentHour]):
-                                    if Action == "All" or Action == "Up":
-                                        MakeLog(
-                                            " - Initiate ExadataC@C VM Cluster Scale Up from {} to {} for {}".format(resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name))
-                                        dbupdate = oci.database.models.UpdateVmClusterDetails()
-                                        dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_vm_cluster(vm_cluster_id=resource.identifier, update_vm_cluster_details=dbupdate)
-                                                Retry = False
-                                                success.append(" - Initiate ExadataC&C Cluster VM Scale Up to {} for {}".format(int(schedulehours[CurrentHour]), resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) ExadataC&C Cluster VM Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) ExadataC&C Cluster VM Scale Up from {} to {} for {} - {}".format(response.status, resourceDetails.cpus_enabled, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    Retry = False
-
-                    ###################################################################################
-                    # AutonomousDatabase
-                    ###################################################################################
-                    # Execute CPU Scale Up/Down operations for Database BMs
-                    if resource.resource_type == "AutonomousDatabase":
-                        if int(schedulehours[CurrentHour]) >= 0 and int(schedulehours[CurrentHour]) < 129:
-                            # Autonomous DB is running request is amount of CPU core change is needed
-                            if resourceDetails.lifecycle_state == "AVAILABLE" and int(schedulehours[CurrentHour]) > 0:
-                                if (resourceDetails.cpu_core_count > int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "OCPU") or (resourceDetails.compute_count > int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "ECPU"):
-                                    if Action == "All" or Action == "Down":
-                                        dbupdate = oci.database.models.UpdateAutonomousDatabaseDetails()
-                                        scalefrom = 0
-                                        if resourceDetails.compute_model == "ECPU":
-                                            scalefrom = int(resourceDetails.compute_count)
-                                            dbupdate.compute_count = int(schedulehours[CurrentHour])
-                                        if resourceDetails.compute_model == "OCPU":
-                                            scalefrom = int(resourceDetails.cpu_core_count)
-                                            dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        MakeLog(" - Initiate Autonomous DB Scale Down from {} to {} for {}".format(scalefrom, int(schedulehours[CurrentHour]), resource.display_name))
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_autonomous_database(autonomous_database_id=resource.identifier, update_autonomous_database_details=dbupdate)
-                                                Retry = False
-                                                success.append(" - Initiate Autonomous DB Scale Down from {} to {} for {}".format(scalefrom, int(schedulehours[CurrentHour]), resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) Autonomous DB Scale Down from {} to {} for {} - {}".format(response.status, scalefrom, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) Autonomous DB Scale Down from {} to {} for {} - {}".format(response.status, scalefrom, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    Retry = False
-
-                                if (resourceDetails.cpu_core_count < int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "OCPU") or (resourceDetails.compute_count < int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "ECPU"):
-                                    if Action == "All" or Action == "Up":
-                                        dbupdate = oci.database.models.UpdateAutonomousDatabaseDetails()
-                                        scalefrom = 0
-                                        if resourceDetails.compute_model == "ECPU":
-                                            scalefrom = int(resourceDetails.compute_count)
-                                            dbupdate.compute_count = int(schedulehours[CurrentHour])
-                                        if resourceDetails.compute_model == "OCPU":
-                                            scalefrom = int(resourceDetails.cpu_core_count)
-                                            dbupdate.cpu_core_count = int(schedulehours[CurrentHour])
-                                        MakeLog(" - Initiate Autonomous DB Scale Up from {} to {} for {}".format(scalefrom, int(schedulehours[CurrentHour]), resource.display_name))
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.update_autonomous_database(autonomous_database_id=resource.identifier, update_autonomous_database_details=dbupdate)
-                                                Retry = False
-                                                success.append(" - Initiate Autonomous DB Scale Up from {} to {} for {}".format(scalefrom ,int(schedulehours[CurrentHour]), resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) Autonomous DB Scale Up from {} to {} for {} - {}".format(response.status, scalefrom, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) Autonomous DB Scale Up from {} to {} for {} - {}".format(response.status, scalefrom, int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                    Retry = False
-
-                            # Autonomous DB is running request is to stop the database
-                            if resourceDetails.lifecycle_state == "AVAILABLE" and int(schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Stoping Autonomous DB {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = database.stop_autonomous_database(autonomous_database_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Autonomous DB Shutdown for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Autonomous DB Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Autonomous DB Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "STOPPED" and int(schedulehours[CurrentHour]) > 0:
-                                if Action == "All" or Action == "Up":
-                                    # Autonomous DB is stopped and needs to be started with same amount of CPUs configured
-                                    if (resourceDetails.cpu_core_count == int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "OCPU") or ((resourceDetails.compute_count == int(schedulehours[CurrentHour]) and resourceDetails.compute_model == "ECPU") ):
-                                        MakeLog(" - Starting Autonomous DB {}".format(resource.display_name))
-                                        Retry = True
-                                        while Retry:
-                                            try:
-                                                response = database.start_autonomous_database(autonomous_database_id=resource.identifier)
-                                                Retry = False
-                                                success.append(" - Initiate Autonomous DB Startup for {}".format(resource.display_name))
-                                            except oci.exceptions.ServiceError as response:
-                                                if response.status == 429:
-                                                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                    time.sleep(RateLimitDelay)
-                                                else:
-                                                    ErrorsFound = True
-                                                    errors.append(" - Error ({}) Autonomous DB Startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                    MakeLog(" - Error ({}) Autonomous DB Startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                    Retry = False
-
-                                    # Autonomous DB is stopped and needs to be started, after that it requires CPU change
-                                    scaleto = 0
-                                    if resourceDetails.compute_model == "ECPU":
-                                        scaleto = int(resourceDetails.compute_count)
-                                    if resourceDetails.compute_model == "OCPU":
-                                        scaleto = int(resourceDetails.cpu_core_count)
-                                    if scaleto != int(schedulehours[CurrentHour]):
-                                        tcount = tcount + 1
-                                        thread = AutonomousThread(tcount, resource.identifier, resource.display_name, int(schedulehours[CurrentHour]))
-                                        thread.start()
-                                        threads.append(thread)
-
-                    ###################################################################################
-                    # InstancePool
-                    ###################################################################################
-                    if resource.resource_type == "InstancePool":
-                        # Stop Resource pool action
-                        if resourceDetails.lifecycle_state == "RUNNING" and int(schedulehours[CurrentHour]) == 0:
-                            if Action == "All" or Action == "Down":
-                                success.append(" - Stopping instance pool {}".format(resource.display_name))
-                                MakeLog(" - Stopping instance pool {}".format(resource.display_name))
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = pool.stop_instance_pool(instance_pool_id=resource.identifier)
-                                        Retry = False
-                                        success.append(" - Stopping instance pool {}".format(resource.display_name))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Stopping instance pool for {} - {}".format(response.status, resource.display_name, response.message))
-                                            MakeLog(" - Error ({}) Stopping instance pool for {} - {}".format(response.status, resource.display_name, response.message))
-                                            Retry = False
-
-                        # Scale up action on running instance pool
-                        elif resourceDetails.lifecycle_state == "RUNNING" and int(schedulehours[CurrentHour]) > resourceDetails.size:
-                            if Action == "All" or Action == "Up":
-                                MakeLog(" - Scaling up instance pool {} to {} instances".format(resource.display_name, int(schedulehours[CurrentHour])))
-                                pooldetails = oci.core.models.UpdateInstancePoolDetails()
-                                pooldetails.size = int(schedulehours[CurrentHour])
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = pool.update_instance_pool(instance_pool_id=resource.identifier, update_instance_pool_details=pooldetails)
-                                        Retry = False
-                                        success.append(" - Scaling up instance pool {} to {} instances".format(resource.display_name, int(schedulehours[CurrentHour])))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Scaling up instance pool {} to {} instances - {}".format(response.status, resource.display_name, int(schedulehours[CurrentHour]), response.message))
-                                            Retry = False
-
-                        # Scale down action on running instance pool
-                        elif resourceDetails.lifecycle_state == "RUNNING" and int(schedulehours[CurrentHour]) < resourceDetails.size:
-                            if Action == "All" or Action == "Down":
-                                MakeLog(" - Scaling down instance pool {} to {} instances".format(resource.display_name, int(schedulehours[CurrentHour])))
-                                pooldetails = oci.core.models.UpdateInstancePoolDetails()
-                                pooldetails.size = int(schedulehours[CurrentHour])
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = pool.update_instance_pool(instance_pool_id=resource.identifier, update_instance_pool_details=pooldetails)
-                                        Retry = False
-                                        success.append(" - Scaling down instance pool {} to {} instances".format(resource.display_name, int(schedulehours[CurrentHour])))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Scaling down instance pool {} to {} instances - {}".format(response.status, resource.display_name, int(schedulehours[CurrentHour]), response.message))
-                                            Retry = False
-
-                        elif resourceDetails.lifecycle_state == "STOPPED" and int(schedulehours[CurrentHour]) > 0:
-                            if Action == "All" or Action == "Up":
-                                # Start instance pool with same amount of instances as configured
-                                if resourceDetails.size == int(schedulehours[CurrentHour]):
-                                    success.append(" - Starting instance pool {} from stopped state".format(resource.display_name))
-                                    MakeLog(" - Starting instance pool {} from stopped state".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = pool.start_instance_pool(instance_pool_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Starting instance pool {} from stopped state".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Starting instance pool {} from stopped state - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                                # Start instance pool and after that resize the instance pool to desired state:
-                                if resourceDetails.size != int(schedulehours[CurrentHour]):
-                                    tcount = tcount + 1
-                                    thread = PoolThread(tcount, resource.identifier, resource.display_name, int(schedulehours[CurrentHour]))
-                                    thread.start()
-                                    threads.append(thread)
-
-                    ###################################################################################
-                    # OdaInstance
-                    ###################################################################################
-                    if resource.resource_type == "OdaInstance":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate ODA shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = oda.stop_oda_instance(oda_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate ODA shutdown for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) ODA Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) ODA Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "INACTIVE" and int(schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate ODA startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = oda.start_oda_instance(oda_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate ODA startup for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) ODA startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) ODA startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                    ###################################################################################
-                    # AnalyticsInstance
-                    ###################################################################################
-                    if resource.resource_type == "AnalyticsInstance":
-                        # Execute Shutdown operations
-                        if int(schedulehours[CurrentHour]) == 0 and resourceDetails.lifecycle_state == "ACTIVE":
-                            if Action == "All" or Action == "Down":
-                                MakeLog(" - Initiate Analytics shutdown for {}".format(resource.display_name))
-                                Retry = True
-                                while Retry:
-                                    try:
-                                        response = analytics.stop_analytics_instance(analytics_instance_id=resource.identifier)
-                                        Retry = False
-                                        success.append(" - Initiate ODA shutdown for {}".format(resource.display_name))
-                                    except oci.exceptions.ServiceError as response:
-                                        if response.status == 429:
-                                            MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                            time.sleep(RateLimitDelay)
-                                        else:
-                                            ErrorsFound = True
-                                            errors.append(" - Error ({}) Analytics Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                            MakeLog(" - Error ({}) Analytics Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                            Retry = False
-
-                        # Execute Startup operations
-                        if int(schedulehours[CurrentHour]) != 0 and resourceDetails.lifecycle_state == "INACTIVE":
-                            if Action == "All" or Action == "Up":
-                                if int(resourceDetails.capacity.capacity_value) == int(schedulehours[CurrentHour]):
-                                    MakeLog(" - Initiate Analytics Startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = analytics.start_analytics_instance(analytics_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Analytics Startup for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Analytics Startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Analytics Startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                                # Execute Startup and scaling operations
-                                else:
-                                    tcount = tcount + 1
-                                    thread = AnalyticsThread(tcount, resource.identifier, resource.display_name, int(schedulehours[CurrentHour]))
-                                    thread.start()
-                                    threads.append(thread)
-
-                        # Execute scaling operations on running instance
-                        if resourceDetails.lifecycle_state == "ACTIVE" and int(schedulehours[CurrentHour]) != int(resourceDetails.capacity.capacity_value):
-                            if int(resourceDetails.capacity.capacity_value) == 1 or int(resourceDetails.capacity.capacity_value) > 12:
-                                ErrorsFound = True
-                                errors.append(
-                                    " - Error (Analytics instance with CPU count {} can not be scaled for instance: {}".format(int(resourceDetails.capacity.capacity_value),
-                                                                                                                               resource.display_name))
-                                MakeLog(
-                                    " - Error (Analytics instance with CPU count {} can not be scaled for instance: {}".format(int(resourceDetails.capacity.capacity_value),
-                                                                                                                               resource.display_name))
-                            goscale = False
-                            if (int(schedulehours[CurrentHour]) >= 2 and int(schedulehours[CurrentHour]) <= 8) and (
-                                    int(resourceDetails.capacity.capacity_value) >= 2 and int(resourceDetails.capacity.capacity_value) <= 8):
-                                capacity = oci.analytics.models.capacity.Capacity()
-                                capacity.capacity_value = int(schedulehours[CurrentHour])
-                                capacity.capacity_type = capacity.CAPACITY_TYPE_OLPU_COUNT
-                                details = oci.analytics.models.ScaleAnalyticsInstanceDetails()
-                                details.capacity = capacity
-                                goscale = True
-
-                            if (int(schedulehours[CurrentHour]) >= 10 and int(schedulehours[CurrentHour]) <= 12) and (int(resourceDetails.capacity.capacity_value) >= 10 and int(resourceDetails.capacity.capacity_value) <= 12):
-                                capacity = oci.analytics.models.capacity.Capacity()
-                                capacity.capacity_value = int(schedulehours[CurrentHour])
-                                capacity.capacity_type = capacity.CAPACITY_TYPE_OLPU_COUNT
-                                details = oci.analytics.models.ScaleAnalyticsInstanceDetails()
-                                details.capacity = capacity
-                                goscale = True
-
-                            if goscale:
-                                goscale = False
-                                if Action == "All":
-                                    goscale = True
-                                elif int(resourceDetails.capacity.capacity_value) < int(schedulehours[CurrentHour]) and Action == "Up":
-                                    goscale = True
-                                elif int(resourceDetails.capacity.capacity_value) > int(schedulehours[CurrentHour]) and Action == "Down":
-                                    goscale = True
-
-                                if goscale:
-                                    MakeLog(" - Initiate Analytics Scaling from {} to {}oCPU for {}".format(
-                                        int(resourceDetails.capacity.capacity_value), int(schedulehours[CurrentHour]),
-                                        resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = analytics.scale_analytics_instance(analytics_instance_id=resource.identifier, scale_analytics_instance_details=details)
-                                            Retry = False
-                                            success.append(" - Initiate Analytics Scaling from {} to {}oCPU for {}".format(int(resourceDetails.capacity.capacity_value),
-                                                                                                                           int(schedulehours[CurrentHour]), resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Analytics scaling from {} to {}oCPU for {} - {}".format(response.status, int(resourceDetails.capacity.capacity_value), int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Analytics scaling from {} to {}oCPU for {} - {}".format(response.status, int(resourceDetails.capacity.capacity_value), int(schedulehours[CurrentHour]), resource.display_name, response.message))
-                                                Retry = False
-                            else:
-                                errors.append(" - Error (Analytics scaling from {} to {}oCPU, invalid combination for {}".format(int(resourceDetails.capacity.capacity_value), int(schedulehours[CurrentHour]), resource.display_name))
-                                MakeLog(" - Error (Analytics scaling from {} to {}oCPU, invalid combination for {}".format(int(resourceDetails.capacity.capacity_value), int(schedulehours[CurrentHour]), resource.display_name))
-
-                    ###################################################################################
-                    # IntegrationInstance
-                    ###################################################################################
-                    if resource.resource_type == "IntegrationInstance":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            resourceDetails = integration.get_integration_instance(integration_instance_id=resource.identifier).data
-
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate Integration Service shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = integration.stop_integration_instance(integration_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Integration Service shutdown for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Integration Service Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Integration Service Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "INACTIVE" and int(schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate Integration Service startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = integration.start_integration_instance(integration_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Integration Service startup for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Integration Service startup for {} - {}".format(response.message, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Integration Service startup for {} - {}".format(response.message, resource.display_name, response.message))
-                                                Retry = False
-
-                    ###################################################################################
-                    # LoadBalancer
-                    ###################################################################################
-                    if resource.resource_type == "LoadBalancer":
-                        requestedShape = int(schedulehours[CurrentHour])
-                        shape = 0
-                        if resourceDetails.shape_name == "10Mbps":
-                            shape = 10
-                        if resourceDetails.shape_name == "100Mbps":
-                            shape = 100
-                        if resourceDetails.shape_name == "400Mbps":
-                            shape = 400
-                        if resourceDetails.shape_name == "8000Mbps":
-                            shape = 8000
-                        if resourceDetails.shape_name == "flexible":
-                            shape = resourceDetails.shape_details.maximum_bandwidth_in_mbps
-                        if (requestedShape == 10 or requestedShape == 100 or requestedShape == 400 or requestedShape == 8000) and resourceDetails.shape_name != "flexible":
-                            if requestedShape < shape:
-                                if Action == "All" or Action == "Down":
-                                    details = oci.load_balancer.models.UpdateLoadBalancerShapeDetails()
-                                    details.shape_name = "{}Mbps".format(requestedShape)
-                                    MakeLog(" - Downsizing loadbalancer from {} to {}".format(resourceDetails.shape_name, details.shape_name))
-                                    try:
-                                        loadbalancer.update_load_balancer_shape(load_balancer_id=resource.identifier, update_load_balancer_shape_details=details,
-                                                                                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-                                    except oci.exceptions.ServiceError as response:
-                                        MakeLog(" - Error Downsizing: {}".format(response.message))
-                                        errors.append(" - Error ({}) Load Balancer sizing for {}".format(response.message, resource.display_name))
-
-                            if requestedShape > shape:
-                                if Action == "All" or Action == "Up":
-                                    details = oci.load_balancer.models.UpdateLoadBalancerShapeDetails()
-                                    details.shape_name = "{}Mbps".format(requestedShape)
-                                    MakeLog(" - Upsizing loadbalancer from {} to {}".format(resourceDetails.shape_name, details.shape_name))
-                                    try:
-                                        loadbalancer.update_load_balancer_shape(load_balancer_id=resource.identifier, update_load_balancer_shape_details=details,
-                                                                                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-                                    except oci.exceptions.ServiceError as response:
-                                        MakeLog(" - Error Upsizing: {} ".format(response.message))
-                                        errors.append(" - Error ({}) Load Balancer sizing for {}".format(response.message, resource.display_name))
-                        elif resourceDetails.shape_name == "flexible":
-                            if requestedShape < shape:
-                                if Action == "All" or Action == "Down":
-                                    details = oci.load_balancer.models.UpdateLoadBalancerShapeDetails()
-                                    flexdetails = oci.load_balancer.models.ShapeDetails()
-                                    flexdetails.minimum_bandwidth_in_mbps = resourceDetails.shape_details.minimum_bandwidth_in_mbps
-                                    flexdetails.maximum_bandwidth_in_mbps = requestedShape
-                                    details.shape_details = flexdetails
-                                    details.shape_name = resourceDetails.shape_name
-                                    MakeLog(" - Downsizing Flex loadbalancer from {} to {}".format(shape,requestedShape))
-                                    try:
-                                        loadbalancer.update_load_balancer_shape(load_balancer_id=resource.identifier,
-                                                                                update_load_balancer_shape_details=details,
-                                                                                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-                                    except oci.exceptions.ServiceError as response:
-                                        MakeLog(" - Error Downsizing: {}".format(response.message))
-                                        errors.append(" - Error ({}) Flex Load Balancer sizing for {}".format(response.message,
-                                                                                                         resource.display_name))
-                                else:
-                                    MakeLog(" - Ignoring size as this is smaller then current")
-                            if requestedShape > shape:
-                                if Action == "All" or Action == "Up":
-                                    details = oci.load_balancer.models.UpdateLoadBalancerShapeDetails()
-                                    flexdetails = oci.load_balancer.models.ShapeDetails()
-                                    flexdetails.minimum_bandwidth_in_mbps = resourceDetails.shape_details.minimum_bandwidth_in_mbps
-                                    flexdetails.maximum_bandwidth_in_mbps = requestedShape
-                                    details.shape_details = flexdetails
-                                    details.shape_name = resourceDetails.shape_name
-                                    MakeLog(" - Upsizing Flex loadbalancer from {} to {}".format(shape,requestedShape))
-                                    try:
-                                        loadbalancer.update_load_balancer_shape(load_balancer_id=resource.identifier,
-                                                                                update_load_balancer_shape_details=details,
-                                                                                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-                                    except oci.exceptions.ServiceError as response:
-                                        MakeLog(" - Error Upsizing: {}".format(response.message))
-                                        errors.append(" - Error ({}) Flex Load Balancer sizing for {}".format(response.message,
-                                                                                                         resource.display_name))
-                                else:
-                                    MakeLog(" - Ignoring size as this is larger then current")
-                        else:
-                            MakeLog(" - Error {}: requested shape {} does not exists".format(resource.display_name, requestedShape))
-
-                    ###################################################################################
-                    # MysqlDBInstance
-                    ###################################################################################
-                    if resource.resource_type == "MysqlDBInstance":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate MySQL shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            stopaction = oci.mysql.models.StopDbSystemDetails()
-                                            stopaction.shutdown_type = "SLOW"
-                                            response = mysql.stop_db_system(db_system_id=resource.identifier, stop_db_system_details=stopaction)
-                                            Retry = False
-                                            success.append(" - Initiate MySql shutdown for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) MySQL Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) MySQL Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "INACTIVE" and int(schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate MySQL startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = mysql.start_db_system(db_system_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate MySQL startup for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) MySQL startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                    ###################################################################################
-                    # GoldenGateDeployment
-                    ###################################################################################
-                    if resource.resource_type == "GoldenGateDeployment":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate GoldenGate shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            stopaction = oci.golden_gate.models.StopDeploymentDetails()
-                                            stopaction.type = "DEFAULT"
-                                            response = goldengate.stop_deployment(deployment_id=resource.identifier, stop_deployment_details=stopaction)
-
-                                            Retry = False
-                                            success.append(" - Initiate GoldenGate shutdown for {}".format(resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) GoldenGate Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) GoldenGate Shutdown for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "INACTIVE" and int(schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate GoldenGate startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            startaction = oci.golden_gate.models.StartDeploymentDetails()
-                                            startaction.type = "DEFAULT"
-                                            response = goldengate.start_deployment(deployment_id=resource.identifier, start_deployment_details=startaction)
-                                            if response.status == 200:
-                                                success.append(" - Initiate GoldenGate startup for {}".format(resource.display_name))
-                                            Retry = False
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) GoldenGate startup for {} - {}".format(response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                    ###################################################################################
-                    # Data Integration Workshop
-                    ###################################################################################
-                    if resource.resource_type == "DISWorkspace":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(
-                                    schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate Data Integration Workspace shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = dataintegration.stop_workspace(workspace_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Data Integration Workspace shutdown for {}".format(
-                                                resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(
-                                                    RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(
-                                                    " - Error ({}) Data Integration Workspace Shutdown for {} - {}".format(
-                                                        response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Data Integration Shutdown for {} - {}".format(
-                                                    response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "STOPPED" and int(
-                                    schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate Data Integration Workspace startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = dataintegration.start_workspace(workspace_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Data Integration Workspace startup for {}".format(
-                                                resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(
-                                                    RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Data Integration Startup startup for {} - {}".format(
-                                                    response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                   ###################################################################################
-                    # Visual Builder (OCI Native version)
-                    ###################################################################################
-                    if resource.resource_type == "VisualBuilderInstance":
-                        if int(schedulehours[CurrentHour]) == 0 or int(schedulehours[CurrentHour]) == 1:
-                            if resourceDetails.lifecycle_state == "ACTIVE" and int(
-                                    schedulehours[CurrentHour]) == 0:
-                                if Action == "All" or Action == "Down":
-                                    MakeLog(" - Initiate Visual Builder shutdown for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = visualbuilder.stop_vb_instance(vb_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Builder shutdown for {}".format(
-                                                resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(
-                                                    RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(
-                                                    " - Error ({}) Visual Builder Shutdown for {} - {}".format(
-                                                        response.status, resource.display_name, response.message))
-                                                MakeLog(" - Error ({}) Visual Builder Shutdown for {} - {}".format(
-                                                    response.status, resource.display_name, response.message))
-                                                Retry = False
-
-                            if resourceDetails.lifecycle_state == "INACTIVE" and int(
-                                    schedulehours[CurrentHour]) == 1:
-                                if Action == "All" or Action == "Up":
-                                    MakeLog(" - Initiate Visual Builder startup for {}".format(resource.display_name))
-                                    Retry = True
-                                    while Retry:
-                                        try:
-                                            response = visualbuilder.start_vb_instance(vb_instance_id=resource.identifier)
-                                            Retry = False
-                                            success.append(" - Initiate Visual Builder startup for {}".format(
-                                                resource.display_name))
-                                        except oci.exceptions.ServiceError as response:
-                                            if response.status == 429:
-                                                MakeLog("Rate limit kicking in.. waiting {} seconds...".format(
-                                                    RateLimitDelay))
-                                                time.sleep(RateLimitDelay)
-                                            else:
-                                                ErrorsFound = True
-                                                errors.append(" - Error ({}) Visual Builder startup for {} - {}".format(
-                                                    response.status, resource.display_name, response.message))
-                                                Retry = False
+        resource_span.finish()
+    else:
+        # Full discovery completed, remove resources from the inventory that were not found
+        if inventory_store and not last_discovery and not compartment_include and not compartment_exclude and not discovery.errors and not discovery.expired:
+            inventory_store.discovery_done(region, discovery_started)
 
     ###################################################################################
-    # Wait for any AutonomousDB and Instance Pool Start and rescale tasks completed
+    # Wait for any start and rescale actions to complete
     ###################################################################################
-    MakeLog("Waiting for all threads to complete...")
-    for t in threads:
-        t.join()
+    for name, e in discovery.errors:
+        results.add_error(" - Error finding resources ({}) in region {} - {}".format(name, region, str(e)))
+        MakeLog("Error finding resources ({}) - {}".format(name, str(e)), level=LogOutput.ERROR)
+    if mysql_stats:
+        MakeLog("Found {} MySQL instances, checked {} compartments, {} skipped (no MySQL found before), {} errors".format(
+            mysql_stats["found"], mysql_stats["checked"], mysql_stats["cached"], mysql_stats["errors"]))
+    MakeLog("Checked {} Resources, {} had no action for this hour based on the search data, {} duplicates ignored".format(counts["resources"], counts["resources"] - counts["candidates"], discovery.duplicates))
+    MakeLog("Resource details loaded using {} list calls".format(inventory.list_calls))
+    wait_for_actions(ctx, executor)
     MakeLog("Region {} Completed.".format(region))
 
 
+##########################################################################
+# Run a single region in its own context
+##########################################################################
+def run_region(region_name, log_region=False):
+    with region_lock:
+        ctx = region_contexts.get(region_name)
+        if ctx is None:
+            ctx = RegionContext(region_name, client_registry, cmd.region_timeout, log_region)
+            region_contexts[region_name] = ctx
+        else:
+            ctx.start(cmd.region_timeout, log_region)
+    set_log_region(ctx)
+    print_header("Region " + region_name)
+    try:
+        with tracer.span("region " + region_name, region_name, attributes={"oci.region": region_name}, register=True):
+            if plan_regions is not None:
+                apply_region(ctx, plan_regions[region_name])
+            else:
+                autoscale_region(ctx)
+    except Exception as e:
+        if not log_region:
+            raise
+        results.add_error(" - Error processing region {} - {}".format(region_name, str(e)))
+        MakeLog(" - Error processing region {} - {}".format(region_name, str(e)), level=LogOutput.ERROR)
+    finally:
+        log_context.region = ""
+
+
+##########################################################################
+# Apply the actions of a plan (-apply) for a single region
+##########################################################################
+def apply_region(ctx, region_actions):
+    MakeLog("Applying {} planned actions on region {}".format(len(region_actions), ctx.region))
+    executor = create_action_executor(ctx)
+    for action in region_actions:
+        executor.submit(action)
+
+    wait_for_actions(ctx, executor)
+    MakeLog("Region {} Completed.".format(ctx.region))
+
+
+##########################################################################
+# Forecast the capacity per hour using the resource inventory and write
+# the totals per region and compartment to a CSV file
+##########################################################################
+def run_forecast(region_names, filename):
+
+    if Forecast.np is None:
+        MakeLog("The forecast requires numpy, install it with: pip3 install numpy")
+        sys.exit(1)
+    if not inventory_store:
+        MakeLog("The forecast uses the resource inventory, set UseInventory = True and run the script first")
+        sys.exit(1)
+
+    print_header("Forecast")
+    forecast_start = time.time()
+    hours = {region: get_forecast_hours(region, ForecastHours, cmd.ignore_region_time) for region in region_names}
+
+    def schedule_slots(region, tags):
+        try:
+            schedule = json.loads(tags) if tags else {}
+            slots = []
+            for DayOfWeek, Day, CurrentHour, CurrentDayOfMonth, DayNr, CurrentMinute in hours[region]:
+                ActiveSchedule = get_active_schedule(schedule, DayOfWeek, Day, DayNr, CurrentDayOfMonth)
+                schedulehours = Schedule.compile_schedule(ActiveSchedule) if ActiveSchedule else ()
+                if len(schedulehours) in Schedule.SlotsPerDay:
+                    slots.append(schedulehours[Schedule.slot_index(len(schedulehours), CurrentHour, CurrentMinute)])
+                else:
+                    slots.append(None)
+            return slots
+        except Exception:
+            return [None] * ForecastHours
+
+    resources = []
+    for region in region_names:
+        if not inventory_store.last_discovery(region):
+            MakeLog("No recent inventory for region {}, run the script for this region first".format(region))
+        for row in inventory_store.resources(region):
+            if compartment_include and row[0] != compartment_include:
+                continue
+            if compartment_exclude and row[0] == compartment_exclude:
+                continue
+            resources.append((region,) + tuple(row))
+
+    groups, totals, unknown = Forecast.forecast(resources, ForecastHours, schedule_slots)
+    MakeLog("Forecast of {} resources for {} hours done in {:.2f} seconds".format(len(resources), ForecastHours, time.time() - forecast_start))
+    if unknown:
+        MakeLog("The capacity of {} resources is not known yet and counted as 0".format(unknown))
+
+    compartment_names = {c.id: c.name for c in compartments}
+    start_hour = current_utc_time.replace(minute=0, second=0, microsecond=0)
+    with open(filename, 'w', newline='') as forecast_file:
+        writer = csv.writer(forecast_file)
+        writer.writerow(["hour_utc", "region", "compartment", "compartment_id"] + Forecast.Metrics)
+        for h in range(ForecastHours):
+            hour = (start_hour + datetime.timedelta(hours=h)).strftime("%Y-%m-%d %H:%M")
+            for g, (region, compartment_id) in enumerate(groups):
+                writer.writerow([hour, region, compartment_names.get(compartment_id, ""), compartment_id] +
+                                ["{:g}".format(totals[metric][g, h]) for metric in Forecast.Metrics])
+
+    for region in region_names:
+        rows = [g for g, group in enumerate(groups) if group[0] == region]
+        if not rows:
+            continue
+        ocpus = totals["ocpus"][rows].sum(axis=0)
+        running = totals["running"][rows].sum(axis=0)
+        MakeLog("{}: now {:g} OCPUs / {:g} running, minimum {:g} OCPUs at {}, maximum {:g} OCPUs at {} (UTC)".format(
+            region, ocpus[0], running[0],
+            ocpus.min(), (start_hour + datetime.timedelta(hours=int(ocpus.argmin()))).strftime("%a %H:%M"),
+            ocpus.max(), (start_hour + datetime.timedelta(hours=int(ocpus.argmax()))).strftime("%a %H:%M")))
+    MakeLog("Forecast written to {}".format(filename))
+
+
+##########################################################################
+# Identity client, only created when the tenancy or the compartments are
+# not in the inventory
+##########################################################################
+def identity_client():
+    return client_registry.get("identity", config["region"])
+
+
+##########################################################################
+# Read the compartments, from the inventory when it is recent enough
+##########################################################################
+def load_compartments():
+    global compartments
+
+    cached_compartments = inventory_store.get_meta("compartments:" + tenancy.id, "compartments") if inventory_store else None
+    if cached_compartments:
+        compartments = [oci.identity.models.Compartment(**c) for c in cached_compartments]
+        MakeLog("Using {} compartments from the inventory".format(len(compartments)))
+    else:
+        compartments = identity_read_compartments(identity_client(), tenancy)
+        if inventory_store:
+            inventory_store.set_meta("compartments:" + tenancy.id, [
+                {"id": c.id, "name": c.name, "lifecycle_state": c.lifecycle_state, "compartment_id": c.compartment_id} for c in compartments])
+
+
+##########################################################################
+# Process the regions, in parallel when requested
+##########################################################################
+def run_regions(region_names):
+    if cmd.region_parallelism > 1 and len(region_names) > 1:
+        MakeLog("Processing {} regions, {} in parallel".format(len(region_names), cmd.region_parallelism))
+        # With a time budget every region has ended after the budget of the last batch of regions, plus a grace period
+        timeout = None
+        if cmd.region_timeout:
+            timeout = -(-len(region_names) // cmd.region_parallelism) * cmd.region_timeout + RegionGracePeriod
+        region_executor = concurrent.futures.ThreadPoolExecutor(max_workers=cmd.region_parallelism)
+        try:
+            region_futures = {region_executor.submit(run_region, region_name, True): region_name for region_name in region_names}
+            done, not_done = concurrent.futures.wait(region_futures, timeout=timeout)
+        finally:
+            region_executor.shutdown(wait=False)
+        for future in not_done:
+            region_name = region_futures[future]
+            state = "was not started" if future.cancel() else "did not finish"
+            unfinished_regions.add(region_name)
+            results.add_error(" - Error region {} {} within the time budget of {} seconds".format(region_name, state, timeout))
+            MakeLog(" - Error region {} {} within the time budget of {} seconds".format(region_name, state, timeout), level=LogOutput.ERROR)
+    else:
+        for region_name in region_names:
+            run_region(region_name)
+
+
+##########################################################################
+# Connections per client, enough for all workers that can use the client
+# at the same time, plus one for the waiter
+##########################################################################
+def client_pool_sizes():
+    pool_sizes = {}
+    for service in ServiceClients:
+        pool_sizes[service] = ServiceConcurrency.get(service, DefaultServiceConcurrency) + ActionConcurrency.get(service, DefaultActionConcurrency) + 1
+    pool_sizes["search"] = SearchConcurrency + 1
+    pool_sizes["mysql"] += MySQLConcurrency
+    return pool_sizes
+
+
+##########################################################################
+# Send the summary to the topic and log the totals
+##########################################################################
+def send_summary(notify=True):
+
+    if cmd.topic and notify:
+        ns = client_registry.get("ons", tenancy_home_region)
+
+        if LogLevel == "ALL" or (LogLevel == "ERRORS" and results.errors_found):
+            MakeLog("\nPublishing notification")
+            body_message = "Scaling ({}) just completed. Found {} errors across {} scaleable instances (from a total of {} instances). \nError Details: {}\n\nSuccess Details: {}".format(Action, len(results.errors), len(results.success), total_resources, results.errors, results.success)
+            try:
+                ns.publish_message(cmd.topic, {"title": "Scaling Script ran across tenancy: {}".format(tenancy.name), "body": body_message})
+            except oci.exceptions.ServiceError as ns_response:
+                MakeLog("Error ({}) publishing notification - {}".format(ns_response.status, ns_response.message), level=LogOutput.ERROR)
+
+    MakeLog("All scaling tasks done, checked {} resources, {} actions succeeded, {} failed.".format(total_resources, *results.action_counts()))
+    if rate_limiter.first_call:
+        MakeLog("First request to OCI {:.2f} seconds after the start of the script".format(rate_limiter.first_call - script_started))
+    for (service, region), throttles in sorted(rate_limiter.throttles().items()):
+        MakeLog("Service {} in region {} throttled {} calls".format(service, region, throttles))
+
+    export_metrics()
+    export_trace()
+
+
+##########################################################################
+# Send the spans of the run to the OTLP endpoint or write them to a file
+##########################################################################
+def export_trace():
+    if cmd.trace:
+        try:
+            spans = tracer.export(cmd.trace)
+            MakeLog("Trace with {} spans sent to {}".format(spans, cmd.trace))
+        except Exception as e:
+            MakeLog("Error sending the trace to {} - {}".format(cmd.trace, str(e)), level=LogOutput.ERROR)
+
+
+##########################################################################
+# Write the metrics to the textfile and send them to OCI Monitoring
+##########################################################################
+def export_metrics():
+    metrics.finish()
+    if cmd.metrics:
+        try:
+            metrics.write_textfile(cmd.metrics)
+        except Exception as e:
+            MakeLog("Error writing the metrics to {} - {}".format(cmd.metrics, str(e)), level=LogOutput.ERROR)
+
+    if cmd.metrics_compartment:
+        metric_data = metrics.metric_data(MetricsNamespace, cmd.metrics_compartment, {"tag": PredefinedTag})
+        monitoring = client_registry.get("monitoring", tenancy_home_region)
+        try:
+            for start in range(0, len(metric_data), MetricsBatchSize):
+                monitoring.post_metric_data(oci.monitoring.models.PostMetricDataDetails(metric_data=metric_data[start:start + MetricsBatchSize]))
+        except oci.exceptions.ServiceError as e:
+            MakeLog("Error ({}) sending the metrics - {}".format(e.status, e.message), level=LogOutput.ERROR)
+
+
+##########################################################################
+# Stop the profiler and write the cProfile dump and the Chrome trace
+##########################################################################
+def write_profile():
+    profiler.stop()
+    try:
+        profiler.write_stats(cmd.profile + ".prof")
+        profiler.write_chrome_trace(cmd.profile + ".trace.json")
+    except Exception as e:
+        MakeLog("Error writing the profile {} - {}".format(cmd.profile, str(e)), level=LogOutput.ERROR)
+        return
+    MakeLog("Profile written to {0}.prof and {0}.trace.json, functions with the most cumulative time:".format(cmd.profile))
+    for seconds, (filename, line, function) in profiler.top(ProfileTop):
+        MakeLog("   {:9.3f}s {} ({}:{})".format(seconds, function, os.path.basename(filename), line))
+
+
+##########################################################################
+# Close the recording or report how the replay compares to the recorded run
+##########################################################################
+def close_traffic():
+    runtime = time.time() - script_started
+    if cmd.record:
+        traffic.close({"runtime": round(runtime, 3)})
+        MakeLog("Recorded {} API calls to {}".format(traffic.calls, cmd.record))
+        return
+    MakeLog("Replayed {} API calls from {}, {} not in the recording".format(traffic.served, cmd.replay, sum(traffic.missed.values())))
+    for request, count in traffic.missed.most_common(10):
+        MakeLog("   Not recorded: {} ({}x)".format(request, count), level=LogOutput.DEBUG)
+    if traffic.summary:
+        MakeLog("Recorded run  : {} API calls in {:.1f} seconds, this run {:.1f} seconds".format(traffic.summary["calls"], traffic.summary["runtime"], runtime))
+
+
+##########################################################################
+# Offset of the host time to UTC, rounded to minutes
+##########################################################################
+def host_utc_offset():
+    return datetime.timedelta(minutes=round((datetime.datetime.now() - datetime.datetime.utcnow()).total_seconds() / 60))
+
+
+##########################################################################
+# First slot boundary after utc_time in the time zone of the region (UTC)
+##########################################################################
+def next_slot_boundary(region, utc_time, slot_minutes):
+    if cmd.ignore_region_time:
+        offset = host_utc_offset()
+    else:
+        offset = Regions.local_time(region, utc_time).utcoffset()
+
+    local_time = (utc_time + offset).replace(second=0, microsecond=0)
+    local_time = local_time - datetime.timedelta(minutes=(local_time.hour * 60 + local_time.minute) % slot_minutes)
+    return local_time + datetime.timedelta(minutes=slot_minutes) - offset
+
+
+##########################################################################
+# Sleep until the UTC time, in short steps so a clock change is noticed
+##########################################################################
+def sleep_until(utc_time):
+    while True:
+        delay = (utc_time - datetime.datetime.utcnow()).total_seconds()
+        if delay <= 0:
+            return
+        time.sleep(min(delay, 60))
+
+
+##########################################################################
+# Daemon mode, scale the regions at every slot boundary
+# The resources are checked DaemonPlanAhead seconds before the boundary,
+# at the boundary only the planned actions are executed
+##########################################################################
+def run_daemon(region_names):
+    global current_utc_time, current_host_time, results, total_resources, planning, planned_actions, plan_regions
+
+    MakeLog("Running as daemon, scaling every {} minutes".format(DaemonSlotMinutes))
+    while True:
+        now = datetime.datetime.utcnow()
+        boundaries = {region: next_slot_boundary(region, now, DaemonSlotMinutes) for region in region_names}
+        boundary = min(boundaries.values())
+        due_regions = [region for region in region_names if boundaries[region] == boundary]
+        MakeLog("Next run for {} at {} UTC".format(", ".join(due_regions), boundary.strftime("%Y-%m-%d %H:%M")))
+        sleep_until(boundary - datetime.timedelta(seconds=DaemonPlanAhead))
+
+        # Check the resources against the schedules of the coming slot
+        print_header("Run for " + boundary.strftime("%Y-%m-%d %H:%M") + " UTC")
+        current_utc_time = boundary
+        current_host_time = boundary + host_utc_offset()
+        results = Executor.Results()
+        metrics.reset()
+        if tracer.root is None:
+            tracer.span("run", attributes={"action": Action, "tag": PredefinedTag, "slot": boundary.strftime("%Y-%m-%dT%H:%M:%SZ")}, root=True)
+        total_resources = 0
+        planned_actions = []
+        planning = True
+        try:
+            load_compartments()
+            run_regions(due_regions)
+        except Exception as e:
+            results.add_error(" - Error checking the resources - {}".format(str(e)))
+            MakeLog(" - Error checking the resources - {}".format(str(e)), level=LogOutput.ERROR)
+        finally:
+            planning = False
+
+        # Execute the planned actions at the boundary
+        plan_regions = {}
+        for action in planned_actions:
+            plan_regions.setdefault(action.region, []).append(action)
+        sleep_until(boundary)
+        try:
+            run_regions(list(plan_regions))
+        finally:
+            plan_regions = None
+
+        try:
+            send_summary()
+        except Exception as e:
+            MakeLog("Error sending the summary - {}".format(str(e)), level=LogOutput.ERROR)
+
+
 ##########################################################################
 # Main
 ##########################################################################
@@ -1668,11 +1738,77 @@ parser.add_argument('-printocid', action='store_true', default=False, dest='prin
 parser.add_argument('-topic', default="", dest='topic', help='Topic OCID to send summary in home region')
 parser.add_argument('-log', default="", dest='log', help='Log OCID to send log output to')
 parser.add_argument('-override', default="", dest='override', help='Override schedule based on a tag')
+parser.add_argument('-rp', default=1, type=int, dest='region_parallelism', help='Number of regions to process in parallel, Default=1')
+parser.add_argument('-rt', default=0, type=int, dest='region_timeout', help='Time budget in seconds per region, Default=0 (no limit)')
+parser.add_argument('-refresh', action='store_true', default=False, dest='refresh', help='Ignore the local inventory and do a full refresh')
+parser.add_argument('-forecast', default="", dest='forecast', help='Write the forecast for the coming week to this CSV file, no actions are executed')
+parser.add_argument('-plan', default="", dest='plan', help='Write the actions to this JSON plan file instead of executing them')
+parser.add_argument('-apply', default="", dest='apply', help='Execute the actions of this JSON plan file, no resources are checked')
+parser.add_argument('-ahead', default=0, type=int, dest='ahead', help='Evaluate the schedules this many minutes ahead, Default=0')
+parser.add_argument('-daemon', action='store_true', default=False, dest='daemon', help='Keep running and scale the resources at every slot boundary')
+parser.add_argument('-loglevel', default=LogOutputLevel, choices=list(LogOutput.Levels), dest='loglevel', help='Level of the log output, Default=' + LogOutputLevel)
+parser.add_argument('-jsonlog', default="", dest='jsonlog', help='Also write the log output as JSON lines to this file')
+parser.add_argument('-metrics', default="", dest='metrics', help='Write the metrics of the run to this Prometheus textfile')
+parser.add_argument('-metricscompartment', default="", dest='metrics_compartment', help='Send the metrics of the run to OCI Monitoring in this compartment')
+parser.add_argument('-trace', default="", dest='trace', help='Trace the run, send the spans to this OTLP/HTTP endpoint (http://...) or write them to this JSON file')
+parser.add_argument('-profile', default="", dest='profile', help='Profile the run, write PROFILE.prof (cProfile) and PROFILE.trace.json (Chrome trace)')
+parser.add_argument('-record', default="", dest='record', help='Record the OCI API requests and responses of the run to this file')
+parser.add_argument('-replay', default="", dest='replay', help='Run against the recording in this file instead of OCI')
+parser.add_argument('-replaylatency', default=1.0, type=float, dest='replay_latency', help='Factor for the recorded latencies of a replay, 0 replays without waiting, Default=1')
 
 cmd = parser.parse_args()
+log_level = LogOutput.Levels[cmd.loglevel]
+if cmd.jsonlog:
+    log_json = LogOutput.JsonLinesWriter(cmd.jsonlog)
+if cmd.log:
+    # The log lines are sent once the home region is known
+    log_shipper = LogOutput.LogShipper(put_logs, LogBatchEntries, LogBatchBytes, LogBatchSeconds)
+atexit.register(close_log_output)
+if cmd.profile:
+    profiler = Profiling.Profiler(ProfileInterval)
+    profiler.start()
+    atexit.register(write_profile)
+
 if cmd.action != "All" and cmd.action != "Down" and cmd.action != "Up":
     parser.print_help()
     sys.exit(0)
+if len([option for option in (cmd.plan, cmd.apply, cmd.forecast, cmd.daemon) if option]) > 1:
+    print("Use only one of -plan, -apply, -forecast and -daemon")
+    sys.exit(1)
+if cmd.daemon and cmd.ahead:
+    print("-ahead can not be used with -daemon")
+    sys.exit(1)
+if cmd.record and cmd.replay:
+    print("Use only one of -record and -replay")
+    sys.exit(1)
+if cmd.daemon and (cmd.record or cmd.replay):
+    print("-record and -replay can not be used with -daemon")
+    sys.exit(1)
+
+# A replay runs at the time of the recording, with its tenancy and responses
+traffic = None
+if cmd.replay:
+    traffic = Recording.Replayer(cmd.replay, cmd.replay_latency)
+    current_utc_time = datetime.datetime.strptime(traffic.header["utc_time"], "%Y-%m-%dT%H:%M:%S.%f")
+    current_host_time = datetime.datetime.strptime(traffic.header["host_time"], "%Y-%m-%dT%H:%M:%S.%f")
+
+# Actions are written to the plan instead of executed, also while checking the resources in daemon mode
+planning = bool(cmd.plan)
+
+# Evaluate the schedules for a time ahead, used to create a plan before the hour starts
+if cmd.ahead:
+    current_host_time = current_host_time + datetime.timedelta(minutes=cmd.ahead)
+    current_utc_time = current_utc_time + datetime.timedelta(minutes=cmd.ahead)
+
+# Read the plan to apply
+plan = None
+planned_actions = []
+plan_regions = None
+if cmd.apply:
+    plan, planned_actions = Actions.load_plan(cmd.apply)
+    plan_regions = {}
+    for action in planned_actions:
+        plan_regions.setdefault(action.region, []).append(action)
 
 ####################################
 # Assign variables
@@ -1690,21 +1826,57 @@ start_time = str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 print_header("Running Auto Scale")
 
 # Identity extract compartments
-config, signer = OCIFunctions.create_signer(cmd.config_profile, cmd.is_instance_principals, cmd.is_delegation_token)
+if cmd.replay:
+    config, signer = traffic.config(), Recording.NoSigner()
+else:
+    config, signer = OCIFunctions.create_signer(cmd.config_profile, cmd.is_instance_principals, cmd.is_delegation_token)
+if plan:
+    plan_problem = Actions.plan_error(plan, config["tenancy"], cmd.tag, current_utc_time, PlanMaxAge, PlanMaxSkew)
+    if plan_problem:
+        print("Not applying plan {}, {}.".format(cmd.apply, plan_problem))
+        sys.exit(1)
+if cmd.record:
+    traffic = Recording.Recorder(cmd.record, {
+        "tenancy": config["tenancy"], "region": config["region"], "arguments": sys.argv[1:],
+        "utc_time": (current_utc_time - datetime.timedelta(minutes=cmd.ahead)).strftime("%Y-%m-%dT%H:%M:%S.%f"),
+        "host_time": (current_host_time - datetime.timedelta(minutes=cmd.ahead)).strftime("%Y-%m-%dT%H:%M:%S.%f")})
+if traffic:
+    atexit.register(close_traffic)
 compartments = []
 tenancy = None
 tenancy_home_region = ""
+inventory_store = None
+if UseInventory:
+    # A replay starts from an empty inventory in memory and leaves the local inventory untouched
+    inventory_store = Inventory.InventoryStore(":memory:" if cmd.replay else InventoryFile.format(PredefinedTag), InventoryTTL, PredefinedTag, cmd.refresh)
+metrics = Metrics.Metrics()
+tracer = Tracing.Tracer(bool(cmd.trace))
+tracer.span("run", attributes={"action": Action, "tag": PredefinedTag}, root=True)
+rate_limiter = RateLimit.RateLimiter(RateLimitStart, RateLimitStart, RateLimitMin, RateLimitMax, RateLimitRetries, RateLimitDelay, RateLimitMaxDelay, MakeLog,
+                                     metrics, tracer if cmd.trace else None)
+client_registry = Clients.ClientRegistry(config, signer, ServiceClients, rate_limiter, client_pool_sizes(), traffic=traffic)
 
 try:
     MakeLog("Starts at " + str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
     MakeLog("\nConnecting to Identity Service...")
-    identity = oci.identity.IdentityClient(config, signer=signer)
-    tenancy = identity.get_tenancy(config["tenancy"]).data
-    regions = identity.list_region_subscriptions(tenancy.id).data
+
+    cached_tenancy = inventory_store.get_meta("tenancy:" + config["tenancy"], "regions") if inventory_store else None
+    if cached_tenancy:
+        tenancy = oci.identity.models.Tenancy(id=cached_tenancy["id"], name=cached_tenancy["name"])
+        regions = [oci.identity.models.RegionSubscription(region_name=r["region_name"], is_home_region=r["is_home_region"]) for r in cached_tenancy["regions"]]
+    else:
+        tenancy = identity_client().get_tenancy(config["tenancy"]).data
+        regions = identity_client().list_region_subscriptions(tenancy.id).data
+        if inventory_store:
+            inventory_store.set_meta("tenancy:" + tenancy.id, {
+                "id": tenancy.id, "name": tenancy.name,
+                "regions": [{"region_name": r.region_name, "is_home_region": r.is_home_region} for r in regions]})
 
     for reg in regions:
         if reg.is_home_region:
             tenancy_home_region = str(reg.region_name)
+    if log_shipper:
+        log_shipper.start()
 
     MakeLog("")
     MakeLog("Version       : " + str(Version))
@@ -1719,9 +1891,17 @@ try:
         MakeLog("Topic         : " + cmd.topic)
     if cmd.filter_region:
         MakeLog("Filter Region : " + cmd.filter_region)
+    if cmd.ahead:
+        MakeLog("Ahead         : {} minutes".format(cmd.ahead))
+    if plan:
+        MakeLog("Plan          : {} ({} actions for {} UTC, tag {}, estimated {} seconds)".format(
+            cmd.apply, len(planned_actions), plan["planned_for"], plan["tag"], plan["estimated_seconds"]))
+
+    if cmd.daemon:
+        MakeLog("Daemon        : every {} minutes".format(DaemonSlotMinutes))
 
     MakeLog("")
-    compartments = identity_read_compartments(identity, tenancy)
+    load_compartments()
 
 except Exception as e:
     raise RuntimeError("\nError connecting to Identity Service - " + str(e))
@@ -1729,10 +1909,8 @@ except Exception as e:
 ############################################
 # Define Global Variables to store info
 ############################################
-success = []
-errors = []
+results = Executor.Results()
 total_resources = 0
-ErrorsFound = False
 supported_resources = [
         "instance",
         "instancepool",
@@ -1753,81 +1931,42 @@ supported_resources = [
 ############################################
 # Loop on all regions
 ############################################
-for region_name in [str(es.region_name) for es in regions]:
-
-    if cmd.filter_region:
-        if cmd.filter_region not in region_name:
-            continue
-
-    print_header("Region " + region_name)
-
-    # set the region in the config and signer
-    config['region'] = region_name
-    signer.region = region_name
+mysql_cache = None if cmd.replay else Discovery.MySQLNegativeCache(MySQLCacheFile, MySQLCacheHours)
+
+region_names = [str(es.region_name) for es in regions]
+if plan_regions is not None:
+    region_names = list(plan_regions)
+    total_resources = len(planned_actions)
+if cmd.filter_region:
+    region_names = [r for r in region_names if cmd.filter_region in r]
+
+if cmd.forecast:
+    run_forecast(region_names, cmd.forecast)
+elif cmd.daemon:
+    try:
+        run_daemon(region_names)
+    except KeyboardInterrupt:
+        MakeLog("Daemon stopped")
+else:
+    run_regions(region_names)
 
-    ###############################################
-    # services - global used by threads as well
-    ###############################################
-    compute = oci.core.ComputeClient(config, signer=signer)
-    database = oci.database.DatabaseClient(config, signer=signer)
-    pool = oci.core.ComputeManagementClient(config, signer=signer)
-    search = oci.resource_search.ResourceSearchClient(config, signer=signer)
-    oda = oci.oda.OdaClient(config, signer=signer)
-    analytics = oci.analytics.AnalyticsClient(config, signer=signer)
-    integration = oci.integration.IntegrationInstanceClient(config, signer=signer)
-    loadbalancer = oci.load_balancer.LoadBalancerClient(config, signer=signer)
-    mysql = oci.mysql.DbSystemClient(config, signer=signer)
-    goldengate = oci.golden_gate.GoldenGateClient(config, signer=signer)
-    dataintegration = oci.data_integration.DataIntegrationClient(config, signer=signer)
-    visualbuilder = oci.visual_builder.VbInstanceClient(config, signer=signer)
+if inventory_store:
+    inventory_store.close()
 
-    ###############################################
-    # Run Scale Region
-    ###############################################
-    autoscale_region(region_name)
+if cmd.plan:
+    Actions.save_plan(cmd.plan, planned_actions, tenancy=tenancy.id, tag=PredefinedTag, action=Action,
+                      planned_for=current_utc_time.strftime("%Y-%m-%dT%H:%M:%SZ"), ahead=cmd.ahead)
+    MakeLog("Plan with {} actions written to {}".format(len(planned_actions), cmd.plan))
 
 ############################################
 # Send summary if Topic Specified
 ############################################
-if cmd.topic:
-
-    # set the home region in the config and signer
-    config['region'] = tenancy_home_region
-    signer.region = tenancy_home_region
-
-    ns = oci.ons.NotificationDataPlaneClient(config, signer=signer)
-
-    if LogLevel == "ALL" or (LogLevel == "ERRORS" and ErrorsFound):
-        MakeLog("\nPublishing notification")
-        body_message = "Scaling ({}) just completed. Found {} errors across {} scaleable instances (from a total of {} instances). \nError Details: {}\n\nSuccess Details: {}".format(Action, len(errors), len(success), total_resources, errors, success)
-        Retry = True
-
-        while Retry:
-            try:
-                ns_response = ns.publish_message(cmd.topic, {"title": "Scaling Script ran across tenancy: {}".format(tenancy.name), "body": body_message})
-                Retry = False
-            except oci.exceptions.ServiceError as ns_response:
-                if ns_response.status == 429:
-                    MakeLog("Rate limit kicking in.. waiting {} seconds...".format(RateLimitDelay))
-                    time.sleep(RateLimitDelay)
-                else:
-                    MakeLog("Error ({}) publishing notification - {}".format(ns_response.status, ns_response.message))
-                    Retry = False
-
-MakeLog("All scaling tasks done, checked {} resources.".format(total_resources))
-
-if cmd.log:
-    config['region'] = tenancy_home_region
-    signer.region = tenancy_home_region
-    logingest = oci.loggingingestion.LoggingClient(config, signer=signer)
-    logdetails.source = "Autoscale-script"
-    logdetails.type = "Autoscale-script-output"
-    logdetails.subject = "Autoscale operations"
-    logdetails.defaultlogentrytime = datetime.datetime.now(datetime.timezone.utc).isoformat()
-
-    putlogdetails = oci.loggingingestion.models.PutLogsDetails()
-    putlogdetails.specversion = "1.0"
-    putlogdetails.log_entry_batches = [logdetails]
-
-    result = logingest.put_logs(log_id=cmd.log, put_logs_details=putlogdetails)
-
+if not cmd.daemon:
+    send_summary(not cmd.forecast and not cmd.plan)
+
+# The threads of regions that did not finish would keep the interpreter from exiting,
+# run the exit handlers that close the log, profile and traffic files and exit without them
+if unfinished_regions:
+    atexit._run_exitfuncs()
+    sys.stdout.flush()
+    os._exit(1)
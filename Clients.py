@@ -0,0 +1,62 @@
+import threading
+import oci
+import RateLimit
+
+
+##########################################################################
+# ClientRegistry
+##########################################################################
+class ClientRegistry:
+    """Service clients shared by all threads, one per service and region.
+
+    clients maps a service to its (SDK module, client class), with an optional
+    endpoint template for services with a separate endpoint. A client is
+    created when it is used for the first time, with an HTTP connection pool
+    of pool_sizes[service] connections (default_pool_size when not listed),
+    so parallel calls do not open a new connection for every request.
+    When a limiter is given, the client is wrapped in a LimitedClient.
+    When traffic is given (a Recording.Recorder or Replayer), its adapter
+    wraps the HTTPS adapter of every client.
+    """
+
+    def __init__(self, config, signer, clients, limiter=None, pool_sizes=None, default_pool_size=10, traffic=None):
+        self.config = config
+        self.signer = signer
+        self.clients = clients
+        self.limiter = limiter
+        self.pool_sizes = pool_sizes or {}
+        self.default_pool_size = default_pool_size
+        self.traffic = traffic
+        self.registry = {}
+        self.lock = threading.Lock()
+
+    def get(self, service, region):
+        key = (service, region)
+        with self.lock:
+            if key not in self.registry:
+                self.registry[key] = self.create(service, region)
+            return self.registry[key]
+
+    def create(self, service, region):
+        module, client_class = self.clients[service][:2]
+        config = dict(self.config)
+        config['region'] = region
+        kwargs = {"signer": self.signer}
+        if len(self.clients[service]) > 2:
+            kwargs["service_endpoint"] = oci.regions.endpoint_for(module, region, service_endpoint_template=self.clients[service][2])
+        client = getattr(getattr(oci, module), client_class)(config, **kwargs)
+        self.size_pool(client, self.pool_sizes.get(service, self.default_pool_size))
+        if self.limiter:
+            return RateLimit.LimitedClient(client, self.limiter, service, region)
+        return client
+
+    def size_pool(self, client, pool_size):
+        # Replace the HTTPS adapter of the session by one of the same class with a larger pool
+        session = getattr(getattr(client, "base_client", None), "session", None)
+        if session is None:
+            return
+        adapter_class = type(session.get_adapter("https://"))
+        adapter = adapter_class(pool_connections=1, pool_maxsize=max(1, pool_size))
+        if self.traffic:
+            adapter = self.traffic.adapter(adapter)
+        session.mount("https://", adapter)
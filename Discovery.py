@@ -0,0 +1,263 @@
+import concurrent.futures
+import json
+import os
+import queue
+import threading
+import time
+import oci
+
+
+##########################################################################
+# MySQLNegativeCache
+##########################################################################
+class MySQLNegativeCache:
+    """Compartments known to contain no MySQL DB systems, per region.
+
+    The cache is stored as a JSON file and an entry is trusted for
+    refresh_hours, after that the compartment is checked again.
+    """
+
+    def __init__(self, path, refresh_hours=24):
+        self.path = path
+        self.refresh_seconds = refresh_hours * 3600
+        self.lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(self.path, 'r') as cache_file:
+                self.entries = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            self.entries = {}
+
+    def is_empty(self, region, compartment_id):
+        with self.lock:
+            checked = self.entries.get(region, {}).get(compartment_id)
+        return checked is not None and time.time() - checked < self.refresh_seconds
+
+    def update(self, region, compartment_id, empty):
+        with self.lock:
+            region_entries = self.entries.setdefault(region, {})
+            if empty:
+                region_entries[compartment_id] = time.time()
+            else:
+                region_entries.pop(compartment_id, None)
+
+    def save(self):
+        with self.lock:
+            try:
+                temp_path = self.path + ".tmp"
+                with open(temp_path, 'w') as cache_file:
+                    json.dump(self.entries, cache_file)
+                os.replace(temp_path, self.path)
+            except (IOError, OSError):
+                pass
+
+
+##########################################################################
+# Convert a MySQL DB system into a search result
+##########################################################################
+def mysql_summary(mysql_instance):
+    summary = oci.resource_search.models.ResourceSummary()
+    summary.availability_domain = mysql_instance.availability_domain
+    summary.compartment_id = mysql_instance.compartment_id
+    summary.defined_tags = mysql_instance.defined_tags
+    summary.freeform_tags = mysql_instance.freeform_tags
+    summary.identifier = mysql_instance.id
+    summary.lifecycle_state = mysql_instance.lifecycle_state
+    summary.display_name = mysql_instance.display_name
+    summary.resource_type = "MysqlDBInstance"
+    return summary
+
+
+##########################################################################
+# Find MySQL instances with the schedule tag in the given compartments
+# The compartments are checked concurrently, compartments in the negative
+# cache are skipped. Yields a page of search results per compartment and
+# updates the given statistics.
+##########################################################################
+def mysql_pages(ctx, compartments, tag, cache=None, concurrency=8, stats=None):
+    if stats is None:
+        stats = {}
+    for key in ("checked", "cached", "errors", "found"):
+        stats.setdefault(key, 0)
+
+    def list_compartment(compartment_id):
+        return oci.pagination.list_call_get_all_results(
+            ctx.mysql.list_db_systems,
+            compartment_id=compartment_id,
+            retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY
+        ).data
+
+    to_check = []
+    for c in compartments:
+        if cache and cache.is_empty(ctx.region, c.id):
+            stats["cached"] += 1
+        else:
+            to_check.append(c.id)
+
+    futures = {}
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, concurrency))
+    try:
+        futures = {executor.submit(list_compartment, compartment_id): compartment_id for compartment_id in to_check}
+        for future in concurrent.futures.as_completed(futures):
+            compartment_id = futures[future]
+            try:
+                mysql_instances = future.result()
+            except Exception:
+                stats["errors"] += 1
+                continue
+
+            stats["checked"] += 1
+            if cache:
+                cache.update(ctx.region, compartment_id, len(mysql_instances) == 0)
+
+            page = [mysql_summary(mysql_instance) for mysql_instance in mysql_instances if tag in mysql_instance.defined_tags]
+            if page:
+                stats["found"] += len(page)
+                yield page
+
+            if ctx.expired():
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        if cache:
+            cache.save()
+
+
+##########################################################################
+# Search for resources, yields a page of search results per call
+##########################################################################
+def search_pages(ctx, query, page_size=1000):
+    sdetails = oci.resource_search.models.StructuredSearchDetails()
+    sdetails.query = query
+    for response in oci.pagination.list_call_get_all_results_generator(ctx.search.search_resources, 'response', sdetails, limit=page_size):
+        yield response.data.items
+
+
+##########################################################################
+# Split the compartments into a number of shards, keeping each subtree
+# below the root compartment together. Returns lists of compartment ids.
+##########################################################################
+def compartment_shards(compartments, tenancy_id, shards):
+    parents = {c.id: c.compartment_id for c in compartments}
+
+    def top_level(compartment_id):
+        while parents.get(compartment_id) and parents[compartment_id] != tenancy_id:
+            compartment_id = parents[compartment_id]
+        return compartment_id
+
+    subtrees = {}
+    for c in compartments:
+        subtrees.setdefault(top_level(c.id), []).append(c.id)
+
+    # Largest subtrees first, each one to the currently smallest shard
+    groups = [[] for _ in range(max(1, min(shards, len(subtrees))))]
+    for subtree in sorted(subtrees.values(), key=len, reverse=True):
+        min(groups, key=len).extend(subtree)
+    return [group for group in groups if group]
+
+
+##########################################################################
+# Build the search queries, one per shard. A shard is a resource type
+# and/or a group of compartment subtrees. Returns (name, query) tuples.
+# With created_after (UTC datetime) only newer resources are searched.
+##########################################################################
+def search_queries(resource_types, tag, shard_by_type=True, compartment_groups=None, compartment_include="", compartment_exclude="", created_after=None):
+    type_groups = [[t] for t in resource_types] if shard_by_type else [resource_types]
+    queries = []
+    for types in type_groups:
+        query = "query {} resources where (definedTags.namespace = '{}')".format(', '.join(types), tag)
+        query += " && timeCreated >= '" + created_after.strftime("%Y-%m-%dT%H:%M:%SZ") + "'" if created_after else ""
+        query += " && compartmentId  = '" + compartment_include + "'" if compartment_include else ""
+        query += " && compartmentId != '" + compartment_exclude + "'" if compartment_exclude else ""
+        if compartment_groups and not compartment_include:
+            for shard, group in enumerate(compartment_groups):
+                group_query = query + " && (" + " || ".join("compartmentId = '{}'".format(c) for c in group) + ")"
+                queries.append(("search {} #{}".format(','.join(types), shard + 1), group_query))
+        else:
+            queries.append(("search {}".format(','.join(types)), query))
+    return queries
+
+
+##########################################################################
+# DiscoveryStream
+##########################################################################
+class DiscoveryStream:
+    """Runs the discovery sources concurrently in background threads.
+
+    Pages of resources are handed over through a bounded queue, so the
+    caller can evaluate resources while later pages are still being
+    fetched and at most queue_size pages are held in memory. Resources
+    found by more than one source are only returned once, keyed by OCID.
+    time_left returns the seconds left of the time budget, or None without
+    a budget. When it runs out the sources are stopped and expired is set.
+    """
+
+    Done = object()
+
+    def __init__(self, sources, queue_size=4, concurrency=1, time_left=None):
+        self.sources = sources
+        self.concurrency = max(1, concurrency)
+        self.pages = queue.Queue(maxsize=max(1, queue_size))
+        self.stopped = threading.Event()
+        self.time_left = time_left or (lambda: None)
+        self.expired = False
+        self.errors = []
+        self.duplicates = 0
+        self.thread = None
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.pages.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run_source(self, name, source):
+        if self.stopped.is_set():
+            return
+        try:
+            for page in source():
+                if not self.put(page):
+                    return
+        except Exception as e:
+            self.errors.append((name, e))
+
+    def run(self):
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            futures = [executor.submit(self.run_source, name, source) for name, source in self.sources]
+            concurrent.futures.wait(futures)
+        finally:
+            executor.shutdown(wait=False)
+            self.put(self.Done)
+
+    def __iter__(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        seen = set()
+        try:
+            while True:
+                time_left = self.time_left()
+                try:
+                    if time_left is not None and time_left <= 0:
+                        raise queue.Empty
+                    page = self.pages.get(timeout=time_left)
+                except queue.Empty:
+                    self.expired = True
+                    break
+                if page is self.Done:
+                    break
+                unique = []
+                for resource in page:
+                    if resource.identifier in seen:
+                        self.duplicates += 1
+                        continue
+                    seen.add(resource.identifier)
+                    unique.append(resource)
+                yield unique
+        finally:
+            self.stopped.set()
@@ -0,0 +1,137 @@
+import collections
+import concurrent.futures
+import threading
+
+##########################################################################
+# Result of a single action
+# action: the Actions.Action, ok: True if the call succeeded,
+# status: HTTP status of the call, message: success or error message
+##########################################################################
+Result = collections.namedtuple("Result", ["action", "ok", "status", "message"])
+
+
+##########################################################################
+# Results
+##########################################################################
+class Results:
+    """Thread safe collector of the success and error messages of all regions.
+
+    The results of the actions are kept as Result tuples, other errors (like
+    an invalid schedule) only as a message.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.success = []
+        self.errors = []
+        self.results = []
+        self.errors_found = False
+
+    def add_success(self, message):
+        with self.lock:
+            self.success.append(message)
+
+    def add_error(self, message):
+        with self.lock:
+            self.errors.append(message)
+            self.errors_found = True
+
+    def add_result(self, result):
+        with self.lock:
+            self.results.append(result)
+            if result.ok:
+                if result.message:
+                    self.success.append(result.message)
+            else:
+                self.errors.append(result.message)
+                self.errors_found = True
+
+    def action_counts(self):
+        with self.lock:
+            succeeded = sum(1 for result in self.results if result.ok)
+            return succeeded, len(self.results) - succeeded
+
+
+##########################################################################
+# ActionExecutor
+##########################################################################
+class ActionExecutor:
+    """Runs actions with a bounded worker pool per service.
+
+    execute(action) does the call and returns True when it succeeded.
+    When an action has dependent actions (then), wait(action, done) is called
+    to wait until the resource reached the wait_for state. It must not block,
+    done(ok) is called when the wait is over, after which the dependent
+    actions are submitted to their service pool.
+    A waiting resource does not hold a worker of the service pool.
+    """
+
+    def __init__(self, execute, wait, service_concurrency=None, default_concurrency=2):
+        self.execute = execute
+        self.wait = wait
+        self.service_concurrency = service_concurrency or {}
+        self.default_concurrency = max(1, default_concurrency)
+        self.executors = {}
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.pending = 0
+
+    def concurrency(self, service):
+        return max(1, self.service_concurrency.get(service, self.default_concurrency))
+
+    def executor(self, name, workers):
+        with self.lock:
+            if name not in self.executors:
+                self.executors[name] = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+            return self.executors[name]
+
+    def start(self):
+        with self.lock:
+            self.pending += 1
+
+    def finish(self):
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0:
+                self.idle.notify_all()
+
+    def submit(self, action):
+        self.start()
+        try:
+            self.executor(action.service, self.concurrency(action.service)).submit(self.run, action)
+        except RuntimeError:
+            self.finish()
+
+    def run(self, action):
+        try:
+            if self.execute(action) and action.then:
+                if action.wait_for:
+                    self.start()
+                    try:
+                        self.wait(action, lambda ok: self.waited(action, ok))
+                    except Exception:
+                        self.finish()
+                else:
+                    for next_action in action.then:
+                        self.submit(next_action)
+        finally:
+            self.finish()
+
+    def waited(self, action, ok):
+        try:
+            if ok:
+                for next_action in action.then:
+                    self.submit(next_action)
+        finally:
+            self.finish()
+
+    def join(self, timeout=None):
+        with self.lock:
+            return self.idle.wait_for(lambda: self.pending == 0, timeout)
+
+    def shutdown(self):
+        with self.lock:
+            executors = list(self.executors.values())
+            self.executors = {}
+        for executor in executors:
+            executor.shutdown(wait=False)
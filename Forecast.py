@@ -0,0 +1,142 @@
+import Schedule
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+##########################################################################
+# How a schedule value is counted per resource type
+# resource_type: (metric, use the schedule value for "1" instead of the
+#                 current capacity of the resource)
+##########################################################################
+TypeMetrics = {
+    "Instance": ("ocpus", False),
+    "DbSystem": ("ocpus", False),
+    "VmCluster": ("ocpus", True),
+    "CloudVmCluster": ("ocpus", True),
+    "AutonomousDatabase": ("ocpus", True),
+    "AnalyticsInstance": ("ocpus", True),
+    "InstancePool": ("instances", True),
+    "LoadBalancer": ("bandwidth", True),
+}
+
+Metrics = ["running", "instances", "ocpus", "bandwidth"]
+RunningStates = ("RUNNING", "AVAILABLE", "ACTIVE")
+
+# Slot kinds as numbers, NONE is used when there is no schedule for that day
+KindCodes = {Schedule.OFF: 0, Schedule.ON: 1, Schedule.SIZE: 2, Schedule.FLEX: 3, Schedule.IGNORE: 4, Schedule.INVALID: 5}
+NONE = 6
+
+
+##########################################################################
+# Encode the slots of a schedule for every forecast hour into arrays
+##########################################################################
+def encode_slots(slots):
+    kinds = np.full(len(slots), NONE, dtype=np.int8)
+    values = np.zeros(len(slots), dtype=np.float32)
+    for h, slot in enumerate(slots):
+        if slot is None:
+            continue
+        kinds[h] = KindCodes[slot.kind]
+        if slot.kind == Schedule.FLEX:
+            values[h] = slot.cpu
+        elif slot.value is not None:
+            values[h] = slot.value
+    return kinds, values
+
+
+##########################################################################
+# Forecast
+##########################################################################
+def forecast(resources, hours, schedule_slots, chunk_size=10000):
+    """Evaluates the schedule of every resource for every forecast hour.
+
+    resources is a list of (region, compartment_id, resource_type, lifecycle_state,
+    shape, capacity, tags) tuples, schedule_slots(region, tags) returns the slot for
+    each of the hours, or None for hours without a schedule.
+    Hours without an action (wildcard, no or an invalid schedule) keep the state and
+    capacity of the hour before, the first hour starts from the current state and
+    capacity. Returns the (region, compartment_id) groups, a dict with a
+    groups x hours array per metric and the number of resources with an unknown
+    capacity.
+    """
+    if np is None:
+        raise RuntimeError("The forecast requires numpy, install it with: pip3 install numpy")
+
+    signatures = {}
+    signature_kinds = []
+    signature_values = []
+    groups = {}
+    resource_signature = np.zeros(len(resources), dtype=np.int32)
+    resource_group = np.zeros(len(resources), dtype=np.int32)
+    capacity = np.zeros(len(resources), dtype=np.float32)
+    running_now = np.zeros(len(resources), dtype=np.float32)
+    unknown = 0
+
+    # Evaluate every distinct schedule once
+    for i, (region, compartment_id, resource_type, lifecycle_state, shape, resource_capacity, tags) in enumerate(resources):
+        key = (region, tags)
+        if key not in signatures:
+            signatures[key] = len(signature_kinds)
+            kinds, values = encode_slots(schedule_slots(region, tags))
+            signature_kinds.append(kinds)
+            signature_values.append(values)
+        resource_signature[i] = signatures[key]
+        resource_group[i] = groups.setdefault((region, compartment_id), len(groups))
+        if resource_capacity is None:
+            if resource_type in TypeMetrics:
+                unknown += 1
+        else:
+            capacity[i] = resource_capacity
+        running_now[i] = lifecycle_state in RunningStates
+
+    totals = {metric: np.zeros((len(groups), hours), dtype=np.float64) for metric in Metrics}
+    if not resources:
+        return list(groups), totals, unknown
+
+    signature_kinds = np.stack(signature_kinds)
+    signature_values = np.stack(signature_values)
+
+    resource_types = np.array([r[2] for r in resources])
+    bare_metal = np.array([r[2] == "Instance" and (r[4] or "")[:2] == "BM" for r in resources])
+    metric_index = np.full(len(resources), -1, dtype=np.int8)
+    use_value = np.zeros(len(resources), dtype=bool)
+    for resource_type, (metric, value_for_on) in TypeMetrics.items():
+        mask = resource_types == resource_type
+        metric_index[mask] = Metrics.index(metric)
+        use_value[mask] = value_for_on
+
+    # Resources x hours, in chunks to limit the memory use
+    for start in range(0, len(resources), chunk_size):
+        part = slice(start, start + chunk_size)
+        kinds = signature_kinds[resource_signature[part]]
+        values = signature_values[resource_signature[part]]
+        kinds[bare_metal[part]] = NONE  # Bare metal instances are never stopped or started
+
+        on = (kinds == KindCodes[Schedule.ON]) | (kinds == KindCodes[Schedule.SIZE]) | (kinds == KindCodes[Schedule.FLEX])
+        off = kinds == KindCodes[Schedule.OFF]
+        keep = ~(on | off)
+
+        part_capacity = capacity[part, None]
+        part_running = running_now[part, None]
+        amount_on = np.where((kinds == KindCodes[Schedule.ON]) & ~use_value[part, None], part_capacity, values)
+        running = np.where(on, 1.0, 0.0)
+        amount = np.where(on, amount_on, 0.0)
+
+        # Forward fill the hours without an action from the last hour with one, or the current state
+        last = np.maximum.accumulate(np.where(keep, -1, np.arange(kinds.shape[1])), axis=1)
+        rows = np.arange(kinds.shape[0])[:, None]
+        before = last < 0
+        running = np.where(before, part_running, running[rows, np.maximum(last, 0)])
+        amount = np.where(before, part_running * part_capacity, amount[rows, np.maximum(last, 0)])
+
+        group = resource_group[part]
+        np.add.at(totals["running"], group, running)
+        instance_rows = resource_types[part] == "Instance"
+        np.add.at(totals["instances"], group[instance_rows], running[instance_rows])
+        for metric in ("instances", "ocpus", "bandwidth"):
+            rows = metric_index[part] == Metrics.index(metric)
+            np.add.at(totals[metric], group[rows], amount[rows])
+
+    return list(groups), totals, unknown
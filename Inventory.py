@@ -0,0 +1,199 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+##########################################################################
+# Get the capacity of a resource, as used by the schedule
+# (OCPUs, CPU cores, number of instances or bandwidth in Mbps)
+##########################################################################
+def resource_capacity(resource_type, details):
+    try:
+        if resource_type == "Instance":
+            return details.shape_config.ocpus if details.shape_config else None
+        if resource_type in ("DbSystem", "CloudVmCluster"):
+            return details.cpu_core_count
+        if resource_type == "VmCluster":
+            return details.cpus_enabled
+        if resource_type == "AutonomousDatabase":
+            return details.compute_count if details.compute_model == "ECPU" else details.cpu_core_count
+        if resource_type == "InstancePool":
+            return details.size
+        if resource_type == "AnalyticsInstance":
+            return details.capacity.capacity_value
+        if resource_type == "LoadBalancer":
+            if details.shape_name == "flexible":
+                return details.shape_details.maximum_bandwidth_in_mbps
+            return int(details.shape_name.replace("Mbps", ""))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return None
+
+
+##########################################################################
+# Get the shape of a resource
+##########################################################################
+def resource_shape(details):
+    return getattr(details, "shape", None) or getattr(details, "shape_name", None)
+
+
+##########################################################################
+# InventoryResource
+##########################################################################
+class InventoryResource:
+    """A resource loaded from the inventory, with the same attributes the
+    script uses from a search result."""
+
+    __slots__ = ("identifier", "resource_type", "display_name", "compartment_id", "availability_domain",
+                 "lifecycle_state", "shape", "capacity", "tag_namespace", "tags_json", "refresh", "_defined_tags")
+
+    def __init__(self, row, tag_namespace, refresh, tag_cache):
+        (self.identifier, self.resource_type, self.display_name, self.compartment_id, self.availability_domain,
+         self.lifecycle_state, self.shape, self.capacity, self.tags_json) = row
+        self.tag_namespace = tag_namespace
+        self.refresh = refresh
+        self._defined_tags = tag_cache
+
+    @property
+    def defined_tags(self):
+        # Many resources share the same schedule, only decode each distinct value once
+        tags = self._defined_tags.get(self.tags_json)
+        if tags is None:
+            tags = {self.tag_namespace: json.loads(self.tags_json)} if self.tags_json else {}
+            self._defined_tags[self.tags_json] = tags
+        return tags
+
+
+##########################################################################
+# InventoryStore
+##########################################################################
+class InventoryStore:
+    """Local SQLite store of the scheduled resources, compartments and regions.
+
+    Every field group has its own time to live (ttl, in seconds):
+      regions, compartments - tenancy, region subscriptions and compartments
+      discovery             - full search of a region
+      tags, state           - per resource, a resource with stale tags or
+                              state is read from its service again
+    """
+
+    def __init__(self, path, ttl, tag_namespace, force_refresh=False):
+        self.ttl = ttl
+        self.tag_namespace = tag_namespace
+        self.force_refresh = force_refresh
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS resources (
+            ocid TEXT PRIMARY KEY, region TEXT, resource_type TEXT, display_name TEXT, compartment_id TEXT,
+            availability_domain TEXT, lifecycle_state TEXT, shape TEXT, capacity REAL, tags TEXT,
+            state_time REAL, shape_time REAL, tags_time REAL, seen_time REAL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS resources_region ON resources (region)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT, updated REAL)")
+        self.db.commit()
+
+    def fresh(self, updated, field):
+        return not self.force_refresh and updated is not None and time.time() - updated < self.ttl.get(field, 0)
+
+    ##########################################################################
+    # Metadata (tenancy, regions, compartments, discovery times)
+    ##########################################################################
+    def get_meta(self, key, field):
+        with self.lock:
+            row = self.db.execute("SELECT value, updated FROM metadata WHERE key = ?", (key,)).fetchone()
+        if row is None or not self.fresh(row[1], field):
+            return None
+        return json.loads(row[0])
+
+    def set_meta(self, key, value, updated=None):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO metadata (key, value, updated) VALUES (?, ?, ?)",
+                            (key, json.dumps(value), updated if updated is not None else time.time()))
+            self.db.commit()
+
+    def last_discovery(self, region):
+        return self.get_meta("discovery:" + region, "discovery")
+
+    def discovery_done(self, region, started):
+        self.set_meta("discovery:" + region, started, started)
+        with self.lock:
+            self.db.execute("DELETE FROM resources WHERE region = ? AND seen_time < ?", (region, started))
+            self.db.commit()
+
+    ##########################################################################
+    # Load all resources of a region, in pages
+    ##########################################################################
+    def load(self, region, page_size=1000):
+        with self.lock:
+            rows = self.db.execute("""SELECT ocid, resource_type, display_name, compartment_id, availability_domain,
+                                      lifecycle_state, shape, capacity, tags, tags_time, state_time
+                                      FROM resources WHERE region = ?""", (region,)).fetchall()
+        now = time.time()
+        tags_valid = now - self.ttl.get("tags", 0)
+        state_valid = now - self.ttl.get("state", 0)
+        tag_cache = {}
+        for start in range(0, len(rows), page_size):
+            page = []
+            for row in rows[start:start + page_size]:
+                refresh = self.force_refresh or (row[9] or 0) <= tags_valid or (row[10] or 0) <= state_valid
+                page.append(InventoryResource(row[:9], self.tag_namespace, refresh, tag_cache))
+            yield page
+
+    ##########################################################################
+    # All resources of a region, as (compartment_id, resource_type,
+    # lifecycle_state, shape, capacity, tags) tuples
+    ##########################################################################
+    def resources(self, region):
+        with self.lock:
+            return self.db.execute("""SELECT compartment_id, resource_type, lifecycle_state, shape, capacity, tags
+                                      FROM resources WHERE region = ?""", (region,)).fetchall()
+
+    ##########################################################################
+    # Store resources found by the search, only the search fields
+    ##########################################################################
+    def store_found(self, region, resources):
+        # UPDATE followed by INSERT OR IGNORE instead of an upsert, which needs SQLite 3.24 (Oracle Linux 7 has 3.7)
+        now = time.time()
+        rows = []
+        for r in resources:
+            tags = (r.defined_tags or {}).get(self.tag_namespace)
+            rows.append((region, r.resource_type, r.display_name, r.compartment_id, r.availability_domain,
+                         r.lifecycle_state, json.dumps(tags) if tags is not None else None, now, now, now, r.identifier))
+        with self.lock:
+            self.db.executemany("""UPDATE resources SET region = ?, resource_type = ?, display_name = ?, compartment_id = ?,
+                                   availability_domain = ?, lifecycle_state = ?, tags = ?, state_time = ?, tags_time = ?,
+                                   seen_time = ? WHERE ocid = ?""", rows)
+            self.db.executemany("""INSERT OR IGNORE INTO resources (region, resource_type, display_name, compartment_id, availability_domain,
+                                   lifecycle_state, tags, state_time, tags_time, seen_time, ocid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+            self.db.commit()
+
+    ##########################################################################
+    # Store the actual details of a resource
+    ##########################################################################
+    def store_details(self, region, resource, details):
+        now = time.time()
+        tags = (details.defined_tags or {}).get(self.tag_namespace)
+        details_row = (details.lifecycle_state, resource_shape(details), resource_capacity(resource.resource_type, details),
+                       json.dumps(tags) if tags is not None else None, now, now, now, now)
+        with self.lock:
+            updated = self.db.execute("""UPDATE resources SET lifecycle_state = ?, shape = ?, capacity = ?, tags = ?, state_time = ?,
+                                         shape_time = ?, tags_time = ?, seen_time = ? WHERE ocid = ?""",
+                                      details_row + (resource.identifier,)).rowcount
+            if not updated:
+                self.db.execute("""INSERT INTO resources (ocid, region, resource_type, display_name, compartment_id, availability_domain,
+                                   lifecycle_state, shape, capacity, tags, state_time, shape_time, tags_time, seen_time)
+                                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                                (resource.identifier, region, resource.resource_type, resource.display_name, resource.compartment_id,
+                                 resource.availability_domain) + details_row)
+            self.db.commit()
+
+    def remove(self, ocid):
+        with self.lock:
+            self.db.execute("DELETE FROM resources WHERE ocid = ?", (ocid,))
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
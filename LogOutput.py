@@ -0,0 +1,125 @@
+import collections
+import datetime
+import json
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+ERROR = 40
+Levels = {"DEBUG": DEBUG, "INFO": INFO, "ERROR": ERROR}
+LevelNames = {level: name for name, level in Levels.items()}
+
+EntryOverhead = 200  # Bytes added to the size of every message for the id, time and JSON of the log entry
+
+
+##########################################################################
+# LogShipper
+##########################################################################
+class LogShipper:
+    """Sends log lines in batches from a background thread.
+
+    A batch is closed when it has max_entries lines or reaches max_bytes,
+    or when its first line is max_age seconds old. send(entries) is called
+    with a list of (time, message) and may raise, failed batches are
+    counted and dropped. Lines added before start() are kept and sent after
+    it, close() sends all remaining lines.
+    """
+
+    def __init__(self, send, max_entries=1000, max_bytes=1000000, max_age=5, max_batches=100, error=print):
+        self.send = send
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_batches = max_batches
+        self.error = error
+        self.entries = []
+        self.size = 0
+        self.oldest = None
+        self.batches = collections.deque()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def add(self, timestamp, message):
+        data = message.encode("utf-8")
+        if len(data) + EntryOverhead > self.max_bytes:
+            data = data[:self.max_bytes - EntryOverhead]
+            message = data.decode("utf-8", "ignore")
+        size = len(data) + EntryOverhead
+        with self.condition:
+            if self.entries and (len(self.entries) >= self.max_entries or self.size + size > self.max_bytes):
+                self.queue_batch()
+            if not self.entries:
+                self.oldest = time.time()
+            self.entries.append((timestamp, message))
+            self.size += size
+
+    def queue_batch(self):
+        # Called with the condition held
+        self.batches.append(self.entries)
+        self.entries = []
+        self.size = 0
+        if len(self.batches) > self.max_batches:
+            self.dropped += len(self.batches.popleft())
+        self.condition.notify()
+
+    def start(self):
+        with self.condition:
+            if self.thread is None and not self.closed:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.batches:
+                    if self.entries and (self.closed or time.time() - self.oldest >= self.max_age):
+                        self.queue_batch()
+                        continue
+                    if self.closed:
+                        return
+                    self.condition.wait(self.max_age - (time.time() - self.oldest) if self.entries else None)
+                batch = self.batches.popleft()
+
+            try:
+                self.send(batch)
+                self.sent += len(batch)
+            except Exception as e:
+                self.dropped += len(batch)
+                self.error("Error sending {} log lines - {}".format(len(batch), str(e)))
+
+    def close(self, timeout=30):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+
+##########################################################################
+# JsonLinesWriter
+##########################################################################
+class JsonLinesWriter:
+    """Writes every log line as a JSON object to a file, one per line."""
+
+    def __init__(self, filename):
+        self.file = open(filename, 'a', buffering=1)
+        self.lock = threading.Lock()
+
+    def write(self, timestamp, level, region, message):
+        line = json.dumps({
+            "time": datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat(),
+            "level": LevelNames.get(level, str(level)),
+            "region": region,
+            "message": message,
+        })
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line + "\n")
+
+    def close(self):
+        with self.lock:
+            self.file.close()
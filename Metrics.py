@@ -0,0 +1,173 @@
+import datetime
+import os
+import threading
+import time
+import oci
+
+Buckets = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)  # Upper bounds in seconds of the histogram buckets
+
+##########################################################################
+# Help text of the metrics, name: (type, help)
+##########################################################################
+Descriptions = {
+    "autoscale_api_call_seconds": ("histogram", "Duration of the OCI API calls, every retry counted separately"),
+    "autoscale_api_calls_total": ("counter", "OCI API calls by HTTP status, 429 is throttled"),
+    "autoscale_api_backoff_seconds_total": ("counter", "Seconds waited before retrying throttled or failed calls"),
+    "autoscale_phase_seconds_total": ("counter", "Seconds spent in each phase of a region"),
+    "autoscale_actions_total": ("counter", "Actions executed per resource type and operation"),
+    "autoscale_wait_seconds": ("histogram", "Seconds waited for a resource to start before it was re-scaled"),
+    "autoscale_resources_total": ("counter", "Resources checked per region"),
+    "autoscale_run_seconds": ("gauge", "Duration of the run"),
+    "autoscale_last_run_timestamp_seconds": ("gauge", "End time of the run"),
+}
+
+
+##########################################################################
+# Histogram
+##########################################################################
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(Buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(Buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+##########################################################################
+# Metrics
+##########################################################################
+class Metrics:
+    """Thread safe collector of the counters and histograms of a run.
+
+    Every metric value is keyed by its name and a tuple of (label, value)
+    pairs. The values can be written as a Prometheus textfile, or converted
+    to the metric data of the OCI Monitoring service.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.gauges = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def increment(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, labels, value):
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    ##########################################################################
+    # Hooks called by the rate limiter, the executor and the waiter
+    ##########################################################################
+    def api_call(self, service, operation, region, seconds, status):
+        self.observe("autoscale_api_call_seconds", {"service": service, "operation": operation, "region": region}, seconds)
+        self.increment("autoscale_api_calls_total", {"service": service, "operation": operation, "region": region, "status": str(status)})
+
+    def backoff(self, service, region, seconds):
+        self.increment("autoscale_api_backoff_seconds_total", {"service": service, "region": region}, seconds)
+
+    def phase(self, region, phase, seconds):
+        self.increment("autoscale_phase_seconds_total", {"region": region, "phase": phase}, seconds)
+
+    def action(self, region, resource_type, operation, ok):
+        self.increment("autoscale_actions_total", {"region": region, "resource_type": resource_type, "operation": operation, "result": "success" if ok else "error"})
+
+    def wait(self, region, resource_type, seconds):
+        self.observe("autoscale_wait_seconds", {"region": region, "resource_type": resource_type}, seconds)
+
+    def finish(self):
+        self.set("autoscale_run_seconds", {}, time.time() - self.started)
+        self.set("autoscale_last_run_timestamp_seconds", {}, time.time())
+
+    ##########################################################################
+    # Prometheus text format, written to a temporary file and renamed, so the
+    # node exporter never reads a partial file
+    ##########################################################################
+    def write_textfile(self, filename):
+        lines = []
+        with self.lock:
+            values = {}
+            for (name, labels), value in list(self.counters.items()) + list(self.gauges.items()):
+                values.setdefault(name, []).append((labels, value))
+            histograms = {}
+            for (name, labels), histogram in self.histograms.items():
+                histograms.setdefault(name, []).append((labels, list(histogram.counts), histogram.sum, histogram.count))
+
+        for name in sorted(set(values) | set(histograms)):
+            metric_type, description = Descriptions.get(name, ("untyped", name))
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, metric_type))
+            for labels, value in sorted(values.get(name, [])):
+                lines.append("{}{} {}".format(name, format_labels(labels), format_value(value)))
+            for labels, counts, total, count in sorted(histograms.get(name, []), key=lambda item: item[0]):
+                cumulative = 0
+                for bound, bucket_count in zip(Buckets, counts):
+                    cumulative += bucket_count
+                    lines.append("{}_bucket{} {}".format(name, format_labels(labels + (("le", format_value(bound)),)), cumulative))
+                lines.append("{}_bucket{} {}".format(name, format_labels(labels + (("le", "+Inf"),)), count))
+                lines.append("{}_sum{} {}".format(name, format_labels(labels), format_value(total)))
+                lines.append("{}_count{} {}".format(name, format_labels(labels), count))
+
+        temporary = "{}.{}.tmp".format(filename, os.getpid())
+        with open(temporary, 'w') as metrics_file:
+            metrics_file.write("\n".join(lines) + "\n")
+        os.replace(temporary, filename)
+
+    ##########################################################################
+    # Metric data for post_metric_data of the OCI Monitoring service
+    # Histograms are sent as their sum and count
+    ##########################################################################
+    def metric_data(self, namespace, compartment_id, dimensions=None):
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        with self.lock:
+            values = [(name, labels, value) for (name, labels), value in list(self.counters.items()) + list(self.gauges.items())]
+            for (name, labels), histogram in self.histograms.items():
+                values.append((name + "_sum", labels, histogram.sum))
+                values.append((name + "_count", labels, histogram.count))
+
+        metric_data = []
+        for name, labels, value in sorted(values, key=lambda item: (item[0], item[1])):
+            metric_dimensions = dict(dimensions or {})
+            metric_dimensions.update((label, label_value) for label, label_value in labels if label_value)
+            metric_data.append(oci.monitoring.models.MetricDataDetails(
+                namespace=namespace,
+                compartment_id=compartment_id,
+                name=name,
+                dimensions=metric_dimensions or {"script": "autoscale"},
+                datapoints=[oci.monitoring.models.Datapoint(timestamp=timestamp, value=float(value))]
+            ))
+        return metric_data
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(label, str(value).replace("\\", "\\\\").replace('"', '\\"')) for label, value in labels) + "}"
+
+
+def format_value(value):
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,173 @@
+import collections
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+# Python 3.12+ profiles with sys.monitoring: one profiler covers all threads and only one can be active,
+# but it keeps one call stack for all threads, so only its call counts and own times are usable
+ProcessWideProfiler = sys.version_info >= (3, 12)
+
+
+##########################################################################
+# Profiler
+##########################################################################
+class Profiler:
+    """Profiles the script in all threads while it runs.
+
+    Every thread gets its own cProfile profiler, the stats of all threads
+    are merged into one cProfile dump. With process_wide, the default on
+    Python 3.12+, one profiler covers all threads and the cumulative time
+    per function is taken from the samples instead. A sampling thread reads
+    the stacks of all threads every interval seconds and records them as
+    slices per thread, with the CPU use of the process, as a Chrome /
+    Perfetto trace.
+    """
+
+    def __init__(self, interval=0.01, max_depth=40, max_events=2000000, process_wide=None):
+        self.interval = interval
+        self.process_wide = ProcessWideProfiler if process_wide is None else process_wide
+        self.max_depth = max_depth
+        self.max_events = max_events
+        self.profiles = []
+        self.lock = threading.Lock()
+        self.events = []
+        self.open_slices = {}  # thread id: [(name, start)] from the outermost frame
+        self.thread_names = {}
+        self.sampled_time = collections.Counter()  # (filename, line, function): seconds on the stack of a thread
+        self.stopped = threading.Event()
+        self.sampler = None
+        self.pid = os.getpid()
+
+    def start(self):
+        self.sampler = threading.Thread(target=self.run, name="profiler", daemon=True)
+        self.sampler.start()
+        if not self.process_wide:
+            threading.setprofile(self.profile_thread)
+        profile = cProfile.Profile()
+        self.profiles.append(profile)
+        profile.enable()
+
+    def profile_thread(self, frame, event, arg):
+        # Called once in every new thread, enabling the profiler replaces this hook
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        try:
+            profile.enable()
+        except Exception:
+            sys.setprofile(None)
+
+    def stop(self):
+        if not self.process_wide:
+            threading.setprofile(None)
+        for profile in self.profiles:
+            profile.disable()
+        self.stopped.set()
+        if self.sampler is not None:
+            self.sampler.join()
+        now = self.timestamp(time.time())
+        for thread_id in list(self.open_slices):
+            self.close_slices(thread_id, 0, now)
+        self.open_slices = {}
+
+    ##########################################################################
+    # Sampling of the stacks of all threads
+    ##########################################################################
+    def run(self):
+        own_id = threading.get_ident()
+        cpu_time = time.process_time()
+        wall_time = time.time()
+        sample_time = wall_time
+        samples = 0
+        while not self.stopped.wait(self.interval):
+            now = time.time()
+            elapsed = now - sample_time
+            sample_time = now
+            for thread in threading.enumerate():
+                if thread.ident is not None and thread.ident not in self.thread_names:
+                    self.thread_names[thread.ident] = thread.name
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id != own_id:
+                    self.sample(thread_id, frame, self.timestamp(now), elapsed)
+            for thread_id in [thread_id for thread_id in self.open_slices if thread_id not in frames]:
+                self.close_slices(thread_id, 0, self.timestamp(now))
+                del self.open_slices[thread_id]
+
+            samples += 1
+            if samples % 10 == 0:
+                cpu_now = time.process_time()
+                cpu_percent = 100.0 * (cpu_now - cpu_time) / max(now - wall_time, 0.000001)
+                self.add_event({"name": "CPU", "ph": "C", "ts": self.timestamp(now), "pid": self.pid,
+                                "args": {"process_cpu_percent": round(cpu_percent, 1), "threads": len(frames) - 1}})
+                cpu_time = cpu_now
+                wall_time = now
+
+    def sample(self, thread_id, frame, now, elapsed):
+        stack = []
+        functions = set()
+        while frame is not None:
+            code = frame.f_code
+            stack.append("{} ({}:{})".format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+            functions.add((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        stack = stack[::-1][:self.max_depth]
+        for function in functions:
+            self.sampled_time[function] += elapsed
+
+        slices = self.open_slices.setdefault(thread_id, [])
+        common = 0
+        while common < len(slices) and common < len(stack) and slices[common][0] == stack[common]:
+            common += 1
+        self.close_slices(thread_id, common, now)
+        for name in stack[common:]:
+            slices.append((name, now))
+
+    def close_slices(self, thread_id, depth, now):
+        slices = self.open_slices.get(thread_id, [])
+        while len(slices) > depth:
+            name, start = slices.pop()
+            self.add_event({"name": name, "ph": "X", "ts": start, "dur": max(now - start, 1), "pid": self.pid, "tid": thread_id, "cat": "sample"})
+
+    def add_event(self, event):
+        if len(self.events) < self.max_events:
+            self.events.append(event)
+
+    def timestamp(self, seconds):
+        return int(seconds * 1000000)
+
+    ##########################################################################
+    # Output
+    ##########################################################################
+    def write_stats(self, filename):
+        with self.lock:
+            profiles = [profile for profile in self.profiles if profile.getstats()]
+        if not profiles:
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(filename)
+
+    def write_chrome_trace(self, filename):
+        events = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "AutoScaleALL"}}]
+        for thread_id, name in self.thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread_id, "args": {"name": name}})
+        with open(filename, 'w') as trace_file:
+            json.dump({"traceEvents": events + self.events, "displayTimeUnit": "ms"}, trace_file)
+
+    def top(self, count=20):
+        if self.process_wide:
+            return sorted(((seconds, function) for function, seconds in self.sampled_time.items()), reverse=True)[:count]
+        with self.lock:
+            profiles = [profile for profile in self.profiles if profile.getstats()]
+        if not profiles:
+            return []
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return sorted(((value[3], key) for key, value in stats.stats.items()), reverse=True)[:count]
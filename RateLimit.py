@@ -0,0 +1,184 @@
+import random
+import threading
+import time
+import oci
+
+RetryStatuses = (429, 500, 502, 503, 504)  # Status codes of failed calls that are retried
+ChangeRetryStatuses = {429: (), 409: ("IncorrectState",)}  # Status and error codes (all when empty) of failed calls that change resources, the request was not executed
+ReadOperations = ("get_", "list_", "search_", "summarize_")  # Prefixes of the operations that can be repeated safely
+SpanKindClient = 3  # OTLP span kind of an outgoing call
+
+
+##########################################################################
+# TokenBucket
+##########################################################################
+class TokenBucket:
+    """Token bucket with an adaptive rate (AIMD).
+
+    Every call takes a token. The rate grows by increase calls per second
+    for every second of calls without throttling and is multiplied by
+    decrease when the service throttles a call.
+    """
+
+    def __init__(self, rate, burst, min_rate, max_rate, increase=1.0, decrease=0.5):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self.lock = threading.Lock()
+        self.throttles = 0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.time()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def succeeded(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def throttled(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0)
+            self.throttles += 1
+
+
+##########################################################################
+# Check if a failed call can be retried. A call that changes a resource
+# (start, stop, scale) may have been executed when it failed with a 5xx
+# or a timeout, so it is only retried when the request was not executed.
+##########################################################################
+def retryable(error, operation=""):
+    read = operation.startswith(ReadOperations)
+    if isinstance(error, oci.exceptions.ServiceError):
+        if read:
+            return error.status in RetryStatuses
+        codes = ChangeRetryStatuses.get(error.status)
+        return codes is not None and (not codes or error.code in codes)
+    if isinstance(error, oci.exceptions.ConnectTimeout):
+        return True
+    return read and isinstance(error, oci.exceptions.RequestException)
+
+
+##########################################################################
+# RateLimiter
+##########################################################################
+class RateLimiter:
+    """Rate limits the calls per service and region.
+
+    A throttled (429) or failed call is retried up to retries times (calls
+    that change resources only when they were not executed), with an
+    exponential backoff starting at delay seconds, with jitter, up to
+    max_delay seconds. log(message) is called when a call is retried.
+    Every attempt is reported to metrics.api_call and every wait before a
+    retry to metrics.backoff, when metrics is given. With a tracer, every
+    call is a span with the number of retries and the HTTP status.
+    """
+
+    def __init__(self, rate=10, burst=10, min_rate=0.5, max_rate=50, retries=6, delay=2, max_delay=60, log=None, metrics=None, tracer=None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.retries = retries
+        self.delay = delay
+        self.max_delay = max_delay
+        self.log = log
+        self.metrics = metrics
+        self.tracer = tracer
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.first_call = None  # Time of the first call, to measure the startup time
+
+    def bucket(self, service, region):
+        with self.lock:
+            key = (service, region)
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(self.rate, self.burst, self.min_rate, self.max_rate)
+            return self.buckets[key]
+
+    def call(self, service, region, function, *args, **kwargs):
+        if self.first_call is None:
+            self.first_call = time.time()
+        operation = getattr(function, "__name__", "call")
+        if self.tracer is None:
+            return self.attempts(service, region, operation, function, args, kwargs)
+        with self.tracer.span("{} {}".format(service, operation), region, kind=SpanKindClient,
+                              attributes={"oci.service": service, "oci.operation": operation, "oci.region": region}) as span:
+            return self.attempts(service, region, operation, function, args, kwargs, span)
+
+    def attempts(self, service, region, operation, function, args, kwargs, span=None):
+        bucket = self.bucket(service, region)
+        attempt = 0
+        while True:
+            bucket.acquire()
+            started = time.time()
+            try:
+                result = function(*args, **kwargs)
+                bucket.succeeded()
+                if self.metrics:
+                    self.metrics.api_call(service, operation, region, time.time() - started, getattr(result, "status", 200))
+                if span:
+                    span.set("retries", attempt)
+                    span.set("http.status_code", getattr(result, "status", 200))
+                return result
+            except Exception as e:
+                if self.metrics:
+                    self.metrics.api_call(service, operation, region, time.time() - started, getattr(e, "status", "error"))
+                if not retryable(e, operation) or attempt >= self.retries:
+                    if span:
+                        span.set("retries", attempt)
+                        span.set("http.status_code", getattr(e, "status", 0))
+                    raise
+                if getattr(e, "status", None) == 429:
+                    bucket.throttled()
+                delay = min(self.max_delay, self.delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if self.log:
+                    self.log("Rate limit kicking in ({} {}).. waiting {:.1f} seconds...".format(service, getattr(e, "status", "error"), delay))
+                if self.metrics:
+                    self.metrics.backoff(service, region, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def throttles(self):
+        with self.lock:
+            return {key: bucket.throttles for key, bucket in self.buckets.items() if bucket.throttles}
+
+
+##########################################################################
+# LimitedClient
+##########################################################################
+class LimitedClient:
+    """Proxy of an OCI service client, every operation goes through the rate limiter.
+
+    The retries are done by the rate limiter, so the retry strategy of the
+    SDK is disabled for the calls.
+    """
+
+    def __init__(self, client, limiter, service, region):
+        self.client = client
+        self.limiter = limiter
+        self.service = service
+        self.region = region
+
+    def __getattr__(self, name):
+        attribute = getattr(self.client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            kwargs["retry_strategy"] = oci.retry.NoneRetryStrategy()
+            return self.limiter.call(self.service, self.region, attribute, *args, **kwargs)
+        return call
@@ -0,0 +1,252 @@
+import collections
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import oci
+from oci._vendor import requests
+from oci._vendor.requests.adapters import BaseAdapter
+from oci._vendor.requests.structures import CaseInsensitiveDict
+
+Version = 1
+
+# Response headers kept in the recording, the SDK reads the paging and work request ids from them
+RecordedHeaders = ("content-type", "etag", "opc-next-page", "opc-prev-page", "opc-total-items", "opc-work-request-id", "retry-after")
+
+# Fields of the responses that are redacted, the script does not use them
+RedactedFields = ("metadata", "extendedMetadata", "sshPublicKeys", "userData", "freeformTags", "email", "adminUsername",
+                  "hostname", "hostLabel", "ipAddress", "ipAddresses", "privateIp", "publicIp", "privateEndpointIp",
+                  "connectionStrings", "connectionUrls")
+
+OcidPattern = re.compile(r"ocid1\.[A-Za-z0-9_.-]*\.([A-Za-z0-9]+)")
+
+
+##########################################################################
+# Replace the unique part of every OCID in a text by a hash, the same OCID
+# always gets the same hash, so the requests of a replay still match
+##########################################################################
+def anonymize(text):
+    def replace(match):
+        if match.group(1).startswith("anon"):
+            return match.group(0)
+        return match.group(0)[:match.start(1) - match.start(0)] + "anon" + hashlib.sha256(match.group(0).encode("utf-8")).hexdigest()[:32]
+    return OcidPattern.sub(replace, text) if text else text
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {key: redacted(item) if key in RedactedFields else redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def redacted(value):
+    # Keep the type, so the SDK can still deserialize the response
+    if isinstance(value, (dict, list)):
+        return type(value)()
+    return "redacted" if isinstance(value, str) else value
+
+
+def body_text(body):
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        return body.decode("utf-8", "replace")
+    return body if isinstance(body, str) else ""
+
+
+def response_text(response):
+    text = response.content.decode("utf-8", "replace") if response.content else ""
+    try:
+        text = json.dumps(redact(json.loads(text)), separators=(",", ":"))
+    except ValueError:
+        pass
+    return anonymize(text)
+
+
+##########################################################################
+# Signer used for a replay, the requests are not signed
+##########################################################################
+class NoSigner(oci.auth.signers.KeyPairSigner):
+    def __init__(self):
+        pass
+
+    def __call__(self, request, enforce_content_headers=True):
+        return request
+
+    def do_request_sign(self, request, enforce_content_headers=True):
+        return request
+
+
+##########################################################################
+# Recorder
+##########################################################################
+class Recorder:
+    """Records the HTTP requests and responses of the OCI service clients.
+
+    The recording is a gzip compressed file with a JSON object per line: a
+    header with the tenancy and time of the run, a line per call and a
+    summary. Signatures and other request headers are not recorded, OCIDs
+    are replaced by a hash and the RedactedFields of the responses removed.
+    """
+
+    def __init__(self, filename, header):
+        self.file = gzip.open(filename, 'wt', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.calls = 0
+        header = dict(header, type="header", version=Version)
+        header["tenancy"] = anonymize(header.get("tenancy", ""))
+        header["arguments"] = [anonymize(argument) for argument in header.get("arguments", [])]
+        self.write(header)
+
+    def adapter(self, adapter):
+        return RecordingAdapter(adapter, self)
+
+    def record(self, request, response, latency, error=None):
+        entry = {
+            "t": round(time.time() - self.started, 3),
+            "latency": round(latency, 4),
+            "method": request.method,
+            "url": anonymize(request.url),
+        }
+        if error is not None:
+            entry["error"] = anonymize("{}: {}".format(type(error).__name__, str(error)))
+        else:
+            entry["status"] = response.status_code
+            entry["headers"] = {name: anonymize(response.headers[name]) for name in RecordedHeaders if name in response.headers}
+            entry["response"] = response_text(response)
+        body = anonymize(body_text(request.body))
+        if body:
+            entry["body"] = body
+        with self.lock:
+            self.calls += 1
+        self.write(entry)
+
+    def write(self, entry):
+        line = json.dumps(entry, separators=(",", ":"))
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line + "\n")
+
+    def close(self, summary):
+        self.write(dict(summary, type="summary", calls=self.calls))
+        with self.lock:
+            self.file.close()
+
+
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, adapter, recorder):
+        super().__init__()
+        self.adapter = adapter
+        self.recorder = recorder
+
+    def send(self, request, **kwargs):
+        started = time.time()
+        try:
+            response = self.adapter.send(request, **kwargs)
+        except Exception as e:
+            # Connection errors and timeouts are recorded too, the replay raises them again
+            self.recorder.record(request, None, time.time() - started, e)
+            raise
+        self.recorder.record(request, response, time.time() - started)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+##########################################################################
+# Replayer
+##########################################################################
+class Replayer:
+    """Answers the HTTP requests of the OCI service clients from a recording.
+
+    A request gets the next recorded response of the same method, URL and
+    body, or when the body differs, of the same method and URL. When all
+    of them were used the last one is repeated. Requests that are not in
+    the recording get a 404. Recorded connection errors and timeouts are
+    raised as a ConnectionError. Every response is delayed by its recorded
+    latency times latency_factor, 0 replays without waiting.
+    """
+
+    def __init__(self, filename, latency_factor=1.0):
+        self.latency_factor = latency_factor
+        self.lock = threading.Lock()
+        self.header = {}
+        self.summary = {}
+        self.by_request = collections.defaultdict(list)
+        self.by_url = collections.defaultdict(list)
+        self.positions = collections.Counter()
+        self.served = 0
+        self.missed = collections.Counter()
+        with gzip.open(filename, 'rt', encoding='utf-8') as recording:
+            for line in recording:
+                entry = json.loads(line)
+                entry_type = entry.get("type")
+                if entry_type == "header":
+                    self.header = entry
+                elif entry_type == "summary":
+                    self.summary = entry
+                else:
+                    self.by_request[(entry["method"], entry["url"], entry.get("body", ""))].append(entry)
+                    self.by_url[(entry["method"], entry["url"])].append(entry)
+        if self.header.get("version") != Version:
+            raise ValueError("{} is not a recording of version {}".format(filename, Version))
+
+    def config(self):
+        return {"tenancy": self.header["tenancy"], "region": self.header["region"]}
+
+    def adapter(self, adapter):
+        return ReplayAdapter(self)
+
+    def find(self, request):
+        url = anonymize(request.url)
+        for key in ((request.method, url, anonymize(body_text(request.body))), (request.method, url)):
+            entries = (self.by_request if len(key) == 3 else self.by_url).get(key)
+            if entries:
+                with self.lock:
+                    position = self.positions[key]
+                    self.positions[key] += 1
+                    self.served += 1
+                return entries[min(position, len(entries) - 1)]
+        with self.lock:
+            self.missed["{} {}".format(request.method, url.split("?")[0])] += 1
+        return None
+
+    def response(self, request):
+        entry = self.find(request)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        if entry is None:
+            response.status_code = 404
+            response.reason = "Not Found"
+            response.headers = CaseInsensitiveDict({"content-type": "application/json"})
+            response._content = json.dumps({"code": "NotRecorded", "message": "Request not in the recording"}).encode("utf-8")
+            return response
+        if self.latency_factor > 0:
+            time.sleep(entry["latency"] * self.latency_factor)
+        if "error" in entry:
+            raise requests.exceptions.ConnectionError(entry["error"], request=request)
+        response.status_code = entry["status"]
+        response.reason = "Recorded"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["response"].encode("utf-8")
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    def __init__(self, replayer):
+        super().__init__()
+        self.replayer = replayer
+
+    def send(self, request, **kwargs):
+        return self.replayer.response(request)
+
+    def close(self):
+        pass
@@ -1,9 +1,24 @@
 # OCI Regions according to:
 # https://docs.oracle.com/en-us/iaas/Content/General/Concepts/regions.htm
 # update 2023-04-16
+#
+# The local time of a region is derived from its time zone at the moment
+# it is needed, so it stays correct when daylight saving time starts or
+# ends while the script is running.
 
-import pytz
+import calendar
 import datetime
+import functools
+import pytz  # Installed with the OCI SDK, zoneinfo needs the system tzdata, which slim containers and Windows lack
+
+
+def get_zone(name):
+    return pytz.timezone(name)
+
+
+def available_zones():
+    return pytz.all_timezones_set
+
 
 # set timezone per region
 timezones = {
@@ -44,40 +59,82 @@ timezones = {
     'us-langley-1': 'America/New_York',
     'us-luke-1': 'America/Phoenix',
     'us-gov-ashburn-1': 'America/New_York',
-    'us-gov-chicago-1': 'America/Chicago',    
+    'us-gov-chicago-1': 'America/Chicago',
     'us-gov-phoenix-1': 'America/Phoenix',
     'uk-gov-london-1': 'Europe/London',
-    'uk-gov-cardiff-1': 'Europe/London'
+    'uk-gov-cardiff-1': 'Europe/London',
+    'ap-chiyoda-1': 'Asia/Tokyo',
+    'ap-ibaraki-1': 'Asia/Tokyo',
+    'ap-dcc-canberra-1': 'Australia/Canberra',
+    'eu-dcc-dublin-1': 'Europe/Dublin',
+    'eu-dcc-dublin-2': 'Europe/Dublin',
+    'eu-dcc-milan-1': 'Europe/Rome',
+    'eu-dcc-milan-2': 'Europe/Rome',
+    'me-dcc-muscat-1': 'Asia/Muscat'
+}
+
+# Time zone used for regions not listed above and without a time zone
+# matching the city in the region name, per area (first part of the name)
+area_timezones = {
+    'af': 'Africa/Johannesburg',
+    'ap': 'Asia/Singapore',
+    'ca': 'America/Toronto',
+    'eu': 'Europe/Berlin',
+    'il': 'Asia/Jerusalem',
+    'me': 'Asia/Dubai',
+    'mx': 'America/Mexico_City',
+    'sa': 'America/Sao_Paulo',
+    'uk': 'Europe/London',
+    'us': 'America/New_York',
 }
 
-RegionTime = []
-
-# Dynamically retrieve offset time to support regions using 'Daylight Saving Time'
-for region, timezone in timezones.items():
-    # set timezone
-    tz = pytz.timezone(timezone)
-
-    # Get the current time in the specified timezone
-    now = datetime.datetime.now(tz)
-
-    # Get UTC offset for the current time in the specified timezone
-    offset = now.utcoffset()
-
-    # Region timezone is later to UTC
-    if offset.days == 0 :       
-        hours, minutes, seconds = map(int, str(offset).split(':'))
-        decimal_time = hours + minutes / 60 + seconds / 3600
-
-        # if offset is an integer (e.g. Franckfurt 2)
-        if decimal_time % 1 == 0:
-            RegionTime.append([region, int(decimal_time)])
-
-        # if offset is a float (e.g. Mumbai 5.5)
-        else:
-            RegionTime.append([region, decimal_time])
-    
-    # Region timezone is prior to UTC
-    else:
-        days, hours, minutes = offset.days, offset.seconds // 3600, offset.seconds // 60 % 60
-        decimal_time = hours - 24
-        RegionTime.append([region, decimal_time])
+
+##########################################################################
+# Get the time zone of a region
+# Regions not in the table are matched on the city in the region name,
+# like ap-singapore-2 to Asia/Singapore, else the area default is used.
+##########################################################################
+@functools.lru_cache(maxsize=None)
+def region_timezone(region):
+    if region in timezones:
+        return get_zone(timezones[region])
+
+    parts = region.split('-')
+    if len(parts) >= 3:
+        city = parts[-2].lower()
+        for name in sorted(available_zones()):
+            if name.split('/')[-1].replace('_', '').lower() == city:
+                return get_zone(name)
+
+    if parts[0] in area_timezones:
+        return get_zone(area_timezones[parts[0]])
+    return datetime.timezone.utc
+
+
+##########################################################################
+# Get the local time of a region for a (naive) UTC time
+##########################################################################
+def local_time(region, utc_time):
+    return utc_time.replace(tzinfo=datetime.timezone.utc).astimezone(region_timezone(region))
+
+
+##########################################################################
+# Calendar of a month, per day of the month (index 0 is not used):
+# (day of week, name of the day, Nth time this weekday occurs in the month)
+##########################################################################
+@functools.lru_cache(maxsize=64)
+def month_calendar(year, month):
+    days = [None]
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        weekday = calendar.weekday(year, month, day)
+        days.append((weekday, calendar.day_name[weekday], (day - 1) // 7 + 1))
+    return tuple(days)
+
+
+##########################################################################
+# Get the day and time values used by the schedule for a given time
+# Returns day of week, name of the day, hour, day of month, Nth weekday, minute
+##########################################################################
+def time_values(current_time):
+    weekday, day_name, nth = month_calendar(current_time.year, current_time.month)[current_time.day]
+    return weekday, day_name, current_time.hour, current_time.day, nth, current_time.minute
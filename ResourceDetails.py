@@ -0,0 +1,232 @@
+import concurrent.futures
+import queue
+import threading
+import oci
+import Tracing
+
+##########################################################################
+# Details call per resource type
+# resource_type: (service client in the region context, get call, id parameter)
+##########################################################################
+DetailCalls = {
+    "Instance": ("compute", "get_instance", "instance_id"),
+    "DbSystem": ("database", "get_db_system", "db_system_id"),
+    "VmCluster": ("database", "get_vm_cluster", "vm_cluster_id"),
+    "CloudVmCluster": ("database", "get_cloud_vm_cluster", "cloud_vm_cluster_id"),
+    "AutonomousDatabase": ("database", "get_autonomous_database", "autonomous_database_id"),
+    "InstancePool": ("pool", "get_instance_pool", "instance_pool_id"),
+    "OdaInstance": ("oda", "get_oda_instance", "oda_instance_id"),
+    "AnalyticsInstance": ("analytics", "get_analytics_instance", "analytics_instance_id"),
+    "IntegrationInstance": ("integration", "get_integration_instance", "integration_instance_id"),
+    "LoadBalancer": ("loadbalancer", "get_load_balancer", "load_balancer_id"),
+    "MysqlDBInstance": ("mysql", "get_db_system", "db_system_id"),
+    "GoldenGateDeployment": ("goldengate", "get_deployment", "deployment_id"),
+    "DISWorkspace": ("dataintegration", "get_workspace", "workspace_id"),
+    "VisualBuilderInstance": ("visualbuilder", "get_vb_instance", "vb_instance_id"),
+}
+
+
+##########################################################################
+# List call per resource type, returning the current state, shape and
+# defined tags of all resources of that type in a compartment
+# resource_type: (service client in the region context, list call)
+##########################################################################
+ListCalls = {
+    "Instance": ("compute", "list_instances"),
+    "DbSystem": ("database", "list_db_systems"),
+    "AutonomousDatabase": ("database", "list_autonomous_databases"),
+    "InstancePool": ("pool", "list_instance_pools"),
+    "MysqlDBInstance": ("mysql", "list_db_systems"),
+    "LoadBalancer": ("loadbalancer", "list_load_balancers"),
+}
+
+
+##########################################################################
+# BulkInventory
+##########################################################################
+class BulkInventory:
+    """Loads resource details with one list call per compartment and resource type.
+
+    Search hits are registered first so the number of hits per group is known.
+    Groups with at least min_group_size hits are listed once, the first lookup
+    in a group does the list call and other lookups wait for its result.
+    """
+
+    def __init__(self, ctx, min_group_size=2):
+        self.ctx = ctx
+        self.min_group_size = min_group_size
+        self.group_size = {}
+        self.groups = {}
+        self.lock = threading.Lock()
+        self.list_calls = 0
+
+    def register(self, resources):
+        with self.lock:
+            for resource in resources:
+                if resource.resource_type in ListCalls:
+                    key = (resource.compartment_id, resource.resource_type)
+                    self.group_size[key] = self.group_size.get(key, 0) + 1
+
+    def list_group(self, key):
+        compartment_id, resource_type = key
+        service, call = ListCalls[resource_type]
+        try:
+            items = oci.pagination.list_call_get_all_results(
+                getattr(getattr(self.ctx, service), call),
+                compartment_id=compartment_id,
+                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY
+            ).data
+            return {item.id: item for item in items}
+        except Exception:
+            return None
+
+    def lookup(self, resource):
+        key = (resource.compartment_id, resource.resource_type)
+        owner = False
+        with self.lock:
+            if self.group_size.get(key, 0) < self.min_group_size:
+                return None
+            future = self.groups.get(key)
+            if future is None:
+                future = concurrent.futures.Future()
+                self.groups[key] = future
+                self.list_calls += 1
+                owner = True
+
+        if owner:
+            future.set_result(self.list_group(key))
+
+        items = future.result()
+        if items is None:
+            return None
+        return items.get(resource.identifier)
+
+
+##########################################################################
+# Fetch the details of a single resource
+# Uses the bulk inventory if available, falls back to the get call
+# Returns None if the resource type is not supported
+##########################################################################
+def get_resource_details(ctx, resource, inventory=None):
+    if resource.resource_type not in DetailCalls:
+        return None
+    if inventory and resource.resource_type in ListCalls:
+        details = inventory.lookup(resource)
+        if details is not None:
+            return details
+    service, call, id_parameter = DetailCalls[resource.resource_type]
+    client = getattr(ctx, service)
+    kwargs = {id_parameter: resource.identifier, "retry_strategy": oci.retry.DEFAULT_RETRY_STRATEGY}
+    return getattr(client, call)(**kwargs).data
+
+
+##########################################################################
+# DetailPrefetcher
+##########################################################################
+class DetailPrefetcher:
+    """Fetches resource details concurrently, with a worker pool per service.
+
+    stream() keeps a bounded number of requests in flight and yields
+    (resource, details, ok, span) tuples in completion order, as soon as
+    each fetch is done. span is the span of the resource, created before
+    its fetch, so the calls of the fetch are its children. It is not
+    finished, the caller finishes it once the resource is handled.
+    """
+
+    def __init__(self, ctx, service_concurrency=None, default_concurrency=4, inventory=None, tracer=None):
+        self.ctx = ctx
+        self.inventory = inventory
+        self.tracer = tracer or Tracing.Tracer()
+        self.service_concurrency = service_concurrency or {}
+        self.default_concurrency = max(1, default_concurrency)
+        self.executors = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def concurrency(self, service):
+        return max(1, self.service_concurrency.get(service, self.default_concurrency))
+
+    def executor(self, service):
+        if service not in self.executors:
+            self.executors[service] = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency(service))
+        return self.executors[service]
+
+    def span(self, resource):
+        return self.tracer.span("resource " + resource.display_name, self.ctx.region, attributes={
+            "oci.resource_type": resource.resource_type, "oci.resource_id": resource.identifier, "oci.resource_name": resource.display_name})
+
+    def fetch(self, resource, span):
+        # The span is only made current in this thread, it stays open after the fetch
+        self.tracer.push(span)
+        try:
+            details = get_resource_details(self.ctx, resource, self.inventory)
+            return resource, details, details is not None, span
+        except Exception:
+            return resource, None, False, span
+        finally:
+            self.tracer.pop(span)
+
+    def stream(self, resources):
+        # The resources are read and submitted by a feeder thread, so a result is yielded as soon as its fetch
+        # is done, also while the next resource is not discovered yet. max_in_flight only limits the fetches.
+        max_in_flight = 2 * (sum(self.service_concurrency.values()) or self.default_concurrency)
+        results = queue.Queue()
+        slots = threading.Semaphore(max_in_flight)
+        stopped = threading.Event()
+        feeder = threading.Thread(target=self.feed, args=(resources, results, slots, stopped), name="prefetch-feeder", daemon=True)
+        feeder.start()
+        received = 0
+        submitted = None
+        try:
+            while submitted is None or received < submitted:
+                fetched, item = results.get()
+                if fetched is None:
+                    if isinstance(item, Exception):
+                        raise item
+                    submitted = item
+                    continue
+                if fetched:
+                    received += 1
+                    slots.release()
+                yield item
+        finally:
+            stopped.set()
+            with self.lock:
+                for future in self.pending:
+                    future.cancel()
+                self.pending = set()
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
+            self.executors = {}
+
+    def feed(self, resources, results, slots, stopped):
+        # Puts (True, result) for every fetch, (False, result) for unsupported resources
+        # and at the end (None, number of fetches) or (None, exception)
+        submitted = 0
+        try:
+            for resource in resources:
+                service = DetailCalls.get(resource.resource_type, ("", None, None))[0]
+                if not service:
+                    results.put((False, (resource, None, False, self.span(resource))))
+                    continue
+
+                while not slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                future = self.executor(service).submit(self.fetch, resource, self.span(resource))
+                with self.lock:
+                    self.pending.add(future)
+                future.add_done_callback(lambda future: self.done(future, results))
+                submitted += 1
+        except Exception as e:
+            results.put((None, e))
+            return
+        results.put((None, submitted))
+
+    def done(self, future, results):
+        with self.lock:
+            self.pending.discard(future)
+        if not future.cancelled():
+            results.put((True, future.result()))
@@ -0,0 +1,77 @@
+import collections
+import functools
+import types
+
+##########################################################################
+# Slot kinds of a compiled schedule
+##########################################################################
+OFF = "off"          # 0, power off
+ON = "on"            # 1, power on
+SIZE = "size"        # any other number, scale to that size
+FLEX = "flex"        # (cpu:memory), resize a flex shape
+IGNORE = "ignore"    # *, leave the resource alone
+INVALID = "invalid"  # anything else
+
+ScheduleCacheSize = 4096  # Number of distinct schedule values kept compiled
+SlotsPerDay = (24, 48, 96)  # Supported number of values in a schedule: per hour, half hour or quarter of an hour
+
+
+##########################################################################
+# A single slot of a schedule
+# kind: one of the slot kinds above, value: the number for OFF/ON/SIZE,
+# cpu/memory: for FLEX, text: the value as written in the tag
+##########################################################################
+Slot = collections.namedtuple("Slot", ["kind", "value", "cpu", "memory", "text"])
+
+
+def compile_slot(text):
+    value = text.strip()
+    if "*" in value:
+        return Slot(IGNORE, None, None, None, text)
+    if value[:1] == "(" and value[-1:] == ")":
+        try:
+            cpu, memory = value[1:-1].split(":")
+            return Slot(FLEX, None, float(cpu), float(memory), text)
+        except ValueError:
+            return Slot(INVALID, None, None, None, text)
+    try:
+        number = int(value)
+    except ValueError:
+        return Slot(INVALID, None, None, None, text)
+    if number == 0:
+        return Slot(OFF, 0, None, None, text)
+    if number == 1:
+        return Slot(ON, 1, None, None, text)
+    return Slot(SIZE, number, None, None, text)
+
+
+##########################################################################
+# Compile a schedule value, like "0,0,1,1,*,(2:16),...  #comment"
+# into a tuple of slots. The comment is dropped. The same value is shared
+# by many resources, so compiled schedules are cached.
+##########################################################################
+@functools.lru_cache(maxsize=ScheduleCacheSize)
+def compile_schedule(schedule):
+    return tuple(compile_slot(text) for text in schedule.split("#")[0].split(","))
+
+
+##########################################################################
+# Index of the slot for a time of the day in a schedule with the given
+# number of slots, like slot 37 for 9:15 in a schedule with 96 slots
+##########################################################################
+def slot_index(slots, hour, minute):
+    per_hour = slots // 24
+    return hour * per_hour + minute * per_hour // 60
+
+
+##########################################################################
+# Compile a DayOfMonth value, like "1:4,3:2,28:5" into a read only
+# mapping of day of the month to the size for that day
+##########################################################################
+@functools.lru_cache(maxsize=ScheduleCacheSize)
+def compile_day_of_month(schedule):
+    days = {}
+    for specificDay in schedule.split(","):
+        day, schedulesize = specificDay.split(":")
+        days[int(day)] = schedulesize
+    return types.MappingProxyType(days)
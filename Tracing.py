@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+import urllib.request
+
+SpanKindInternal = 1
+SpanKindClient = 3
+StatusError = 2
+
+
+##########################################################################
+# Span
+##########################################################################
+class Span:
+    __slots__ = ("tracer", "trace_id", "span_id", "parent_id", "name", "kind", "start", "end", "attributes", "error")
+
+    def __init__(self, tracer, name, parent, kind, attributes):
+        self.tracer = tracer
+        self.trace_id = tracer.trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else ""
+        self.name = name
+        self.kind = kind
+        self.start = int(time.time() * 1000000000)
+        self.end = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.tracer.push(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_value is not None:
+            self.error = "{}: {}".format(exc_type.__name__, str(exc_value))
+        self.tracer.pop(self)
+        self.finish()
+        return False
+
+    def finish(self):
+        if self.end is None:
+            self.end = int(time.time() * 1000000000)
+            self.tracer.finished(self)
+
+    def otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": [otlp_attribute(key, value) for key, value in self.attributes.items()],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error:
+            span["status"] = {"code": StatusError, "message": self.error}
+        return span
+
+
+##########################################################################
+# Span used when tracing is disabled
+##########################################################################
+class DisabledSpan:
+    span_id = ""
+
+    def set(self, key, value):
+        pass
+
+    def finish(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NoSpan = DisabledSpan()
+
+
+##########################################################################
+# Tracer
+##########################################################################
+class Tracer:
+    """Records the spans of a run and exports them as OTLP JSON.
+
+    The parent of a new span is the given parent, else the innermost open
+    span of the thread, else the span registered for the region, else the
+    root span of the run. So SDK calls made from worker threads end up
+    under their region. When tracing is disabled, span() returns NoSpan.
+    """
+
+    def __init__(self, enabled=False, service_name="oci-autoscale"):
+        self.enabled = enabled
+        self.service_name = service_name
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.trace_id = os.urandom(16).hex()
+            self.root = None
+            self.regions = {}
+            self.spans = []
+
+    def span(self, name, region=None, parent=None, kind=SpanKindInternal, attributes=None, register=False, root=False):
+        if not self.enabled:
+            return NoSpan
+        if root:
+            parent = None
+        elif parent is None or parent is NoSpan:
+            parent = self.current(region)
+        span = Span(self, name, parent, kind, attributes)
+        with self.lock:
+            if root:
+                self.root = span
+            if register and region:
+                self.regions[region] = span
+        return span
+
+    def current(self, region=None):
+        stack = getattr(self.local, "stack", None)
+        if stack:
+            return stack[-1]
+        with self.lock:
+            return self.regions.get(region) or self.root
+
+    def push(self, span):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        self.local.stack.append(span)
+
+    def pop(self, span):
+        stack = getattr(self.local, "stack", [])
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def finished(self, span):
+        with self.lock:
+            self.spans.append(span)
+
+    def otlp(self, spans):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "AutoScaleALL"}, "spans": [span.otlp() for span in spans]}],
+        }]}
+
+    ##########################################################################
+    # Export the finished spans to an OTLP/HTTP endpoint (http://...) or
+    # append them to a JSON file, one run per line. Starts a new trace.
+    ##########################################################################
+    def export(self, target, timeout=10):
+        if self.root is not None:
+            self.root.finish()
+        with self.lock:
+            spans = self.spans
+            self.spans = []
+        data = json.dumps(self.otlp(spans))
+        if target.startswith("http://") or target.startswith("https://"):
+            request = urllib.request.Request(target, data=data.encode("utf-8"), headers={"Content-Type": "application/json"})
+            urllib.request.urlopen(request, timeout=timeout).close()
+        else:
+            with open(target, 'a') as trace_file:
+                trace_file.write(data + "\n")
+        self.reset()
+        return len(spans)
+
+
+def otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
@@ -0,0 +1,164 @@
+import threading
+import time
+import oci
+import ResourceDetails
+import Tracing
+
+##########################################################################
+# Work request call per service, used when the mutating call returned a
+# work request id. service: (client in the region context, get call)
+##########################################################################
+WorkRequestCalls = {
+    "database": ("workrequests", "get_work_request"),
+    "pool": ("workrequests", "get_work_request"),
+    "analytics": ("analytics", "get_work_request"),
+}
+WorkRequestFailed = ("FAILED", "CANCELING", "CANCELED")
+
+
+##########################################################################
+# A single pending wait
+##########################################################################
+class Wait:
+    __slots__ = ("action", "deadline", "callback", "interval", "next_poll", "work_request")
+
+    def __init__(self, action, deadline, callback, interval):
+        self.action = action
+        self.deadline = deadline
+        self.callback = callback
+        self.interval = interval
+        self.next_poll = time.time() + interval
+        self.work_request = getattr(action, "work_request_id", None) if action.service in WorkRequestCalls else None
+
+
+##########################################################################
+# LifecycleWaiter
+##########################################################################
+class LifecycleWaiter:
+    """Waits for resources to reach the wait_for state of their action.
+
+    All pending waits of a region are polled by one thread. The poll interval
+    of a wait starts at interval and grows by backoff up to max_interval.
+    A work request is polled when the action returned one, otherwise the
+    lifecycle state: with one list call for compartments with at least
+    min_group_size waits of the same resource type, else with a get call.
+    callback(ok, error) is called from the waiter thread. With a tracer,
+    every poll of a single resource is a span under the span of its action.
+    """
+
+    def __init__(self, ctx, interval=10, backoff=1.5, max_interval=60, min_group_size=2, tracer=None):
+        self.ctx = ctx
+        self.tracer = tracer or Tracing.Tracer()
+        self.interval = interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.min_group_size = min_group_size
+        self.waits = []
+        self.condition = threading.Condition()
+        self.thread = None
+        self.polls = 0
+
+    def add(self, action, deadline, callback):
+        with self.condition:
+            self.waits.append(Wait(action, deadline, callback, self.interval))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                if not self.waits:
+                    self.thread = None
+                    return
+                now = time.time()
+                due = [wait for wait in self.waits if wait.next_poll <= now]
+                if not due:
+                    self.condition.wait(min(wait.next_poll for wait in self.waits) - now)
+                    continue
+
+            finished = self.poll(due)
+
+            with self.condition:
+                now = time.time()
+                for wait in due:
+                    if wait in finished:
+                        continue
+                    if wait.deadline is not None and now > wait.deadline:
+                        finished[wait] = (False, " - Error {} not {} within the time limit, not re-scaled".format(wait.action.resource_name, wait.action.wait_for["state"]))
+                        continue
+                    wait.interval = min(self.max_interval, wait.interval * self.backoff)
+                    wait.next_poll = now + wait.interval
+                self.waits = [wait for wait in self.waits if wait not in finished]
+
+            for wait, (ok, error) in finished.items():
+                try:
+                    wait.callback(ok, error)
+                except Exception:
+                    pass
+
+    def poll(self, due):
+        finished = {}
+        by_state = []
+        for wait in due:
+            if wait.work_request:
+                status = self.work_request_status(wait)
+                if status == "SUCCEEDED":
+                    finished[wait] = (True, "")
+                    continue
+                if status in WorkRequestFailed:
+                    finished[wait] = (False, " - Error work request of {} {}, not re-scaled".format(wait.action.resource_name, status.lower()))
+                    continue
+                if status is not None:
+                    continue
+            by_state.append(wait)
+
+        groups = {}
+        for wait in by_state:
+            key = (wait.action.wait_for.get("compartment_id"), wait.action.resource_type)
+            groups.setdefault(key, []).append(wait)
+
+        for (compartment_id, resource_type), waits in groups.items():
+            states = None
+            if compartment_id and resource_type in ResourceDetails.ListCalls and len(waits) >= self.min_group_size:
+                states = self.list_states(compartment_id, resource_type)
+            for wait in waits:
+                state = states.get(wait.action.resource_id) if states is not None else self.get_state(wait)
+                if state == wait.action.wait_for["state"]:
+                    finished[wait] = (True, "")
+        return finished
+
+    def work_request_status(self, wait):
+        service, call = WorkRequestCalls[wait.action.service]
+        try:
+            self.polls += 1
+            with self.tracer.span("poll work request", self.ctx.region, wait.action.span, attributes={"oci.resource_id": wait.action.resource_id}):
+                return getattr(getattr(self.ctx, service), call)(wait.work_request, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.status
+        except Exception:
+            # Work request can not be read, use the lifecycle state instead
+            wait.work_request = None
+            return None
+
+    def list_states(self, compartment_id, resource_type):
+        service, call = ResourceDetails.ListCalls[resource_type]
+        try:
+            self.polls += 1
+            items = oci.pagination.list_call_get_all_results(
+                getattr(getattr(self.ctx, service), call),
+                compartment_id=compartment_id,
+                retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY
+            ).data
+            return {item.id: item.lifecycle_state for item in items}
+        except Exception:
+            return None
+
+    def get_state(self, wait):
+        wait_for = wait.action.wait_for
+        try:
+            self.polls += 1
+            with self.tracer.span("poll state", self.ctx.region, wait.action.span, attributes={"oci.resource_id": wait.action.resource_id}):
+                return getattr(getattr(self.ctx, wait_for["service"]), wait_for["operation"])(
+                    **wait_for["kwargs"], retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY).data.lifecycle_state
+        except Exception:
+            return None
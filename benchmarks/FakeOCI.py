@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+#################################################################################################################
+# In-process fake OCI backend
+#
+# Simulates the OCI services used by AutoScaleALL.py and runs the script against it, no tenancy or network needed.
+# The tenancy has the given number of resources of all supported types, spread over the regions and compartments,
+# with a schedule that needs an action for a part of them. The backend models the latency of the calls,
+# pagination, throttling (429) and lifecycle transitions like STOPPED -> STARTING -> RUNNING, which take a number
+# of simulated seconds. Simulated time runs -speed times faster than real time.
+#
+# Prints the runtime, the API calls per operation and the peak memory of the run.
+#
+#   -n            - number of resources, spread over the regions (Default 1000)
+#   -regions      - number of regions (Default 1)
+#   -compartments - number of compartments (Default 50)
+#   -changes      - fraction of the resources that need an action (Default 0.1)
+#   -latency      - seconds per API call (Default 0.02)
+#   -throttle     - fraction of the API calls that fail with 429 (Default 0)
+#   -ratelimit    - calls per second per service and region, more calls fail with 429 (Default 0, no limit)
+#   -transition   - simulated seconds a lifecycle transition takes (Default 60)
+#   -speed        - simulated seconds per real second (Default 10)
+#   -seed         - seed of the generated tenancy (Default 1)
+#   -workdir      - directory the script runs in, keeps the inventory between runs (Default a temporary directory)
+#   -output       - write the output of the script to this file (Default discarded)
+#   -json         - print the results as JSON
+#
+# All other options are passed to AutoScaleALL.py, for example:
+#   python3 FakeOCI.py -n 10000 -regions 4 -rp 4
+#################################################################################################################
+import argparse
+import collections
+import datetime
+import functools
+import json
+import os
+import random
+import re
+import runpy
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PackageDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, PackageDir)
+import oci
+import OCIFunctions
+import Regions
+
+TenancyId = "ocid1.tenancy.oc1..benchmark"
+TagNamespace = "Schedule"
+DefaultPageSize = 100  # Items per page of list calls without a limit
+MaxPageSize = 1000
+ItemLatency = 0.00002  # Seconds added to the latency of a call per returned item
+
+##########################################################################
+# Resource types, resource_type: (running state, stopped state, capacity, share)
+# The stopped state is None for resources that can only be scaled, the
+# capacity None for resources that can only be started and stopped
+##########################################################################
+ResourceTypes = {
+    "Instance": ("RUNNING", "STOPPED", None, 50),
+    "DbSystem": ("AVAILABLE", "STOPPED", None, 5),  # State of its single DB node
+    "VmCluster": ("AVAILABLE", None, 4, 2),
+    "CloudVmCluster": ("AVAILABLE", None, 4, 2),
+    "AutonomousDatabase": ("AVAILABLE", "STOPPED", 2, 10),
+    "InstancePool": ("RUNNING", "STOPPED", 2, 5),
+    "OdaInstance": ("ACTIVE", "INACTIVE", None, 2),
+    "AnalyticsInstance": ("ACTIVE", "INACTIVE", 4, 3),
+    "IntegrationInstance": ("ACTIVE", "INACTIVE", None, 3),
+    "LoadBalancer": ("ACTIVE", None, 100, 5),
+    "MysqlDBInstance": ("ACTIVE", "INACTIVE", None, 5),
+    "GoldenGateDeployment": ("ACTIVE", "INACTIVE", None, 3),
+    "DISWorkspace": ("ACTIVE", "STOPPED", None, 2),
+    "VisualBuilderInstance": ("ACTIVE", "INACTIVE", None, 3),
+}
+SearchTypes = {resource_type.lower(): resource_type for resource_type in ResourceTypes if resource_type != "MysqlDBInstance"}
+
+##########################################################################
+# Operations per client class, operation: (kind, resource type, id parameter)
+##########################################################################
+Operations = {
+    "ComputeClient": {
+        "get_instance": ("get", "Instance", "instance_id"),
+        "list_instances": ("list", "Instance", None),
+        "instance_action": ("action", "Instance", "instance_id"),
+        "update_instance": ("update", "Instance", "instance_id"),
+    },
+    "DatabaseClient": {
+        "get_db_system": ("get", "DbSystem", "db_system_id"),
+        "list_db_systems": ("list", "DbSystem", None),
+        "list_db_nodes": ("nodes", "DbSystem", "db_system_id"),
+        "db_node_action": ("action", "DbSystem", "db_node_id"),
+        "update_db_system": ("update", "DbSystem", "db_system_id"),
+        "get_vm_cluster": ("get", "VmCluster", "vm_cluster_id"),
+        "update_vm_cluster": ("update", "VmCluster", "vm_cluster_id"),
+        "get_cloud_vm_cluster": ("get", "CloudVmCluster", "cloud_vm_cluster_id"),
+        "update_cloud_vm_cluster": ("update", "CloudVmCluster", "cloud_vm_cluster_id"),
+        "get_autonomous_database": ("get", "AutonomousDatabase", "autonomous_database_id"),
+        "list_autonomous_databases": ("list", "AutonomousDatabase", None),
+        "start_autonomous_database": ("start", "AutonomousDatabase", "autonomous_database_id"),
+        "stop_autonomous_database": ("stop", "AutonomousDatabase", "autonomous_database_id"),
+        "update_autonomous_database": ("update", "AutonomousDatabase", "autonomous_database_id"),
+    },
+    "ComputeManagementClient": {
+        "get_instance_pool": ("get", "InstancePool", "instance_pool_id"),
+        "list_instance_pools": ("list", "InstancePool", None),
+        "start_instance_pool": ("start", "InstancePool", "instance_pool_id"),
+        "stop_instance_pool": ("stop", "InstancePool", "instance_pool_id"),
+        "update_instance_pool": ("update", "InstancePool", "instance_pool_id"),
+    },
+    "OdaClient": {
+        "get_oda_instance": ("get", "OdaInstance", "oda_instance_id"),
+        "start_oda_instance": ("start", "OdaInstance", "oda_instance_id"),
+        "stop_oda_instance": ("stop", "OdaInstance", "oda_instance_id"),
+    },
+    "AnalyticsClient": {
+        "get_analytics_instance": ("get", "AnalyticsInstance", "analytics_instance_id"),
+        "start_analytics_instance": ("start", "AnalyticsInstance", "analytics_instance_id"),
+        "stop_analytics_instance": ("stop", "AnalyticsInstance", "analytics_instance_id"),
+        "scale_analytics_instance": ("update", "AnalyticsInstance", "analytics_instance_id"),
+        "get_work_request": ("work_request", None, "work_request_id"),
+    },
+    "IntegrationInstanceClient": {
+        "get_integration_instance": ("get", "IntegrationInstance", "integration_instance_id"),
+        "start_integration_instance": ("start", "IntegrationInstance", "integration_instance_id"),
+        "stop_integration_instance": ("stop", "IntegrationInstance", "integration_instance_id"),
+    },
+    "LoadBalancerClient": {
+        "get_load_balancer": ("get", "LoadBalancer", "load_balancer_id"),
+        "list_load_balancers": ("list", "LoadBalancer", None),
+        "update_load_balancer_shape": ("update", "LoadBalancer", "load_balancer_id"),
+    },
+    "DbSystemClient": {
+        "get_db_system": ("get", "MysqlDBInstance", "db_system_id"),
+        "list_db_systems": ("list", "MysqlDBInstance", None),
+        "start_db_system": ("start", "MysqlDBInstance", "db_system_id"),
+        "stop_db_system": ("stop", "MysqlDBInstance", "db_system_id"),
+    },
+    "GoldenGateClient": {
+        "get_deployment": ("get", "GoldenGateDeployment", "deployment_id"),
+        "start_deployment": ("start", "GoldenGateDeployment", "deployment_id"),
+        "stop_deployment": ("stop", "GoldenGateDeployment", "deployment_id"),
+    },
+    "DataIntegrationClient": {
+        "get_workspace": ("get", "DISWorkspace", "workspace_id"),
+        "start_workspace": ("start", "DISWorkspace", "workspace_id"),
+        "stop_workspace": ("stop", "DISWorkspace", "workspace_id"),
+    },
+    "VbInstanceClient": {
+        "get_vb_instance": ("get", "VisualBuilderInstance", "vb_instance_id"),
+        "start_vb_instance": ("start", "VisualBuilderInstance", "vb_instance_id"),
+        "stop_vb_instance": ("stop", "VisualBuilderInstance", "vb_instance_id"),
+    },
+    "WorkRequestClient": {
+        "get_work_request": ("work_request", None, "work_request_id"),
+    },
+    "ResourceSearchClient": {
+        "search_resources": ("search", None, None),
+    },
+    "IdentityClient": {
+        "get_tenancy": ("tenancy", None, None),
+        "list_region_subscriptions": ("regions", None, None),
+        "list_compartments": ("compartments", None, None),
+    },
+    "NotificationDataPlaneClient": {
+        "publish_message": ("accept", None, None),
+    },
+    "LoggingClient": {
+        "put_logs": ("accept", None, None),
+    },
+    "MonitoringClient": {
+        "post_metric_data": ("accept", None, None),
+    },
+}
+
+# SDK module of every client class
+ClientModules = {
+    "ComputeClient": "core", "DatabaseClient": "database", "ComputeManagementClient": "core", "OdaClient": "oda",
+    "AnalyticsClient": "analytics", "IntegrationInstanceClient": "integration", "LoadBalancerClient": "load_balancer",
+    "DbSystemClient": "mysql", "GoldenGateClient": "golden_gate", "DataIntegrationClient": "data_integration",
+    "VbInstanceClient": "visual_builder", "WorkRequestClient": "work_requests", "ResourceSearchClient": "resource_search",
+    "IdentityClient": "identity", "NotificationDataPlaneClient": "ons", "LoggingClient": "loggingingestion",
+    "MonitoringClient": "monitoring",
+}
+
+# Mutating calls of these clients return a work request
+WorkRequestClients = ("DatabaseClient", "ComputeManagementClient", "AnalyticsClient")
+
+
+##########################################################################
+# Simulated time
+##########################################################################
+class Clock:
+    def __init__(self, speed=10):
+        self.speed = speed
+        self.started = time.time()
+
+    def now(self):
+        return (time.time() - self.started) * self.speed
+
+
+##########################################################################
+# A simulated resource
+##########################################################################
+class Resource:
+    __slots__ = ("id", "resource_type", "region", "compartment_id", "name", "state", "capacity", "schedule", "time_created",
+                 "target_state", "target_capacity", "ready_at")
+
+    def __init__(self, id, resource_type, region, compartment_id, name, state, capacity, schedule, time_created):
+        self.id = id
+        self.resource_type = resource_type
+        self.region = region
+        self.compartment_id = compartment_id
+        self.name = name
+        self.state = state
+        self.capacity = capacity
+        self.schedule = schedule
+        self.time_created = time_created
+        self.target_state = None
+        self.target_capacity = None
+        self.ready_at = None
+
+    def refresh(self, now):
+        if self.ready_at is not None and now >= self.ready_at:
+            self.state = self.target_state
+            if self.target_capacity is not None:
+                self.capacity = self.target_capacity
+            self.ready_at = None
+
+    def defined_tags(self):
+        if self.schedule is None:
+            return {"Operations": {"CostCenter": "42"}}
+        return {TagNamespace: {"AnyDay": self.schedule}}
+
+
+##########################################################################
+# Backend
+##########################################################################
+class Backend:
+    """The simulated tenancy and the services around it.
+
+    Every call of a fake client goes through call(), which counts it,
+    injects throttling, applies the latency and returns an SDK Response
+    with the same models and paging headers as the real services.
+    """
+
+    def __init__(self, resources=1000, regions=1, compartments=50, changes=0.1, latency=0.02, throttle=0.0, rate_limit=0,
+                 transition=60, speed=10, seed=1):
+        self.latency = latency
+        self.throttle = throttle
+        self.rate_limit = rate_limit
+        self.transition = transition
+        self.clock = Clock(speed)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = collections.Counter()
+        self.throttled = 0
+        self.mutations = 0
+        self.windows = {}
+        self.work_requests = {}
+        self.search_results = {}
+
+        self.regions = list(Regions.timezones)[:max(1, regions)]
+        self.compartments = self.create_compartments(max(1, compartments))
+        self.resources = {}
+        self.db_nodes = {}
+        self.by_group = collections.defaultdict(list)  # (region, compartment, resource type): [resource]
+        self.by_type = collections.defaultdict(list)  # (region, resource type): [resource]
+        self.create_resources(resources, changes)
+
+    ##########################################################################
+    # Generated tenancy
+    ##########################################################################
+    def create_compartments(self, count):
+        top_level = max(1, int(count ** 0.5))
+        compartments = []
+        for index in range(count):
+            parent = TenancyId if index < top_level else compartments[self.random.randrange(top_level)][0]
+            compartments.append(("ocid1.compartment.oc1..benchmark{:06d}".format(index), "compartment{}".format(index), parent))
+        return compartments
+
+    def create_resources(self, count, changes):
+        types = list(ResourceTypes)
+        weights = [ResourceTypes[resource_type][3] for resource_type in types]
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for index in range(count):
+            resource_type = self.random.choices(types, weights)[0]
+            running_state, stopped_state, capacity, share = ResourceTypes[resource_type]
+            region = self.regions[index % len(self.regions)]
+            state = stopped_state if stopped_state and self.random.random() < 0.3 else running_state
+            item = Resource("ocid1.{}.oc1.{}.benchmark{:07d}".format(resource_type.lower(), region, index), resource_type, region,
+                            self.random.choice(self.compartments)[0], "{}-{}".format(resource_type.lower(), index), state, capacity, None,
+                            now - datetime.timedelta(days=self.random.randint(1, 365)))
+            # One in five resources has no schedule, it is only returned by list calls,
+            # one in ten is ignored all day
+            chance = self.random.random()
+            if chance >= 0.3:
+                value = self.schedule_value(item, self.random.random() < changes)
+                item.schedule = ",".join([str(value)] * 24)
+            elif chance >= 0.2:
+                item.schedule = ",".join(["*"] * 24)
+            self.resources[item.id] = item
+            self.by_group[(region, item.compartment_id, resource_type)].append(item)
+            self.by_type[(region, resource_type)].append(item)
+            if resource_type == "DbSystem":
+                self.db_nodes[item.id + ".node"] = item
+
+    def schedule_value(self, item, change):
+        running_state, stopped_state, capacity, share = ResourceTypes[item.resource_type]
+        running = item.state == running_state
+        if stopped_state is None:
+            return capacity * 2 if change else capacity
+        if capacity is None:
+            return int(running != change)
+        if running:
+            return self.random.choice([0, capacity * 2]) if change else capacity
+        return self.random.choice([capacity, capacity * 2]) if change else 0
+
+    ##########################################################################
+    # Calls of the fake clients
+    ##########################################################################
+    def call(self, client_class, region, operation, args, kwargs):
+        kind, resource_type, id_parameter = Operations[client_class][operation]
+        with self.lock:
+            self.calls[(client_class, operation)] += 1
+            throttled = self.throttle and self.random.random() < self.throttle
+            if self.rate_limit:
+                second = int(time.time())
+                window = self.windows.get((client_class, region))
+                if window is None or window[0] != second:
+                    window = [second, 0]
+                    self.windows[(client_class, region)] = window
+                window[1] += 1
+                throttled = throttled or window[1] > self.rate_limit
+            if throttled:
+                self.throttled += 1
+
+        if throttled:
+            self.sleep(0)
+            raise oci.exceptions.ServiceError(429, "TooManyRequests", {}, "Too many requests for the tenant")
+
+        identifier = kwargs.get(id_parameter, args[0] if args else None) if id_parameter else None
+        data, headers, items = getattr(self, "call_" + kind)(client_class, region, resource_type, identifier, args, kwargs)
+        self.sleep(items, "{} {} {} {} {}".format(region, operation, identifier, kwargs.get("compartment_id"), kwargs.get("page")))
+        return oci.response.Response(200, headers, data, None)
+
+    def sleep(self, items, key=""):
+        # The latency varies per call, but is the same for the same call in every run
+        if self.latency:
+            time.sleep(self.latency * (0.5 + zlib.crc32(key.encode("utf-8")) % 1000 / 1000.0) + ItemLatency * items)
+
+    def find(self, identifier, resource_type):
+        item = self.db_nodes.get(identifier) if resource_type == "DbSystem" and identifier and identifier.endswith(".node") else self.resources.get(identifier)
+        if item is None or item.resource_type != resource_type:
+            raise oci.exceptions.ServiceError(404, "NotAuthorizedOrNotFound", {}, "Authorization failed or requested resource not found")
+        item.refresh(self.clock.now())
+        return item
+
+    def page(self, items, kwargs):
+        start = int(kwargs.get("page") or 0)
+        limit = min(MaxPageSize, kwargs.get("limit") or DefaultPageSize)
+        headers = {"opc-request-id": "benchmark"}
+        if start + limit < len(items):
+            headers["opc-next-page"] = str(start + limit)
+        return items[start:start + limit], headers
+
+    def call_get(self, client_class, region, resource_type, identifier, args, kwargs):
+        return model(self.find(identifier, resource_type)), {"etag": "1"}, 1
+
+    def call_list(self, client_class, region, resource_type, identifier, args, kwargs):
+        now = self.clock.now()
+        items, headers = self.page(self.by_group.get((region, kwargs.get("compartment_id"), resource_type), []), kwargs)
+        for item in items:
+            item.refresh(now)
+        return [model(item) for item in items], headers, len(items)
+
+    def call_nodes(self, client_class, region, resource_type, identifier, args, kwargs):
+        item = self.find(identifier, resource_type)
+        return [oci.database.models.DbNodeSummary(id=item.id + ".node", db_system_id=item.id, lifecycle_state=item.state, hostname=item.name)], {}, 1
+
+    def call_search(self, client_class, region, resource_type, identifier, args, kwargs):
+        query = args[0].query if args else kwargs["search_details"].query
+        key = (region, query)
+        with self.lock:
+            if key not in self.search_results:
+                self.search_results[key] = self.search(region, query)
+        items, headers = self.page(self.search_results[key], kwargs)
+        return oci.resource_search.models.ResourceSummaryCollection(items=[summary(item) for item in items]), headers, len(items)
+
+    def search(self, region, query):
+        types, namespace, created_after, include, exclude = parse_query(query)
+        found = []
+        for resource_type in types:
+            for item in self.by_type.get((region, resource_type), []):
+                if namespace and (item.schedule is None or namespace != TagNamespace):
+                    continue
+                if created_after and item.time_created < created_after:
+                    continue
+                if (include and item.compartment_id not in include) or item.compartment_id in exclude:
+                    continue
+                found.append(item)
+        return found
+
+    def call_start(self, client_class, region, resource_type, identifier, args, kwargs):
+        running_state, stopped_state, capacity, share = ResourceTypes[resource_type]
+        return self.transition_to(client_class, self.find(identifier, resource_type), stopped_state, "STARTING", running_state)
+
+    def call_stop(self, client_class, region, resource_type, identifier, args, kwargs):
+        running_state, stopped_state, capacity, share = ResourceTypes[resource_type]
+        return self.transition_to(client_class, self.find(identifier, resource_type), running_state, "STOPPING", stopped_state)
+
+    def call_action(self, client_class, region, resource_type, identifier, args, kwargs):
+        if kwargs.get("action") == "START":
+            data, headers, items = self.call_start(client_class, region, resource_type, identifier, args, kwargs)
+        else:
+            data, headers, items = self.call_stop(client_class, region, resource_type, identifier, args, kwargs)
+        item = self.find(identifier, resource_type)
+        if resource_type == "DbSystem":
+            data = oci.database.models.DbNode(id=identifier, db_system_id=item.id, lifecycle_state=item.state, hostname=item.name)
+        return data, headers, items
+
+    def call_update(self, client_class, region, resource_type, identifier, args, kwargs):
+        item = self.find(identifier, resource_type)
+        running_state = ResourceTypes[resource_type][0]
+        details = [value for key, value in kwargs.items() if key.endswith("_details")]
+        return self.transition_to(client_class, item, running_state, "UPDATING", running_state, requested_capacity(details[0]) if details else None)
+
+    def transition_to(self, client_class, item, from_state, transition_state, to_state, capacity=None):
+        with self.lock:
+            self.mutations += 1
+            item.refresh(self.clock.now())
+            if item.state != from_state:
+                raise oci.exceptions.ServiceError(409, "IncorrectState", {}, "Resource {} is in state {}".format(item.name, item.state))
+            item.state = transition_state
+            item.target_state = to_state
+            item.target_capacity = capacity
+            item.ready_at = self.clock.now() + self.transition * self.random.uniform(0.5, 1.5)
+            headers = {"opc-request-id": "benchmark"}
+            if client_class in WorkRequestClients:
+                work_request_id = "ocid1.workrequest.oc1..benchmark{:07d}".format(len(self.work_requests))
+                self.work_requests[work_request_id] = item.ready_at
+                headers["opc-work-request-id"] = work_request_id
+        return model(item), headers, 1
+
+    def call_work_request(self, client_class, region, resource_type, identifier, args, kwargs):
+        ready_at = self.work_requests.get(identifier)
+        if ready_at is None:
+            raise oci.exceptions.ServiceError(404, "NotAuthorizedOrNotFound", {}, "Work request not found")
+        status = "SUCCEEDED" if self.clock.now() >= ready_at else "IN_PROGRESS"
+        if client_class == "AnalyticsClient":
+            return oci.analytics.models.WorkRequest(id=identifier, status=status), {}, 1
+        return oci.work_requests.models.WorkRequest(id=identifier, status=status), {}, 1
+
+    def call_tenancy(self, client_class, region, resource_type, identifier, args, kwargs):
+        return oci.identity.models.Tenancy(id=TenancyId, name="benchmark", home_region_key="FRA"), {}, 1
+
+    def call_regions(self, client_class, region, resource_type, identifier, args, kwargs):
+        return [oci.identity.models.RegionSubscription(region_name=name, region_key=name[:3].upper(), is_home_region=index == 0, status="READY")
+                for index, name in enumerate(self.regions)], {}, len(self.regions)
+
+    def call_compartments(self, client_class, region, resource_type, identifier, args, kwargs):
+        items, headers = self.page(self.compartments, kwargs)
+        return [oci.identity.models.Compartment(id=id, name=name, compartment_id=parent, lifecycle_state="ACTIVE")
+                for id, name, parent in items], headers, len(items)
+
+    def call_accept(self, client_class, region, resource_type, identifier, args, kwargs):
+        return None, {"opc-request-id": "benchmark"}, 0
+
+    ##########################################################################
+    # Results
+    ##########################################################################
+    def states(self):
+        counts = collections.Counter()
+        now = self.clock.now()
+        for item in self.resources.values():
+            item.refresh(now)
+            counts[item.state] += 1
+        return dict(counts)
+
+
+##########################################################################
+# Parse a structured search query of the script
+# Returns (resource types, tag namespace, created after, include, exclude)
+##########################################################################
+@functools.lru_cache(maxsize=1024)
+def parse_query(query):
+    types = [SearchTypes[name.strip()] for name in re.match(r"query (.+?) resources", query).group(1).split(",") if name.strip() in SearchTypes]
+    namespace = re.search(r"definedTags\.namespace = '([^']+)'", query)
+    created_after = re.search(r"timeCreated >= '([^']+)'", query)
+    if created_after:
+        created_after = datetime.datetime.strptime(created_after.group(1), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=datetime.timezone.utc)
+    include = set(re.findall(r"compartmentId\s+= '([^']+)'", query))
+    exclude = set(re.findall(r"compartmentId != '([^']+)'", query))
+    return types, namespace.group(1) if namespace else None, created_after, include, exclude
+
+
+##########################################################################
+# Capacity requested by the details of an update call
+##########################################################################
+def requested_capacity(details):
+    for attribute in ("compute_count", "cpu_core_count", "size"):
+        if getattr(details, attribute, None):
+            return int(getattr(details, attribute))
+    if getattr(details, "capacity", None):
+        return details.capacity.capacity_value
+    if getattr(details, "shape_details", None):
+        return details.shape_details.maximum_bandwidth_in_mbps
+    return None
+
+
+##########################################################################
+# SDK models of a resource
+##########################################################################
+def summary(item):
+    return oci.resource_search.models.ResourceSummary(
+        identifier=item.id, resource_type=item.resource_type, display_name=item.name, compartment_id=item.compartment_id,
+        lifecycle_state=item.state, defined_tags=item.defined_tags(), freeform_tags={}, time_created=item.time_created,
+        availability_domain="AD-1")
+
+
+def model(item):
+    common = {"id": item.id, "compartment_id": item.compartment_id, "display_name": item.name, "lifecycle_state": item.state,
+              "defined_tags": item.defined_tags(), "freeform_tags": {}, "time_created": item.time_created}
+    resource_type = item.resource_type
+    if resource_type == "Instance":
+        return oci.core.models.Instance(shape="VM.Standard.E4.Flex", availability_domain="AD-1", region=item.region,
+                                        shape_config=oci.core.models.InstanceShapeConfig(ocpus=1.0, memory_in_gbs=16.0), **common)
+    if resource_type == "DbSystem":
+        common["lifecycle_state"] = "AVAILABLE"
+        return oci.database.models.DbSystem(shape="VM.Standard2.2", cpu_core_count=2, availability_domain="AD-1", **common)
+    if resource_type == "VmCluster":
+        return oci.database.models.VmCluster(cpus_enabled=item.capacity, **common)
+    if resource_type == "CloudVmCluster":
+        return oci.database.models.CloudVmCluster(cpu_core_count=item.capacity, **common)
+    if resource_type == "AutonomousDatabase":
+        return oci.database.models.AutonomousDatabase(compute_model="ECPU", compute_count=float(item.capacity), cpu_core_count=0, **common)
+    if resource_type == "InstancePool":
+        return oci.core.models.InstancePool(size=item.capacity, **common)
+    if resource_type == "OdaInstance":
+        return oci.oda.models.OdaInstance(**common)
+    if resource_type == "AnalyticsInstance":
+        common["name"] = common.pop("display_name")
+        return oci.analytics.models.AnalyticsInstance(capacity=oci.analytics.models.Capacity(capacity_type="OLPU_COUNT", capacity_value=item.capacity), **common)
+    if resource_type == "IntegrationInstance":
+        return oci.integration.models.IntegrationInstance(**common)
+    if resource_type == "LoadBalancer":
+        return oci.load_balancer.models.LoadBalancer(shape_name="flexible", shape_details=oci.load_balancer.models.ShapeDetails(
+            minimum_bandwidth_in_mbps=10, maximum_bandwidth_in_mbps=item.capacity), **common)
+    if resource_type == "MysqlDBInstance":
+        return oci.mysql.models.DbSystem(availability_domain="AD-1", **common)
+    if resource_type == "GoldenGateDeployment":
+        return oci.golden_gate.models.Deployment(**common)
+    if resource_type == "DISWorkspace":
+        return oci.data_integration.models.Workspace(**common)
+    if resource_type == "VisualBuilderInstance":
+        return oci.visual_builder.models.VbInstance(**common)
+    raise ValueError(resource_type)
+
+
+##########################################################################
+# Fake service client, the operations of its class call the backend
+##########################################################################
+class FakeClient:
+    backend = None
+    client_class = None
+
+    def __init__(self, config, **kwargs):
+        self.region = config.get("region")
+
+    def __getattr__(self, name):
+        if name not in Operations.get(self.client_class, {}):
+            raise AttributeError("{} has no operation {}".format(self.client_class, name))
+
+        def call(*args, **kwargs):
+            kwargs.pop("retry_strategy", None)
+            return self.backend.call(self.client_class, self.region, name, args, kwargs)
+        call.__name__ = name
+        return call
+
+
+##########################################################################
+# Replace the service clients of the SDK and the signer by the fakes
+##########################################################################
+def install(backend):
+    for client_class, module in ClientModules.items():
+        setattr(getattr(oci, module), client_class, type(client_class, (FakeClient,), {"backend": backend, "client_class": client_class}))
+    OCIFunctions.create_signer = lambda *args: ({"tenancy": TenancyId, "region": backend.regions[0]}, None)
+
+
+##########################################################################
+# Run AutoScaleALL.py in this process, from a copy in the work directory
+# so its inventory and MySQL cache are kept there
+##########################################################################
+def run_script(arguments, workdir, output=None):
+    script = os.path.join(workdir, "AutoScaleALL.py")
+    shutil.copy(os.path.join(PackageDir, "AutoScaleALL.py"), script)
+    argv, stdout = sys.argv, sys.stdout
+    sys.argv = [script] + arguments
+    sys.stdout = open(output, 'a') if output else open(os.devnull, 'w')
+    started = time.time()
+    error = None
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code:
+            error = "exit {}".format(e.code)
+    except Exception as e:
+        error = "{}: {}".format(type(e).__name__, str(e))
+    finally:
+        runtime = time.time() - started
+        sys.stdout.close()
+        sys.argv, sys.stdout = argv, stdout
+    return runtime, error
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(allow_abbrev=False)
+    parser.add_argument('-n', default=1000, type=int, dest='resources', help='Number of resources, spread over the regions')
+    parser.add_argument('-regions', default=1, type=int, dest='regions', help='Number of regions')
+    parser.add_argument('-compartments', default=50, type=int, dest='compartments', help='Number of compartments')
+    parser.add_argument('-changes', default=0.1, type=float, dest='changes', help='Fraction of the resources that need an action')
+    parser.add_argument('-latency', default=0.02, type=float, dest='latency', help='Seconds per API call')
+    parser.add_argument('-throttle', default=0.0, type=float, dest='throttle', help='Fraction of the API calls that fail with 429')
+    parser.add_argument('-ratelimit', default=0, type=int, dest='rate_limit', help='Calls per second per service and region, more calls fail with 429')
+    parser.add_argument('-transition', default=60, type=float, dest='transition', help='Simulated seconds a lifecycle transition takes')
+    parser.add_argument('-speed', default=10, type=float, dest='speed', help='Simulated seconds per real second')
+    parser.add_argument('-seed', default=1, type=int, dest='seed', help='Seed of the generated tenancy')
+    parser.add_argument('-workdir', default="", dest='workdir', help='Directory the script runs in, Default a temporary directory')
+    parser.add_argument('-output', default="", dest='output', help='Write the output of the script to this file')
+    parser.add_argument('-json', action='store_true', default=False, dest='json', help='Print the results as JSON')
+    cmd, script_arguments = parser.parse_known_args()
+    if script_arguments[:1] == ["--"]:
+        script_arguments = script_arguments[1:]
+
+    backend = Backend(cmd.resources, cmd.regions, cmd.compartments, cmd.changes, cmd.latency, cmd.throttle, cmd.rate_limit,
+                      cmd.transition, cmd.speed, cmd.seed)
+    install(backend)
+    backend_memory = peak_memory_mb()
+
+    workdir = cmd.workdir or tempfile.mkdtemp(prefix="autoscale-benchmark-")
+    try:
+        runtime, error = run_script(script_arguments, workdir, os.path.abspath(cmd.output) if cmd.output else None)
+    finally:
+        if not cmd.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "resources": cmd.resources,
+        "regions": cmd.regions,
+        "arguments": script_arguments,
+        "runtime_seconds": round(runtime, 3),
+        "api_calls": sum(backend.calls.values()),
+        "throttled": backend.throttled,
+        "mutations": backend.mutations,
+        "peak_memory_mb": peak_memory_mb(),
+        "backend_memory_mb": backend_memory,
+        "calls": {"{}.{}".format(client_class, operation): count for (client_class, operation), count in sorted(backend.calls.items())},
+        "states": backend.states(),
+        "error": error,
+    }
+    if cmd.json:
+        print(json.dumps(results))
+    else:
+        print("Resources      : {} in {} regions".format(cmd.resources, cmd.regions))
+        print("Runtime        : {:.2f}s".format(results["runtime_seconds"]))
+        print("API calls      : {} ({} throttled, {} changes)".format(results["api_calls"], results["throttled"], results["mutations"]))
+        print("Peak memory    : {} MB ({} MB before the run)".format(results["peak_memory_mb"], results["backend_memory_mb"]))
+        for name, count in results["calls"].items():
+            print("   {:8d} {}".format(count, name))
+        print("States         : {}".format(", ".join("{} {}".format(state, count) for state, count in sorted(results["states"].items()))))
+        if error:
+            print("Error          : {}".format(error))
+    sys.exit(1 if error else 0)
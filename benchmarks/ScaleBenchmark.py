@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#################################################################################################################
+# Scale benchmark
+#
+# Runs the full AutoScaleALL.py flow against the fake OCI backend of FakeOCI.py for every combination of the
+# number of resources and regions, each in its own process, and reports the runtime, the API calls and the peak
+# memory. With -o the results are saved, with -baseline they are compared with saved results, so regressions show
+# up without a tenancy.
+#
+#   -sizes     - comma separated numbers of resources (Default 1000,10000,100000)
+#   -regions   - comma separated numbers of regions, the regions are processed in parallel (Default 1,4)
+#   -latency   - seconds per API call (Default 0.02)
+#   -throttle  - fraction of the API calls that fail with 429 (Default 0)
+#   -o         - write the results as JSON to this file
+#   -baseline  - compare with the results in this JSON file, written with -o by an earlier run
+#   -tolerance - percentage the runtime, API calls or peak memory may grow before it is a regression (Default 20)
+#
+# Exits with status 1 when a run failed or regressed.
+#################################################################################################################
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+FakeOCI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FakeOCI.py")
+Compared = ("runtime_seconds", "api_calls", "peak_memory_mb")
+
+
+##########################################################################
+# Run the script against the fake backend in a new process
+##########################################################################
+def run(resources, regions, latency, throttle):
+    command = [sys.executable, FakeOCI, "-n", str(resources), "-regions", str(regions), "-latency", str(latency),
+               "-throttle", str(throttle), "-json", "--", "-rp", str(regions)]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    lines = process.stdout.strip().splitlines()
+    if not lines:
+        errors = process.stderr.strip().splitlines()
+        return {"resources": resources, "regions": regions, "error": errors[-1] if errors else "no output"}
+    return json.loads(lines[-1])
+
+
+def change(value, baseline):
+    if value is None or not baseline:
+        return None
+    return 100.0 * (value - baseline) / baseline
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-sizes', default="1000,10000,100000", dest='sizes', help='Comma separated numbers of resources')
+parser.add_argument('-regions', default="1,4", dest='regions', help='Comma separated numbers of regions')
+parser.add_argument('-latency', default=0.02, type=float, dest='latency', help='Seconds per API call')
+parser.add_argument('-throttle', default=0.0, type=float, dest='throttle', help='Fraction of the API calls that fail with 429')
+parser.add_argument('-o', default="", dest='output', help='Write the results as JSON to this file')
+parser.add_argument('-baseline', default="", dest='baseline', help='Compare with the results in this JSON file')
+parser.add_argument('-tolerance', default=20, type=float, dest='tolerance', help='Percentage increase reported as a regression')
+cmd = parser.parse_args()
+
+baseline = {}
+if cmd.baseline:
+    with open(cmd.baseline) as baseline_file:
+        baseline = {(result["resources"], result["regions"]): result for result in json.load(baseline_file)}
+
+print("{:>9} {:>7} {:>10} {:>10} {:>9} {:>8} {:>10}  {}".format("Resources", "Regions", "Runtime", "API calls", "Throttled", "Changes", "Memory MB", "Compared to baseline"))
+results = []
+failed = False
+for resources in [int(size) for size in cmd.sizes.split(",")]:
+    for regions in [int(count) for count in cmd.regions.split(",")]:
+        result = run(resources, regions, cmd.latency, cmd.throttle)
+        results.append(result)
+        if result.get("error"):
+            failed = True
+            print("{:>9} {:>7}  Error: {}".format(resources, regions, result["error"]))
+            continue
+
+        compared = ""
+        previous = baseline.get((resources, regions))
+        if previous:
+            changes = []
+            for key in Compared:
+                percentage = change(result.get(key), previous.get(key))
+                if percentage is None:
+                    continue
+                regression = percentage > cmd.tolerance
+                failed = failed or regression
+                changes.append("{} {:+.0f}%{}".format(key.split("_")[0], percentage, " REGRESSION" if regression else ""))
+            compared = ", ".join(changes)
+
+        print("{:>9} {:>7} {:>9.2f}s {:>10} {:>9} {:>8} {:>10}  {}".format(
+            resources, regions, result["runtime_seconds"], result["api_calls"], result["throttled"], result["mutations"],
+            result["peak_memory_mb"], compared))
+
+if cmd.output:
+    with open(cmd.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    print("Results written to {}".format(cmd.output))
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+#################################################################################################################
+# Schedule evaluation micro benchmark
+#
+# Compares evaluating the schedule of many resources by splitting the tag value and converting the current
+# hour on every use (as done before) with the compiled and cached schedules of Schedule.py
+#
+#   -n         - number of resources (Default 100000)
+#   -d         - number of distinct schedules shared by the resources (Default 200)
+#   -u         - number of uses of the current hour per resource (Default 8)
+#################################################################################################################
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import Schedule
+
+
+##########################################################################
+# Generate random schedule values
+##########################################################################
+def make_schedules(count):
+    values = ["0", "1", "*", "2", "4", "8", "(2:16)"]
+    schedules = []
+    for i in range(count):
+        schedules.append(",".join(random.choice(values) for _ in range(24)) + " #schedule {}".format(i))
+    return schedules
+
+
+##########################################################################
+# Evaluation as done inline before, re-splitting the value for every resource
+##########################################################################
+def evaluate_inline(resources, hour, uses):
+    total = 0
+    for ActiveSchedule in resources:
+        schedulehours = ActiveSchedule.split("#")[0].split(",")
+        if len(schedulehours) != 24 or "*" in schedulehours[hour]:
+            continue
+        if schedulehours[hour][0] == "(" and schedulehours[hour][-1:] == ")":
+            cpu, memory = schedulehours[hour][1:-1].split(":")
+            total += float(cpu)
+            continue
+        for _ in range(uses):
+            total += int(schedulehours[hour])
+    return total
+
+
+##########################################################################
+# Evaluation using the compiled schedules
+##########################################################################
+def evaluate_compiled(resources, hour, uses):
+    total = 0
+    for ActiveSchedule in resources:
+        schedulehours = Schedule.compile_schedule(ActiveSchedule)
+        if len(schedulehours) != 24:
+            continue
+        CurrentSlot = schedulehours[hour]
+        if CurrentSlot.kind == Schedule.IGNORE:
+            continue
+        if CurrentSlot.kind == Schedule.FLEX:
+            total += CurrentSlot.cpu
+            continue
+        for _ in range(uses):
+            total += CurrentSlot.value
+    return total
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument('-n', default=100000, type=int, dest='resources', help='Number of resources')
+parser.add_argument('-d', default=200, type=int, dest='distinct', help='Number of distinct schedules')
+parser.add_argument('-u', default=8, type=int, dest='uses', help='Uses of the current hour per resource')
+cmd = parser.parse_args()
+
+random.seed(1)
+schedules = make_schedules(cmd.distinct)
+resources = [random.choice(schedules) for _ in range(cmd.resources)]
+
+inline_total, inline_time = timed(evaluate_inline, resources, 9, cmd.uses)
+Schedule.compile_schedule.cache_clear()
+compiled_total, compiled_time = timed(evaluate_compiled, resources, 9, cmd.uses)
+
+if inline_total != compiled_total:
+    print("Results differ: {} != {}".format(inline_total, compiled_total))
+    sys.exit(1)
+
+print("Resources        : {} ({} distinct schedules)".format(cmd.resources, cmd.distinct))
+print("Inline           : {:.3f}s".format(inline_time))
+print("Compiled         : {:.3f}s".format(compiled_time))
+print("Speedup          : {:.1f}x".format(inline_time / compiled_time))
+print("Cache            : {}".format(Schedule.compile_schedule.cache_info()))
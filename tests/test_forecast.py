@@ -0,0 +1,48 @@
+#################################################################################################################
+# Tests of the forecast (-forecast), hours without an action keep the state of the hour before.
+# Run with: python3 -m unittest discover tests
+#################################################################################################################
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import Forecast
+import Schedule
+
+
+def run(schedule, lifecycle_state="RUNNING", resource_type="Instance", shape="VM.Standard.E4.Flex", capacity=2):
+    slots = Schedule.compile_schedule(schedule)
+    resources = [("region", "compartment", resource_type, lifecycle_state, shape, capacity, schedule)]
+    groups, totals, unknown = Forecast.forecast(resources, len(slots), lambda region, tags: list(slots))
+    return list(totals["running"][0]), list(totals["ocpus"][0])
+
+
+@unittest.skipIf(Forecast.np is None, "the forecast requires numpy")
+class ForecastTest(unittest.TestCase):
+
+    def test_on_then_wildcard(self):
+        running, ocpus = run("0,1,*,*,0,*", lifecycle_state="STOPPED")
+        self.assertEqual(running, [0, 1, 1, 1, 0, 0])
+        self.assertEqual(ocpus, [0, 2, 2, 2, 0, 0])
+
+    def test_off_then_wildcard(self):
+        running, ocpus = run("1,0,*,*,1,*")
+        self.assertEqual(running, [1, 0, 0, 0, 1, 1])
+        self.assertEqual(ocpus, [2, 0, 0, 0, 2, 2])
+
+    def test_size_then_invalid(self):
+        running, ocpus = run("3,x,*", resource_type="AutonomousDatabase", shape=None, lifecycle_state="STOPPED")
+        self.assertEqual(running, [1, 1, 1])
+        self.assertEqual(ocpus, [3, 3, 3])
+
+    def test_wildcard_starts_from_current_state(self):
+        self.assertEqual(run("*,*,0")[0], [1, 1, 0])
+        self.assertEqual(run("*,*,1", lifecycle_state="STOPPED")[0], [0, 0, 1])
+
+    def test_bare_metal_keeps_current_state(self):
+        self.assertEqual(run("0,0,1", shape="BM.Standard3.64")[0], [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
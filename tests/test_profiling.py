@@ -0,0 +1,76 @@
+#################################################################################################################
+# Tests of the profiler (-profile) in all threads, on the per thread path (Python up to 3.11) and the process
+# wide path (Python 3.12+, where cProfile uses sys.monitoring). Run with: python3 -m unittest discover tests
+#################################################################################################################
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import Profiling
+
+
+def work():
+    started = time.time()
+    while time.time() - started < 0.2:
+        sum(range(1000))
+
+
+def worker_fn():
+    work()
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def profile_threads(self, process_wide=None):
+        profiler = Profiling.Profiler(interval=0.005, process_wide=process_wide)
+        profiler.start()
+        threads = [threading.Thread(target=worker_fn, name="worker-{}".format(index)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        work()
+        profiler.stop()
+        return profiler, {thread.ident for thread in threads}
+
+    def assert_profiled(self, profiler, thread_ids):
+        functions = {function: seconds for seconds, (filename, line, function) in profiler.top(50)}
+        self.assertIn("worker_fn", functions)
+        self.assertIn("work", functions)
+        # Two threads and the main thread each spend 0.2 seconds in work
+        self.assertGreater(functions["work"], 0.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler.write_stats(os.path.join(directory, "run.prof"))
+            self.assertGreater(os.path.getsize(os.path.join(directory, "run.prof")), 0)
+            profiler.write_chrome_trace(os.path.join(directory, "run.trace.json"))
+            with open(os.path.join(directory, "run.trace.json")) as trace_file:
+                events = json.load(trace_file)["traceEvents"]
+        sampled = {event["tid"] for event in events if event["ph"] == "X" and event["name"].startswith("work ")}
+        self.assertTrue(thread_ids <= sampled)
+
+    def test_default(self):
+        profiler, thread_ids = self.profile_threads()
+        self.assertEqual(profiler.process_wide, sys.version_info >= (3, 12))
+        self.assert_profiled(profiler, thread_ids)
+
+    @unittest.skipIf(sys.version_info >= (3, 12), "only one cProfile profiler can be active on Python 3.12+")
+    def test_per_thread(self):
+        profiler, thread_ids = self.profile_threads(process_wide=False)
+        self.assertEqual(len([profile for profile in profiler.profiles if profile.getstats()]), 3)
+        self.assert_profiled(profiler, thread_ids)
+
+    @unittest.skipIf(sys.version_info < (3, 12), "a cProfile profiler only covers all threads on Python 3.12+")
+    def test_process_wide(self):
+        profiler, thread_ids = self.profile_threads(process_wide=True)
+        self.assertEqual(len(profiler.profiles), 1)
+        self.assert_profiled(profiler, thread_ids)
+
+
+if __name__ == "__main__":
+    unittest.main()